@@ -0,0 +1,10 @@
+"""
+End-to-end benchmarks for agent cycles and mention batches.
+
+Runs the real services against local stand-ins (fakes/openrouter.py,
+fakes/twitter.py, in-memory storage) and writes JSON results so hot-path
+regressions show up when comparing commits:
+
+    python -m benchmarks.run --output before.json
+    python -m benchmarks.compare before.json after.json
+"""
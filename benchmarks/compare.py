@@ -0,0 +1,97 @@
+"""
+Compare two benchmark result files.
+
+Usage:
+    python -m benchmarks.compare baseline.json candidate.json [--threshold 10]
+
+Prints per-scenario deltas and exits non-zero when p95 latency, LLM calls
+per action or DB queries per cycle regress by more than the threshold (%).
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any
+
+# (label, path into a result, higher is better)
+METRICS = [
+    ("p50", ("latency_seconds", "p50"), False),
+    ("p95", ("latency_seconds", "p95"), False),
+    ("p99", ("latency_seconds", "p99"), False),
+    ("llm/action", ("llm_calls_per_action",), False),
+    ("db/cycle", ("db_queries_per_cycle",), False),
+    ("mentions/min", ("mentions_per_minute",), True),
+    ("rss_mb", ("peak_rss_mb",), False)
+]
+GATED = {"p95", "llm/action", "db/cycle"}
+
+
+def _key(result: dict[str, Any]) -> tuple:
+    return result["scenario"], result["concurrency"], result["backlog"]
+
+
+def _get(result: dict[str, Any], path: tuple) -> float | None:
+    value: Any = result
+    for part in path:
+        value = value.get(part) if isinstance(value, dict) else None
+    return value
+
+
+def compare(baseline: dict[str, Any], candidate: dict[str, Any], threshold: float) -> list[str]:
+    """
+    Print a delta table and return the list of gated regressions.
+
+    Args:
+        baseline: Parsed baseline report.
+        candidate: Parsed candidate report.
+        threshold: Allowed regression in percent.
+    """
+    base = {_key(r): r for r in baseline["results"]}
+    regressions = []
+
+    print(f"baseline {baseline['meta'].get('commit')} -> candidate {candidate['meta'].get('commit')}")
+    for result in candidate["results"]:
+        key = _key(result)
+        if key not in base:
+            continue
+
+        cells = []
+        for label, path, higher_is_better in METRICS:
+            old, new = _get(base[key], path), _get(result, path)
+            if not old or new is None:
+                continue
+
+            change = (new - old) / old * 100
+            cells.append(f"{label}={new} ({change:+.1f}%)")
+            worse = -change if higher_is_better else change
+            if label in GATED and worse > threshold:
+                regressions.append(f"{key} {label}: {old} -> {new} ({change:+.1f}%)")
+
+        print(f"{key[0]:<9} c={key[1]:<3} backlog={key[2]:<4} " + " ".join(cells))
+
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare benchmark results")
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("candidate", type=Path)
+    parser.add_argument("--threshold", type=float, default=10.0, help="Allowed regression (%%)")
+    args = parser.parse_args()
+
+    regressions = compare(
+        json.loads(args.baseline.read_text()),
+        json.loads(args.candidate.read_text()),
+        args.threshold
+    )
+
+    if regressions:
+        print("\nRegressions:")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Benchmark plumbing: fake OpenRouter server thread, DB query counting and stats.
+
+Nothing here imports config.settings, so run.py can point the environment
+at the fakes before the services are imported.
+"""
+
+import inspect
+import resource
+import socket
+import sys
+import threading
+import time
+from typing import Any
+
+import uvicorn
+
+from fakes.openrouter import FakeOpenRouter, FakeOpenRouterConfig, create_app
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Linear-interpolated percentile (pct in 0-100)."""
+    if not values:
+        return 0.0
+
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def latency_summary(values: list[float]) -> dict[str, float]:
+    """p50/p95/p99/max/mean of cycle latencies in seconds."""
+    return {
+        "p50": round(percentile(values, 50), 4),
+        "p95": round(percentile(values, 95), 4),
+        "p99": round(percentile(values, 99), 4),
+        "max": round(max(values), 4) if values else 0.0,
+        "mean": round(sum(values) / len(values), 4) if values else 0.0
+    }
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS reports bytes
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(peak / divisor, 1)
+
+
+class FakeOpenRouterServer:
+    """Fake OpenRouter served by uvicorn on a background thread."""
+
+    def __init__(self, config: FakeOpenRouterConfig):
+        self.app = create_app(config)
+        self.port = self._free_port()
+        self.server = uvicorn.Server(uvicorn.Config(
+            self.app, host="127.0.0.1", port=self.port, log_level="warning"
+        ))
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    @staticmethod
+    def _free_port() -> int:
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            return sock.getsockname()[1]
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    @property
+    def fake(self) -> FakeOpenRouter:
+        return self.app.state.fake
+
+    def start(self, timeout: float = 10.0) -> None:
+        self.thread.start()
+        deadline = time.time() + timeout
+        while not self.server.started:
+            if time.time() > deadline:
+                raise RuntimeError("Fake OpenRouter server did not start")
+            time.sleep(0.05)
+
+    def stop(self) -> None:
+        self.server.should_exit = True
+        self.thread.join(timeout=5)
+
+
+class CountingBackend:
+    """Storage backend proxy counting every awaited backend call as a query."""
+
+    def __init__(self, backend: Any):
+        self._backend = backend
+        self.queries: dict[str, int] = {}
+
+    @property
+    def total_queries(self) -> int:
+        return sum(self.queries.values())
+
+    def reset(self) -> None:
+        self.queries = {}
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._backend, name)
+        if not inspect.iscoroutinefunction(attr) or name in ("connect", "close"):
+            return attr
+
+        async def counted(*args, **kwargs):
+            self.queries[name] = self.queries.get(name, 0) + 1
+            return await attr(*args, **kwargs)
+
+        return counted
@@ -0,0 +1,277 @@
+"""
+Benchmark runner.
+
+Drives UnifiedAgent.run, MentionAgentHandler.process_mentions_batch and
+AutoPostService.run against the fake OpenRouter server, the fake Twitter
+API and in-memory storage, at several concurrency levels (independent
+bots sharing one OpenRouter endpoint) and mention backlog sizes.
+
+Usage:
+    python -m benchmarks.run
+    python -m benchmarks.run --scenarios mentions --concurrency 1,8 --backlog 50 --latency lognormal:-2.5,0.5
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from benchmarks.harness import (
+    CountingBackend,
+    FakeOpenRouterServer,
+    latency_summary,
+    peak_rss_mb
+)
+from fakes.openrouter import FakeOpenRouterConfig
+
+logger = logging.getLogger(__name__)
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = REPO_ROOT / "benchmarks" / "results"
+
+# Required settings; the bench never talks to real services
+BENCH_ENV = {
+    "OPENROUTER_API_KEY": "bench",
+    "TWITTER_API_KEY": "bench",
+    "TWITTER_API_SECRET": "bench",
+    "TWITTER_ACCESS_TOKEN": "bench",
+    "TWITTER_ACCESS_SECRET": "bench",
+    "TWITTER_BEARER_TOKEN": "bench",
+    "DATABASE_URL": "memory://",
+    "TWITTER_TRANSPORT": "fake"
+}
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except Exception:
+        return None
+
+
+class Worker:
+    """One simulated bot: its own Twitter timeline, database and services."""
+
+    def __init__(self, scenario: str, backlog: int, seed: int | None, rate_limited: bool):
+        # Imported here so the environment is configured first
+        from fakes.twitter import DEFAULT_RATE_LIMITS, FakeTwitter, FakeTwitterConfig
+        from services.autopost import AutoPostService
+        from services.database import Database
+        from services.mentions import MentionAgentHandler
+        from services.storage.memory import MemoryBackend
+        from services.tier_manager import TierManager
+        from services.twitter import TwitterClient
+        from services.unified_agent import UnifiedAgent
+
+        self.scenario = scenario
+        self.fake_twitter = FakeTwitter(FakeTwitterConfig(
+            mention_rate_per_minute=0,
+            rate_limits=dict(DEFAULT_RATE_LIMITS) if rate_limited else {},
+            wait_on_rate_limit=False,
+            seed=seed
+        ))
+        self.fake_twitter.burst(backlog)
+
+        self.backend = CountingBackend(MemoryBackend())
+        self.db = Database(backend=self.backend)
+        self.tier_manager = TierManager(self.db, transport=self.fake_twitter.usage_transport())
+        twitter = TwitterClient(client=self.fake_twitter, api_v1=self.fake_twitter)
+
+        if scenario == "mentions":
+            self.service = MentionAgentHandler(self.db, self.tier_manager, twitter=twitter)
+        elif scenario == "agent":
+            self.service = UnifiedAgent(self.db, self.tier_manager, twitter=twitter)
+        else:
+            self.service = AutoPostService(self.db, self.tier_manager, twitter=twitter)
+
+    async def start(self) -> None:
+        await self.db.connect()
+        await self.tier_manager.initialize()
+
+    async def cycle(self) -> dict[str, Any]:
+        """Run one cycle and normalise its outcome."""
+        if self.scenario == "mentions":
+            result = await self.service.process_mentions_batch()
+            handled = result.get("processed", 0)
+            return {"success": result.get("success", False), "actions": handled, "mentions": handled}
+
+        if self.scenario == "agent":
+            result = await self.service.run()
+            replies = result.get("replies", 0)
+            return {
+                "success": result.get("success", False),
+                "actions": result.get("posts", 0) + replies,
+                "mentions": replies
+            }
+
+        import services.autopost as autopost
+
+        autopost._LAST_RUN_TS = 0.0  # bypass the 5 minute cooldown between runs
+        result = await self.service.run()
+        return {"success": result.get("success", False), "actions": int(result.get("success", False)), "mentions": 0}
+
+
+async def run_scenario(
+    server: FakeOpenRouterServer,
+    scenario: str,
+    concurrency: int,
+    backlog: int,
+    cycles: int,
+    seed: int | None,
+    rate_limited: bool
+) -> dict[str, Any]:
+    """Run `cycles` back-to-back cycles on each of `concurrency` workers."""
+    workers = [
+        Worker(scenario, backlog, None if seed is None else seed + i, rate_limited)
+        for i in range(concurrency)
+    ]
+    for worker in workers:
+        await worker.start()
+
+    server.fake.reset_stats()
+    latencies: list[float] = []
+    outcomes: list[dict[str, Any]] = []
+
+    async def drive(worker: Worker) -> None:
+        for _ in range(cycles):
+            started = time.perf_counter()
+            outcomes.append(await worker.cycle())
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(drive(w) for w in workers))
+    wall = time.perf_counter() - started
+
+    llm_calls = server.fake.stats["requests"]
+    actions = sum(o["actions"] for o in outcomes)
+    mentions = sum(o["mentions"] for o in outcomes)
+    db_queries = sum(w.backend.total_queries for w in workers)
+    rate_limited_calls = sum(sum(w.fake_twitter.stats["rate_limited"].values()) for w in workers)
+
+    for worker in workers:
+        await worker.db.close()
+
+    return {
+        "scenario": scenario,
+        "concurrency": concurrency,
+        "backlog": backlog,
+        "cycles": len(outcomes),
+        "failures": sum(1 for o in outcomes if not o["success"]),
+        "latency_seconds": latency_summary(latencies),
+        "wall_seconds": round(wall, 3),
+        "llm_calls": llm_calls,
+        "actions": actions,
+        "llm_calls_per_action": round(llm_calls / actions, 2) if actions else None,
+        "db_queries": db_queries,
+        "db_queries_per_cycle": round(db_queries / len(outcomes), 2) if outcomes else 0,
+        "mentions_handled": mentions,
+        "mentions_per_minute": round(mentions / wall * 60, 1) if wall > 0 else 0.0,
+        "twitter_rate_limited": rate_limited_calls,
+        "peak_rss_mb": peak_rss_mb()
+    }
+
+
+async def run_all(args: argparse.Namespace, server: FakeOpenRouterServer) -> list[dict[str, Any]]:
+    results = []
+    for scenario in args.scenarios:
+        # AutoPostService has a process-wide run guard, so it only runs serially
+        levels = [1] if scenario == "autopost" else args.concurrency
+        backlogs = [0] if scenario == "autopost" else args.backlog
+
+        for concurrency in levels:
+            for backlog in backlogs:
+                result = await run_scenario(
+                    server, scenario, concurrency, backlog, args.cycles, args.seed, args.rate_limits
+                )
+                latency = result["latency_seconds"]
+                print(
+                    f"{scenario:<9} c={concurrency:<3} backlog={backlog:<4} "
+                    f"p50={latency['p50']:.3f}s p95={latency['p95']:.3f}s p99={latency['p99']:.3f}s "
+                    f"llm/action={result['llm_calls_per_action']} db/cycle={result['db_queries_per_cycle']} "
+                    f"mentions/min={result['mentions_per_minute']} rss={result['peak_rss_mb']}MB"
+                )
+                results.append(result)
+    return results
+
+
+def parse_args() -> argparse.Namespace:
+    def int_list(value: str) -> list[int]:
+        return [int(v) for v in value.split(",") if v]
+
+    parser = argparse.ArgumentParser(description="Agent/mention benchmark suite")
+    parser.add_argument("--scenarios", type=lambda v: v.split(","), default=["mentions", "agent", "autopost"])
+    parser.add_argument("--concurrency", type=int_list, default=[1, 4, 16])
+    parser.add_argument("--backlog", type=int_list, default=[10, 100])
+    parser.add_argument("--cycles", type=int, default=5, help="Cycles per worker")
+    parser.add_argument("--latency", default="lognormal:-3,0.5", help="Fake LLM latency distribution")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--finish-after-steps", type=int, default=4)
+    parser.add_argument("--rate-limits", action="store_true", help="Enforce real Twitter rate windows")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=Path, default=None)
+    parser.add_argument("--verbose", action="store_true")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    if not args.verbose:
+        # Services log every step at INFO/ERROR; keep bench output readable
+        logging.getLogger("services").setLevel(logging.CRITICAL)
+        logging.getLogger("tools").setLevel(logging.CRITICAL)
+
+    commit = git_commit()
+    output = (args.output or RESULTS_DIR / f"{commit or 'local'}.json").resolve()
+
+    server = FakeOpenRouterServer(FakeOpenRouterConfig(
+        latency=args.latency,
+        error_rate=args.error_rate,
+        finish_after_steps=args.finish_after_steps,
+        seed=args.seed
+    ))
+    server.start()
+
+    for key, value in BENCH_ENV.items():
+        os.environ.setdefault(key, value)
+    os.environ["OPENROUTER_BASE_URL"] = server.base_url
+
+    # AutoPostService keeps recent_posts.json in the working directory
+    os.chdir(tempfile.mkdtemp(prefix="bench-"))
+
+    try:
+        results = asyncio.run(run_all(args, server))
+    finally:
+        server.stop()
+
+    report = {
+        "meta": {
+            "commit": commit,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "args": {k: str(v) if isinstance(v, Path) else v for k, v in vars(args).items()}
+        },
+        "results": results
+    }
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
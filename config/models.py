@@ -8,6 +8,13 @@ Change models here to update them everywhere.
 # LLM Models (for text generation)
 LLM_MODEL = "tngtech/tng-r1t-chimera:free"
 
+# Tried in order when LLM_MODEL keeps failing (429/5xx/timeouts) or rejects
+# the request. Must support structured outputs (json_schema).
+LLM_FALLBACK_MODELS = [
+    "deepseek/deepseek-chat-v3-0324:free",
+    "meta-llama/llama-3.3-70b-instruct:free"
+]
+
 # Image Models (for image generation)
 IMAGE_MODEL = "google/gemini-3-pro-image-preview"
 
@@ -1,7 +1,8 @@
 """
 Mention Selector Agent Prompt - Instructions for selecting which mentions to reply to.
 
-Used by MentionAgentHandler for first LLM call to pick mentions.
+Used by MentionAgentHandler for first LLM call to pick mentions, and for
+the ranking pass that merges per-chunk shortlists of large backlogs.
 """
 
 MENTION_SELECTOR_AGENT_PROMPT = """
@@ -35,3 +36,22 @@ You receive a list of mentions (people who tagged you). Select the ones worth re
 
 **Only reply when you have something genuine to say. Silence is better than forced engagement.**
 """
+
+MENTION_RANKING_PROMPT = """
+---
+
+## MENTION RANKING INSTRUCTIONS
+
+There were too many mentions to read at once, so they were split into groups
+and each group was shortlisted separately. You receive the combined shortlist,
+with the reason each mention was picked.
+
+### Ranking Rules
+
+1. Re-rank the whole shortlist: priority 1 = most important across ALL groups
+2. Drop mentions that are weaker than the rest or repeat each other
+3. Keep the reasoning and approach hints that still hold, improve the rest
+4. Only return tweet_ids from the shortlist
+
+**Fewer, better replies beat replying to everything that made a shortlist.**
+"""
@@ -242,3 +242,88 @@ TOOL_REACTION_SCHEMA = {
         }
     }
 }
+
+# ==================== Fast-path Schemas ====================
+
+# Plan or final post in one call: post_text is filled only when plan is empty
+PLAN_OR_POST_SCHEMA = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "plan_or_post",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "reasoning": PLAN_SCHEMA["json_schema"]["schema"]["properties"]["reasoning"],
+                "plan": PLAN_SCHEMA["json_schema"]["schema"]["properties"]["plan"],
+                "post_text": {
+                    "type": "string",
+                    "description": "The final tweet text (max 280 characters) if plan is empty, otherwise empty string"
+                }
+            },
+            "required": ["reasoning", "plan", "post_text"],
+            "additionalProperties": False
+        }
+    }
+}
+
+# Mention plan or final reply in one call: reply_text is filled only when plan is empty
+MENTION_PLAN_OR_REPLY_SCHEMA = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "mention_plan_or_reply",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "reasoning": MENTION_PLAN_SCHEMA["json_schema"]["schema"]["properties"]["reasoning"],
+                "plan": MENTION_PLAN_SCHEMA["json_schema"]["schema"]["properties"]["plan"],
+                "reply_text": {
+                    "type": "string",
+                    "description": "The final reply text (max 280 characters) if plan is empty, otherwise empty string"
+                }
+            },
+            "required": ["reasoning", "plan", "reply_text"],
+            "additionalProperties": False
+        }
+    }
+}
+
+# Replies to several simple mentions in one call (one item per tweet_id)
+BATCH_REPLY_SCHEMA = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "batch_reply",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "replies": {
+                    "type": "array",
+                    "description": "One entry per mention",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "tweet_id": {
+                                "type": "string",
+                                "description": "The tweet_id of the mention"
+                            },
+                            "needs_tools": {
+                                "type": "boolean",
+                                "description": "True if a good reply needs web search or an image (reply_text then empty)"
+                            },
+                            "reply_text": {
+                                "type": "string",
+                                "description": "The final reply text (max 280 characters), empty if needs_tools"
+                            }
+                        },
+                        "required": ["tweet_id", "needs_tools", "reply_text"],
+                        "additionalProperties": False
+                    }
+                }
+            },
+            "required": ["replies"],
+            "additionalProperties": False
+        }
+    }
+}
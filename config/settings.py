@@ -18,6 +18,7 @@ class Settings(BaseSettings):
 
     # OpenRouter API (used for both LLM and image generation)
     openrouter_api_key: str
+    openrouter_base_url: str = "https://openrouter.ai/api/v1"  # point at fakes/openrouter.py for load tests
 
     # Twitter API credentials
     twitter_api_key: str
@@ -25,9 +26,47 @@ class Settings(BaseSettings):
     twitter_access_token: str
     twitter_access_secret: str
     twitter_bearer_token: str
+    twitter_transport: str = "tweepy"  # "fake" for the in-process fakes/twitter.py
 
-    # PostgreSQL database
+    # Twitter profile cache (memory LRU, then user_profiles table, then batched get_users)
+    profile_cache_size: int = 2000
+    profile_cache_ttl_seconds: int = 86400
+
+    # Reply threads (memory LRU, then conversation_tweets table, then batched get_tweets)
+    thread_cache_size: int = 5000
+    thread_context_max_depth: int = 5  # Ancestors shown above a mention
+
+    # Mention pre-filter (deterministic, runs before LLM selection)
+    mention_blocked_authors: list[str] = []  # Handles, without @
+    mention_blocked_words: list[str] = []  # Case-insensitive substrings, e.g. "airdrop"
+    mention_min_chars: int = 3  # Text left after removing @handles and links
+    mention_author_cooldown_minutes: int = 30  # Defer authors we replied to this recently
+    mention_bot_score_threshold: float = 0.8  # Reject authors at least this bot-like (0-1)
+    mention_llm_candidates: int = 10  # Top mentions by score sent to LLM selection
+
+    # Mention selection: lists over one chunk are selected per chunk concurrently, then ranked
+    mention_selection_chunk_tokens: int = 1500  # Prompt budget for the mentions of one chunk
+    mention_selection_concurrency: int = 4
+    mention_selection_max: int = 5  # Mentions selected per chunk and per batch
+
+    # Batch replies: selected mentions that need no tools are answered in one LLM call
+    mention_batch_replies: bool = True
+    mention_batch_size: int = 8  # Mentions per batch reply call
+
+    # Database (postgresql://..., sqlite:///bot.db or memory://)
     database_url: str
+    run_migrations_on_startup: bool = True
+
+    # Connection pool (sized for mention workers + HTTP endpoints)
+    db_pool_min_size: int = 2
+    db_pool_max_size: int = 10
+    db_pool_max_inactive_connection_lifetime: float = 300.0
+    db_statement_cache_size: int = 256  # 0 when behind pgbouncer transaction pooling
+
+    # Monthly partitions for actions/mentions
+    partition_premake_months: int = 2
+    partition_retention_months: int = 12
+    partition_archive_dir: str = "archive"
 
     # Bot configuration (legacy mode)
     post_interval_minutes: int = 4
@@ -37,6 +76,41 @@ class Settings(BaseSettings):
     # Unified Agent (new architecture)
     use_unified_agent: bool = True
     agent_interval_minutes: int = 4
+    agent_max_parallel_reads: int = 4  # extra read-only tool calls the agent may batch per step
+    agent_prefetch: bool = True  # fetch mentions + author context before the first LLM call
+    agent_prefetch_authors: int = 3  # new mention authors whose profile/history are prefetched
+    agent_checkpoints: bool = True  # save cycle state after each step, resume interrupted cycles
+    agent_checkpoint_ttl_seconds: int = 900  # older checkpoints are not resumed
+    agent_checkpoint_max_resumes: int = 2  # then the cycle starts over
+    intent_pending_grace_seconds: int = 600  # pending intents not on our timeline are failed only after this
+
+    # Adaptive agent schedule: interval follows the mention arrival rate and backs off when idle
+    agent_adaptive_schedule: bool = True
+    agent_min_interval_minutes: float = 1.0
+    agent_max_interval_minutes: float = 30.0
+    agent_mentions_per_cycle: float = 3.0  # new mentions a cycle should find at the current rate
+    agent_idle_backoff: float = 2.0  # interval multiplier after an idle cycle
+    agent_arrival_ewma_tau_minutes: float = 10.0  # time constant of the arrival rate EWMA
+
+    # LLM call layer (retries per model, then fallback models from config/models.py)
+    llm_max_attempts: int = 3
+    llm_backoff_base_seconds: float = 1.0
+    llm_backoff_max_seconds: float = 20.0
+    llm_request_timeout_seconds: float = 60.0  # per HTTP attempt
+    llm_call_deadline_seconds: float = 150.0  # across all attempts and models
+    llm_hedge_after_seconds: float = 0.0  # >0 sends a duplicate request after this long
+    llm_structured_max_reasks: int = 1  # correction re-asks when local JSON repair fails
+    llm_streaming: bool = True  # stream agent decisions, start read-only tools before the reply ends
+    llm_fast_path: bool = True  # plan and final text in one call when no tools are needed
+    llm_tool_reactions: bool = True  # extra "thinking" call after each tool; False saves a call per tool (results reach the final call either way)
+
+    # Tracing: number of recent cycle traces kept for /debug/cycles
+    trace_buffer_size: int = 50
+
+    # Metrics: business counts for /metrics are refreshed in the background
+    # and re-read inline only when older than the staleness window
+    metrics_snapshot_refresh_seconds: int = 60
+    metrics_snapshot_max_staleness_seconds: float = 300.0
 
     # Feature toggles
     allow_mentions: bool = True
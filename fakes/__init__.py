@@ -0,0 +1,7 @@
+"""
+Local stand-ins for external services.
+
+Used for load tests, benchmarks and offline development:
+- openrouter.py - fake OpenRouter chat completions server (FastAPI)
+- twitter.py - fake tweepy Client/API with mention streams and rate limits
+"""
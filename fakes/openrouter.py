@@ -0,0 +1,414 @@
+"""
+Fake OpenRouter server for deterministic load and latency testing.
+
+Serves POST /chat/completions (JSON or SSE with "stream": true) with
+schema-valid structured outputs for
+every response_format used by the bot (step_decision, agent_plan,
+mention_selection, reply_text, ...), web search results when the web
+plugin is requested, and a small PNG when an image model is called.
+
+Latency, error injection and agent behaviour are configurable, so agent
+throughput and tail latency can be measured without spending credits.
+
+Run standalone:
+    python -m fakes.openrouter --port 8090 --latency lognormal:0.8,0.4 --error-rate 0.02
+then set OPENROUTER_BASE_URL=http://127.0.0.1:8090
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import logging
+import math
+import random
+import re
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+logger = logging.getLogger(__name__)
+
+# 1x1 transparent PNG
+FAKE_PNG = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNkYPhfDwAChwGA60e6kgAAAABJRU5ErkJggg=="
+)
+
+_TWEET_ID_RE = re.compile(r"tweet_id: (\S+)")
+_AUTHOR_RE = re.compile(r"from: @(\w+)")
+_REPLIED_RE = re.compile(r'"reply_to_tweet_id":\s*"(\w+)"')
+_SELECT_MAX_RE = re.compile(r"Select at most (\d+)")
+
+
+@dataclass
+class FakeOpenRouterConfig:
+    """Behaviour knobs for the fake server."""
+
+    # Latency: "fixed:S", "uniform:LO,HI", "exponential:MEAN", "lognormal:MU,SIGMA" (seconds)
+    latency: str = "fixed:0"
+    # Fraction of requests answered with an injected error status
+    error_rate: float = 0.0
+    error_statuses: list[int] = field(default_factory=lambda: [429, 500, 502, 503])
+    # Agent behaviour: step_decision returns finish_cycle after this many assistant turns
+    finish_after_steps: int = 4
+    # Fraction of listed mentions that mention_selection picks
+    select_fraction: float = 0.5
+    # Probability that a plan schema returns a web_search step instead of []
+    plan_tool_probability: float = 0.3
+    # Streaming: characters per SSE chunk and delay between chunks (seconds)
+    stream_chunk_chars: int = 16
+    stream_chunk_delay: float = 0.005
+    # Prompt processing speed (prompt tokens per second, ~4 chars each); 0 = instant
+    prefill_tokens_per_second: float = 0.0
+    # Length of generated "thinking" fields (models reason at length)
+    thinking_chars: int = 600
+    seed: int | None = None
+
+
+def sample_latency(spec: str, rng: random.Random) -> float:
+    """
+    Draw a latency (seconds) from a distribution spec.
+
+    Args:
+        spec: "kind:params", e.g. "lognormal:-0.5,0.6".
+        rng: Random generator.
+    """
+    kind, _, raw = spec.partition(":")
+    params = [float(p) for p in raw.split(",") if p]
+
+    if kind == "fixed":
+        return params[0] if params else 0.0
+    if kind == "uniform":
+        return rng.uniform(params[0], params[1])
+    if kind == "exponential":
+        return rng.expovariate(1 / params[0]) if params[0] > 0 else 0.0
+    if kind == "lognormal":
+        return rng.lognormvariate(params[0], params[1])
+
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+class FakeOpenRouter:
+    """Request handler and counters for the fake server."""
+
+    def __init__(self, config: FakeOpenRouterConfig | None = None):
+        self.config = config or FakeOpenRouterConfig()
+        self.rng = random.Random(self.config.seed)
+        self.counter = 0
+        self.stats: dict[str, Any] = {}
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        self.stats = {
+            "requests": 0,
+            "errors_injected": 0,
+            "by_schema": {},
+            "latency_total_seconds": 0.0
+        }
+
+    # ==================== Generation ====================
+
+    def _text(self, prefix: str) -> str:
+        self.counter += 1
+        return f"{prefix} #{self.counter} from the fake model"
+
+    def _generate(self, schema: dict[str, Any], name: str, ctx: dict[str, Any]) -> Any:
+        """Produce a value valid against a (strict-mode subset) JSON schema."""
+        if "enum" in schema:
+            return self.rng.choice(schema["enum"])
+
+        kind = schema.get("type", "string")
+
+        if kind == "object":
+            return {
+                prop: self._generate(sub, prop, ctx)
+                for prop, sub in schema.get("properties", {}).items()
+            }
+        if kind == "array":
+            if name == "plan":
+                if self.rng.random() < self.config.plan_tool_probability:
+                    return [{"tool": "web_search", "params": {"query": "latest news"}}]
+                return []
+            return [self._generate(schema.get("items", {}), name, ctx) for _ in range(self.rng.randint(0, 2))]
+        if kind == "boolean":
+            return False
+        if kind == "integer":
+            return self.rng.randint(1, 3)
+        if kind == "number":
+            return round(self.rng.random(), 3)
+
+        # Strings: make the common fields look plausible
+        if name in ("tweet_id", "reply_to_tweet_id", "selected_tweet_id"):
+            return ctx["tweet_ids"][-1] if ctx["tweet_ids"] else ""
+        if name in ("reply_to_author", "username"):
+            return ctx["authors"][-1] if ctx["authors"] else "someone"
+        if name == "query":
+            return "latest news"
+        if name in ("text", "post_text", "reply_text"):
+            return self._text("tweet")
+        if name == "thinking":
+            sentence = self._text("reasoning step") + ". "
+            return (sentence * (self.config.thinking_chars // len(sentence) + 1))[:self.config.thinking_chars]
+        return self._text(name)
+
+    def _step_decision(self, schema: dict[str, Any], ctx: dict[str, Any]) -> dict[str, Any]:
+        """Walk the agent through a plausible cycle then finish."""
+        result = self._generate(schema, "", ctx)
+        tools = schema["properties"]["tool"]["enum"]
+        step = ctx["assistant_turns"]
+
+        if step >= self.config.finish_after_steps and "finish_cycle" in tools:
+            tool = "finish_cycle"
+        elif step == 0 and "get_mentions" in tools and not ctx["prefetched"]:
+            tool = "get_mentions"
+        elif ctx["tweet_ids"] and "create_reply" in tools and ctx["tweet_ids"][-1] not in ctx["replied"]:
+            tool = "create_reply"
+        else:
+            candidates = [t for t in tools if t not in ("finish_cycle", "get_mentions", "create_reply")]
+            tool = self.rng.choice(candidates) if candidates else "finish_cycle"
+
+        result["tool"] = tool
+        if "additional_reads" in result and tool in ("create_post", "create_reply", "finish_cycle"):
+            result["additional_reads"] = []
+        params = result.get("params", {})
+        if "include_image" in params:
+            params["include_image"] = False
+        return result
+
+    def _mention_selection(self, ctx: dict[str, Any]) -> dict[str, Any]:
+        ids = list(dict.fromkeys(ctx["tweet_ids"]))
+        count = math.ceil(len(ids) * self.config.select_fraction)
+        if ctx["select_max"] is not None:
+            count = min(count, ctx["select_max"])
+        chosen = self.rng.sample(ids, count) if count else []
+        return {
+            "selected_mentions": [
+                {
+                    "tweet_id": tweet_id,
+                    "priority": i + 1,
+                    "reasoning": "fake selection",
+                    "suggested_approach": "reply briefly"
+                }
+                for i, tweet_id in enumerate(chosen)
+            ]
+        }
+
+    def _batch_reply(self, ctx: dict[str, Any]) -> dict[str, Any]:
+        replies = []
+        for tweet_id in dict.fromkeys(ctx["tweet_ids"]):
+            needs_tools = self.rng.random() < self.config.plan_tool_probability
+            replies.append({
+                "tweet_id": tweet_id,
+                "needs_tools": needs_tools,
+                "reply_text": "" if needs_tools else self._text("tweet")
+            })
+        return {"replies": replies}
+
+    def _context(self, messages: list[dict[str, Any]]) -> dict[str, Any]:
+        """Pull ids/handles out of the conversation for realistic params."""
+        text = "\n".join(m["content"] for m in messages if isinstance(m.get("content"), str))
+        replied = set()
+        for m in messages:
+            if m.get("role") == "assistant" and isinstance(m.get("content"), str):
+                replied.update(_REPLIED_RE.findall(m["content"]))
+        select_max = _SELECT_MAX_RE.search(text)
+        return {
+            "tweet_ids": _TWEET_ID_RE.findall(text),
+            "select_max": int(select_max.group(1)) if select_max else None,
+            "authors": _AUTHOR_RE.findall(text),
+            "assistant_turns": sum(1 for m in messages if m.get("role") == "assistant"),
+            "prefetched": "## PREFETCHED CONTEXT" in text,
+            "replied": replied
+        }
+
+    def build_message(self, payload: dict[str, Any]) -> dict[str, Any]:
+        """Build the assistant message for a chat completion request."""
+        messages = payload.get("messages", [])
+        model = payload.get("model", "")
+        ctx = self._context(messages)
+
+        if "image" in model:
+            data_uri = "data:image/png;base64," + base64.b64encode(FAKE_PNG).decode()
+            return {
+                "role": "assistant",
+                "content": "",
+                "images": [{"type": "image_url", "image_url": {"url": data_uri}}]
+            }
+
+        if any(p.get("id") == "web" for p in payload.get("plugins", [])):
+            return {
+                "role": "assistant",
+                "content": self._text("search summary"),
+                "annotations": [
+                    {"type": "url_citation", "url_citation": {"url": f"https://example.com/{i}", "title": f"Source {i}"}}
+                    for i in range(3)
+                ]
+            }
+
+        response_format = payload.get("response_format")
+        if not response_format:
+            return {"role": "assistant", "content": self._text("completion")}
+
+        json_schema = response_format["json_schema"]
+        name = json_schema["name"]
+        schema = json_schema["schema"]
+
+        if name == "step_decision":
+            result = self._step_decision(schema, ctx)
+        elif name == "mention_selection":
+            result = self._mention_selection(ctx)
+        elif name == "batch_reply":
+            result = self._batch_reply(ctx)
+        else:
+            result = self._generate(schema, name, ctx)
+            # Fast-path schemas: the final text only comes with an empty plan
+            if result.get("plan"):
+                for key in ("post_text", "reply_text"):
+                    if key in result:
+                        result[key] = ""
+
+        return {"role": "assistant", "content": json.dumps(result)}
+
+    # ==================== HTTP ====================
+
+    async def _sse(self, payload: dict[str, Any], message: dict[str, Any], usage: dict[str, int]):
+        """Stream the message content as OpenRouter-style SSE chunks."""
+        base = {
+            "id": f"gen-fake-{self.stats['requests']}",
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": payload.get("model", "fake")
+        }
+        yield ": OPENROUTER PROCESSING\n\n"
+
+        content = message.get("content") or ""
+        size = max(self.config.stream_chunk_chars, 1)
+        for i in range(0, len(content), size):
+            chunk = {**base, "choices": [{"index": 0, "delta": {"content": content[i:i + size]}, "finish_reason": None}]}
+            yield f"data: {json.dumps(chunk)}\n\n"
+            if self.config.stream_chunk_delay > 0:
+                await asyncio.sleep(self.config.stream_chunk_delay)
+
+        final = {**base, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}], "usage": usage}
+        yield f"data: {json.dumps(final)}\n\n"
+        yield "data: [DONE]\n\n"
+
+    async def handle(self, payload: dict[str, Any]) -> JSONResponse | StreamingResponse:
+        """Handle one chat completion request with latency and error injection."""
+        self.stats["requests"] += 1
+        schema_name = (payload.get("response_format") or {}).get("json_schema", {}).get("name", "none")
+        by_schema = self.stats["by_schema"]
+        by_schema[schema_name] = by_schema.get(schema_name, 0) + 1
+
+        delay = sample_latency(self.config.latency, self.rng)
+        if self.config.prefill_tokens_per_second > 0:
+            prompt_chars = sum(len(str(m.get("content", ""))) for m in payload.get("messages", []))
+            delay += prompt_chars / 4 / self.config.prefill_tokens_per_second
+        self.stats["latency_total_seconds"] += delay
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        if self.rng.random() < self.config.error_rate:
+            status = self.rng.choice(self.config.error_statuses)
+            self.stats["errors_injected"] += 1
+            headers = {"Retry-After": "1"} if status == 429 else {}
+            return JSONResponse(
+                {"error": {"code": status, "message": "injected error"}},
+                status_code=status,
+                headers=headers
+            )
+
+        message = self.build_message(payload)
+        prompt_chars = sum(len(str(m.get("content", ""))) for m in payload.get("messages", []))
+        usage = {
+            "prompt_tokens": prompt_chars // 4,
+            "completion_tokens": len(str(message.get("content", ""))) // 4,
+            "total_tokens": (prompt_chars + len(str(message.get("content", "")))) // 4
+        }
+
+        if payload.get("stream"):
+            return StreamingResponse(self._sse(payload, message, usage), media_type="text/event-stream")
+
+        # Same generation time as the streamed reply, just delivered at once
+        chunks = math.ceil(len(message.get("content") or "") / max(self.config.stream_chunk_chars, 1))
+        if chunks and self.config.stream_chunk_delay > 0:
+            await asyncio.sleep(chunks * self.config.stream_chunk_delay)
+
+        return JSONResponse({
+            "id": f"gen-fake-{self.stats['requests']}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": payload.get("model", "fake"),
+            "choices": [{"index": 0, "message": message, "finish_reason": "stop"}],
+            "usage": usage
+        })
+
+
+def create_app(config: FakeOpenRouterConfig | None = None) -> FastAPI:
+    """
+    Create the fake OpenRouter ASGI app.
+
+    Args:
+        config: Behaviour knobs (defaults: no latency, no errors).
+
+    Returns:
+        FastAPI app; the handler is available as app.state.fake.
+    """
+    fake = FakeOpenRouter(config)
+    app = FastAPI(title="Fake OpenRouter")
+    app.state.fake = fake
+
+    @app.post("/chat/completions")
+    @app.post("/api/v1/chat/completions")
+    async def chat_completions(request: Request):
+        return await fake.handle(await request.json())
+
+    @app.get("/_fake/stats")
+    async def stats():
+        return fake.stats
+
+    @app.post("/_fake/reset")
+    async def reset():
+        fake.reset_stats()
+        return {"status": "ok"}
+
+    @app.get("/_fake/config")
+    async def get_config():
+        return asdict(fake.config)
+
+    @app.post("/_fake/config")
+    async def set_config(request: Request):
+        updates = await request.json()
+        for key, value in updates.items():
+            if hasattr(fake.config, key):
+                setattr(fake.config, key, value)
+        return asdict(fake.config)
+
+    return app
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Fake OpenRouter server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--latency", default="fixed:0")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--finish-after-steps", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    uvicorn.run(
+        create_app(FakeOpenRouterConfig(
+            latency=args.latency,
+            error_rate=args.error_rate,
+            finish_after_steps=args.finish_after_steps,
+            seed=args.seed
+        )),
+        host=args.host,
+        port=args.port
+    )
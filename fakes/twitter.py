@@ -0,0 +1,483 @@
+"""
+In-process fake of the Twitter API for load tests and offline runs.
+
+FakeTwitter stands in for both tweepy.Client and tweepy.API (media
+upload) behind TwitterClient, returning real tweepy Response/Tweet/User
+objects. It simulates:
+- a Poisson mention stream at a configurable rate, plus bursts for
+  viral-mention scenarios; some mentions are replies inside threads
+  (earlier mentions, our replies or other users' tweets)
+- a pool of user profiles with public metrics
+- posting, replying and media upload
+- per-endpoint 15 minute rate windows; exhausted windows either sleep
+  until reset (wait_on_rate_limit, like tweepy) or raise
+  tweepy.TooManyRequests carrying x-rate-limit-* headers
+
+usage_transport() fakes GET /2/usage/tweets for TierManager, reporting
+the reads consumed through the fake as project usage.
+
+Enable with TWITTER_TRANSPORT=fake.
+"""
+
+import json
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Any
+
+import httpx
+import requests
+import tweepy
+
+logger = logging.getLogger(__name__)
+
+# Per-endpoint (requests, window seconds), per user, from the v2 docs
+DEFAULT_RATE_LIMITS: dict[str, tuple[int, int]] = {
+    "get_me": (75, 900),
+    "get_users_mentions": (180, 900),
+    "get_user": (900, 900),
+    "get_users": (900, 900),
+    "get_tweets": (900, 900),
+    "get_users_tweets": (900, 900),
+    "create_tweet": (200, 900),
+    "media_upload": (500, 900)
+}
+
+_WORDS = [
+    "gm", "wagmi", "cat", "purr", "moon", "chart", "meme", "vibes", "question",
+    "hello", "thoughts", "today", "build", "ship", "why", "how", "love", "lol"
+]
+
+
+@dataclass
+class FakeTwitterConfig:
+    """Behaviour knobs for the fake Twitter API."""
+
+    # Mentions arriving per minute (Poisson process); 0 disables the stream
+    mention_rate_per_minute: float = 2.0
+    # Size of the simulated user pool mentions are drawn from
+    user_pool_size: int = 200
+    # Share of mentions that reply to an earlier tweet instead of starting a conversation
+    reply_probability: float = 0.3
+    # Endpoint -> (requests, window seconds)
+    rate_limits: dict[str, tuple[int, int]] = field(default_factory=lambda: dict(DEFAULT_RATE_LIMITS))
+    # Sleep until the window resets instead of raising TooManyRequests
+    wait_on_rate_limit: bool = True
+    # Simulated API latency per call (seconds)
+    latency: float = 0.0
+    # Usage API: monthly read cap and tier ("free" answers 403 like the real API)
+    tier: str = "basic"
+    project_cap: int = 10_000
+    bot_username: str = "purrple_bot"
+    seed: int | None = None
+
+
+class _RateWindow:
+    """Fixed request window for one endpoint."""
+
+    def __init__(self, limit: int, window: int):
+        self.limit = limit
+        self.window = window
+        self.remaining = limit
+        self.reset_at = time.time() + window
+
+    def take(self) -> bool:
+        now = time.time()
+        if now >= self.reset_at:
+            self.remaining = self.limit
+            self.reset_at = now + self.window
+        if self.remaining <= 0:
+            return False
+        self.remaining -= 1
+        return True
+
+    def headers(self) -> dict[str, str]:
+        return {
+            "x-rate-limit-limit": str(self.limit),
+            "x-rate-limit-remaining": str(self.remaining),
+            "x-rate-limit-reset": str(int(self.reset_at))
+        }
+
+
+def _too_many_requests(window: _RateWindow) -> tweepy.TooManyRequests:
+    """Build the exception tweepy raises on a 429, with rate-limit headers."""
+    response = requests.Response()
+    response.status_code = 429
+    response.reason = "Too Many Requests"
+    response.headers.update(window.headers())
+    response._content = json.dumps({"title": "Too Many Requests", "detail": "Too Many Requests"}).encode()
+    return tweepy.TooManyRequests(response)
+
+
+def _iso(ts: float) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+
+class FakeTwitter:
+    """Fake tweepy.Client + tweepy.API with simulated mentions and rate limits."""
+
+    def __init__(self, config: FakeTwitterConfig | None = None):
+        self.config = config or FakeTwitterConfig()
+        self.rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._next_id = 1_800_000_000_000_000_000
+
+        self.me = {"id": "1000", "name": "Purrple", "username": self.config.bot_username}
+        self.users: dict[str, dict[str, Any]] = {}
+        for i in range(self.config.user_pool_size):
+            self._add_user(f"user{i:04d}")
+
+        self.mentions: list[dict[str, Any]] = []
+        self.tweets: list[dict[str, Any]] = []
+        # Every tweet (mentions, ours, thread roots) for lookups and expansions
+        self.tweets_by_id: dict[str, dict[str, Any]] = {}
+        self.media: list[str] = []
+        self.windows = {
+            endpoint: _RateWindow(limit, window)
+            for endpoint, (limit, window) in self.config.rate_limits.items()
+        }
+        self.stats = {"calls": {}, "rate_limited": {}, "reads": 0}
+        self._last_arrival = time.time()
+
+    # ==================== Simulation ====================
+
+    def _new_id(self) -> str:
+        self._next_id += self.rng.randint(1, 1000)
+        return str(self._next_id)
+
+    def _add_user(self, username: str) -> dict[str, Any]:
+        user = {
+            "id": str(2000 + len(self.users)),
+            "name": username.title(),
+            "username": username,
+            "description": f"fake account, into {self.rng.choice(_WORDS)}",
+            "location": self.rng.choice(["", "Internet", "Berlin", "NYC"]),
+            "created_at": _iso(time.time() - self.rng.randint(1, 3000) * 86400),
+            "public_metrics": {
+                "followers_count": int(self.rng.paretovariate(1.2) * 20),
+                "following_count": self.rng.randint(0, 2000),
+                "tweet_count": self.rng.randint(0, 50_000),
+                "listed_count": self.rng.randint(0, 50)
+            }
+        }
+        self.users[username.lower()] = user
+        return user
+
+    def _add_tweet(self, author_id: str, text: str, in_reply_to: str | None = None) -> dict[str, Any]:
+        """Store a tweet, placing it in its parent's conversation."""
+        tweet_id = self._new_id()
+        tweet = {
+            "id": tweet_id,
+            "text": text,
+            "author_id": author_id,
+            "conversation_id": tweet_id,
+            "created_at": _iso(time.time()),
+            "edit_history_tweet_ids": [tweet_id]
+        }
+        parent = self.tweets_by_id.get(str(in_reply_to)) if in_reply_to else None
+        if parent:
+            tweet["conversation_id"] = parent["conversation_id"]
+            tweet["in_reply_to_user_id"] = parent["author_id"]
+            tweet["referenced_tweets"] = [{"type": "replied_to", "id": parent["id"]}]
+        self.tweets_by_id[tweet_id] = tweet
+        return tweet
+
+    def _random_parent(self) -> str:
+        """A recent tweet to reply to, or a new tweet by a pool user."""
+        recent = list(self.tweets_by_id)[-50:]
+        if recent and self.rng.random() < 0.7:
+            return self.rng.choice(recent)
+
+        author = self.rng.choice(list(self.users.values()))
+        words = " ".join(self.rng.choices(_WORDS, k=self.rng.randint(3, 12)))
+        return self._add_tweet(author["id"], words)["id"]
+
+    def add_mention(
+        self,
+        username: str | None = None,
+        text: str | None = None,
+        in_reply_to: str | None = None
+    ) -> dict[str, Any]:
+        """
+        Inject one mention of the bot.
+
+        Args:
+            username: Author handle (random pool user if omitted, created if unknown).
+            text: Tweet text (random if omitted).
+            in_reply_to: Tweet the mention replies to (with probability
+                reply_probability a random earlier tweet if omitted).
+
+        Returns:
+            Raw tweet data.
+        """
+        with self._lock:
+            if username is None:
+                author = self.rng.choice(list(self.users.values()))
+            else:
+                author = self.users.get(username.lower()) or self._add_user(username)
+
+            if in_reply_to is None and self.rng.random() < self.config.reply_probability:
+                in_reply_to = self._random_parent()
+
+            words = " ".join(self.rng.choices(_WORDS, k=self.rng.randint(3, 12)))
+            tweet = self._add_tweet(author["id"], text or f"@{self.me['username']} {words}", in_reply_to)
+            self.mentions.append(tweet)
+            return tweet
+
+    def burst(self, count: int, authors: list[str] | None = None) -> None:
+        """
+        Inject a burst of mentions at once (viral tweet, raid, giveaway).
+
+        Args:
+            count: Number of mentions.
+            authors: Optional handles to draw authors from.
+        """
+        for _ in range(count):
+            self.add_mention(self.rng.choice(authors) if authors else None)
+
+    def _advance_stream(self) -> None:
+        """Generate mentions that arrived since the last call (Poisson process)."""
+        rate = self.config.mention_rate_per_minute / 60
+        now = time.time()
+        if rate <= 0:
+            self._last_arrival = now
+            return
+
+        while True:
+            next_arrival = self._last_arrival + self.rng.expovariate(rate)
+            if next_arrival > now:
+                break
+            self._last_arrival = next_arrival
+            self.add_mention()
+
+    def _call(self, endpoint: str) -> None:
+        """Count a call, apply latency and enforce the endpoint rate window."""
+        calls = self.stats["calls"]
+        calls[endpoint] = calls.get(endpoint, 0) + 1
+
+        if self.config.latency > 0:
+            time.sleep(self.config.latency)
+
+        window = self.windows.get(endpoint)
+        if window is None:
+            return
+
+        while not window.take():
+            limited = self.stats["rate_limited"]
+            limited[endpoint] = limited.get(endpoint, 0) + 1
+            if not self.config.wait_on_rate_limit:
+                raise _too_many_requests(window)
+
+            sleep_time = window.reset_at - time.time() + 1
+            logger.warning(f"[FAKE_TWITTER] Rate limit exceeded on {endpoint}. Sleeping for {sleep_time:.0f} seconds.")
+            time.sleep(max(sleep_time, 0))
+
+    # ==================== tweepy.Client ====================
+
+    def _users_by_id(self) -> dict[str, dict[str, Any]]:
+        return {self.me["id"]: self.me, **{u["id"]: u for u in self.users.values()}}
+
+    def get_me(self, **kwargs) -> tweepy.Response:
+        self._call("get_me")
+        return tweepy.Response(tweepy.User(self.me), {}, [], {})
+
+    def get_users_mentions(
+        self,
+        id: str,
+        since_id: str | None = None,
+        max_results: int = 10,
+        **kwargs
+    ) -> tweepy.Response:
+        self._call("get_users_mentions")
+        self._advance_stream()
+
+        newest = [
+            t for t in reversed(self.mentions)
+            if since_id is None or int(t["id"]) > int(since_id)
+        ][:max_results]
+        self.stats["reads"] += len(newest)
+
+        if not newest:
+            return tweepy.Response(None, {}, [], {"result_count": 0})
+
+        expansions = kwargs.get("expansions") or []
+        parents = []
+        if "referenced_tweets.id" in expansions:
+            parent_ids = {r["id"] for t in newest for r in t.get("referenced_tweets", [])}
+            parents = [self.tweets_by_id[i] for i in parent_ids if i in self.tweets_by_id]
+            self.stats["reads"] += len(parents)
+
+        by_id = self._users_by_id()
+        authors = {t["author_id"]: by_id[t["author_id"]] for t in newest}
+        if "referenced_tweets.id.author_id" in expansions:
+            authors.update({t["author_id"]: by_id[t["author_id"]] for t in parents})
+
+        includes = {"users": [tweepy.User(u) for u in authors.values()]}
+        if parents:
+            includes["tweets"] = [tweepy.Tweet(t) for t in parents]
+        return tweepy.Response(
+            [tweepy.Tweet(t) for t in newest],
+            includes,
+            [],
+            {
+                "result_count": len(newest),
+                "newest_id": newest[0]["id"],
+                "oldest_id": newest[-1]["id"]
+            }
+        )
+
+    def get_user(self, username: str | None = None, id: str | None = None, **kwargs) -> tweepy.Response:
+        self._call("get_user")
+        if username is not None:
+            user = self.users.get(username.lower())
+        else:
+            user = next((u for u in self.users.values() if u["id"] == str(id)), None)
+
+        if user is None:
+            error = {"title": "Not Found Error", "detail": f"Could not find user with username: [{username}]."}
+            return tweepy.Response(None, {}, [error], {})
+
+        self.stats["reads"] += 1
+        return tweepy.Response(tweepy.User(user), {}, [], {})
+
+    def get_users(
+        self,
+        usernames: list[str] | str | None = None,
+        ids: list[str] | str | None = None,
+        **kwargs
+    ) -> tweepy.Response:
+        self._call("get_users")
+        keys = usernames if usernames is not None else ids
+        if isinstance(keys, str):
+            keys = keys.split(",")
+        if len(keys) > 100:
+            response = requests.Response()
+            response.status_code = 400
+            response.reason = "Bad Request"
+            response._content = json.dumps({"title": "Invalid Request", "detail": "Too many users requested (max 100)"}).encode()
+            raise tweepy.BadRequest(response)
+
+        found, errors = [], []
+        for key in keys:
+            if usernames is not None:
+                user = self.users.get(key.lower())
+            else:
+                user = next((u for u in self.users.values() if u["id"] == str(key)), None)
+            if user is None:
+                errors.append({"title": "Not Found Error", "value": key, "detail": f"Could not find user: [{key}]."})
+            else:
+                found.append(tweepy.User(user))
+
+        # One request, billed per returned user
+        self.stats["reads"] += len(found)
+        return tweepy.Response(found or None, {}, errors, {})
+
+    def get_tweets(self, ids: list[str] | str, **kwargs) -> tweepy.Response:
+        self._call("get_tweets")
+        if isinstance(ids, str):
+            ids = ids.split(",")
+        if len(ids) > 100:
+            response = requests.Response()
+            response.status_code = 400
+            response.reason = "Bad Request"
+            response._content = json.dumps({"title": "Invalid Request", "detail": "Too many tweets requested (max 100)"}).encode()
+            raise tweepy.BadRequest(response)
+
+        found, errors = [], []
+        for tweet_id in ids:
+            tweet = self.tweets_by_id.get(str(tweet_id))
+            if tweet is None:
+                errors.append({"title": "Not Found Error", "value": str(tweet_id), "detail": f"Could not find tweet with ids: [{tweet_id}]."})
+            else:
+                found.append(tweet)
+
+        includes = {}
+        if "author_id" in (kwargs.get("expansions") or []):
+            by_id = self._users_by_id()
+            authors = {t["author_id"]: by_id[t["author_id"]] for t in found}
+            includes["users"] = [tweepy.User(u) for u in authors.values()]
+
+        # One request, billed per returned tweet
+        self.stats["reads"] += len(found)
+        return tweepy.Response([tweepy.Tweet(t) for t in found] or None, includes, errors, {})
+
+    def get_users_tweets(self, id: str, max_results: int = 10, **kwargs) -> tweepy.Response:
+        self._call("get_users_tweets")
+        timeline = [t for t in reversed(self.tweets_by_id.values()) if t["author_id"] == str(id)][:max_results]
+
+        # One request, billed per returned tweet
+        self.stats["reads"] += len(timeline)
+        return tweepy.Response([tweepy.Tweet(t) for t in timeline] or None, {}, [], {})
+
+    def create_tweet(
+        self,
+        text: str | None = None,
+        in_reply_to_tweet_id: str | None = None,
+        media_ids: list[str] | None = None,
+        **kwargs
+    ) -> tweepy.Response:
+        self._call("create_tweet")
+        with self._lock:
+            tweet = self._add_tweet(self.me["id"], text, in_reply_to_tweet_id)
+        tweet.update({
+            "in_reply_to_tweet_id": in_reply_to_tweet_id,
+            "media_ids": media_ids or []
+        })
+        self.tweets.append(tweet)
+        return tweepy.Response(
+            {"id": tweet["id"], "text": text, "edit_history_tweet_ids": [tweet["id"]]},
+            {}, [], {}
+        )
+
+    # ==================== tweepy.API ====================
+
+    def media_upload(self, filename: str, file=None, **kwargs) -> SimpleNamespace:
+        self._call("media_upload")
+        media_id = int(self._new_id())
+        self.media.append(str(media_id))
+        return SimpleNamespace(media_id=media_id, media_id_string=str(media_id))
+
+    # ==================== Usage API ====================
+
+    def usage_transport(self) -> httpx.MockTransport:
+        """
+        httpx transport answering the usage endpoint TierManager polls.
+
+        Reads served by this fake count as project usage.
+        """
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path != "/2/usage/tweets":
+                return httpx.Response(404, json={"title": "Not Found Error"})
+            if self.config.tier == "free":
+                return httpx.Response(403, json={"title": "Client Forbidden"})
+            return httpx.Response(200, json={
+                "data": {
+                    "project_id": "fake",
+                    "project_cap": str(self.config.project_cap),
+                    "project_usage": str(self.stats["reads"]),
+                    "cap_reset_day": 1
+                }
+            })
+
+        return httpx.MockTransport(handler)
+
+
+_default: FakeTwitter | None = None
+
+
+def get_fake_twitter() -> FakeTwitter:
+    """Shared instance, so every service in the process sees the same timeline."""
+    global _default
+    if _default is None:
+        _default = FakeTwitter()
+    return _default
+
+
+def set_fake_twitter(fake: FakeTwitter) -> None:
+    """Replace the shared instance (benchmarks configure their own scenario)."""
+    global _default
+    _default = fake
@@ -9,9 +9,14 @@ import logging
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import PlainTextResponse
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
 from config.settings import settings
+from services import metrics as bot_metrics
+from services import tracing
+from services.action_intents import reconcile_intents
+from services.adaptive_schedule import AdaptiveSchedule
 from services.database import Database
 from services.autopost import AutoPostService
 from services.mentions import MentionHandler
@@ -45,6 +50,7 @@ async def lifespan(app: FastAPI):
     # Connect to database
     await db.connect()
     logger.info("Database connected")
+    await db.refresh_metrics_snapshot()
 
     # Initialize tier manager - detect API tier and limits (with db for fallback)
     tier_manager = TierManager(db)
@@ -67,6 +73,9 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Failed to get Twitter account info: {e}")
 
+    # Settle posts/replies a crash left between Twitter and the database
+    await reconcile_intents(unified_agent.twitter, db)
+
     # Check which mode to use
     if settings.use_unified_agent:
         # NEW: Unified Agent mode
@@ -74,13 +83,21 @@ async def lifespan(app: FastAPI):
         logger.info("MODE: UNIFIED AGENT (new architecture)")
         logger.info("=" * 50)
 
-        scheduler.add_job(
-            unified_agent.run,
-            "interval",
-            minutes=settings.agent_interval_minutes,
-            id="unified_agent"
-        )
-        logger.info(f"Scheduled unified agent every {settings.agent_interval_minutes} minutes")
+        if settings.agent_adaptive_schedule:
+            # Each cycle picks the delay before the next from mention arrivals, limits and read cap
+            AdaptiveSchedule(scheduler, "unified_agent", unified_agent.run, db, tier_manager).start()
+            logger.info(
+                f"Scheduled unified agent adaptively ({settings.agent_min_interval_minutes}-"
+                f"{settings.agent_max_interval_minutes} min, first run in {settings.agent_interval_minutes} min)"
+            )
+        else:
+            scheduler.add_job(
+                unified_agent.run,
+                "interval",
+                minutes=settings.agent_interval_minutes,
+                id="unified_agent"
+            )
+            logger.info(f"Scheduled unified agent every {settings.agent_interval_minutes} minutes")
 
     else:
         # LEGACY: Separate autopost + mentions
@@ -118,6 +135,22 @@ async def lifespan(app: FastAPI):
         hours=1,
         id="tier_refresh"
     )
+
+    # Keep the /metrics snapshot fresh off the request path
+    scheduler.add_job(
+        db.refresh_metrics_snapshot,
+        "interval",
+        seconds=settings.metrics_snapshot_refresh_seconds,
+        id="metrics_snapshot"
+    )
+
+    # Schedule daily partition maintenance (pre-create + archive old months)
+    scheduler.add_job(
+        db.run_partition_maintenance,
+        "interval",
+        hours=24,
+        id="partition_maintenance"
+    )
     scheduler.start()
     logger.info("Scheduler started")
 
@@ -147,21 +180,39 @@ async def health_check():
         "database": "connected" if db_ok else "disconnected",
         "scheduler_running": scheduler.running,
         "tier": tier_manager.tier if tier_manager else "unknown",
+        "db_pool": db.get_pool_stats(),
         "version": "1.3.2"
     }
 
 
 @app.get("/metrics")
 async def metrics():
-    """Get bot metrics and statistics."""
-    return {
-        "posts_total": await db.count_posts(),
-        "posts_today": await db.count_posts_today(),
-        "mentions_total": await db.count_mentions(),
-        "mentions_today": await db.count_mentions_today(),
-        "last_post_at": await db.get_last_post_time(),
-        "last_mention_at": await db.get_last_mention_time()
-    }
+    """Get bot metrics and statistics (in-memory snapshot, no DB hit unless stale)."""
+    return await db.get_metrics_snapshot()
+
+
+@app.get("/metrics/prometheus", response_class=PlainTextResponse)
+async def metrics_prometheus():
+    """Latency histograms, cycle counters and business counts in Prometheus text format."""
+    return PlainTextResponse(
+        await bot_metrics.render_prometheus(db),
+        media_type="text/plain; version=0.0.4"
+    )
+
+
+@app.get("/debug/cycles")
+async def list_cycle_traces():
+    """List recent cycle traces (newest first)."""
+    return {"cycles": tracing.exporter.list()}
+
+
+@app.get("/debug/cycles/{trace_id}")
+async def get_cycle_trace(trace_id: str):
+    """Timeline of one cycle: every LLM, tool, DB and Twitter span with offsets."""
+    trace = tracing.exporter.get(trace_id)
+    if trace is None:
+        raise HTTPException(status_code=404, detail="Trace not found")
+    return trace.timeline()
 
 
 @app.get("/callback")
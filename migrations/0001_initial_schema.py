@@ -0,0 +1,75 @@
+"""
+Initial schema - posts, mentions, bot_state and actions tables.
+
+Idempotent so it can be applied to databases created before
+versioned migrations existed.
+"""
+
+MIGRATION_CONFIG = {
+    "version": 1,
+    "name": "initial_schema",
+    "transactional": True
+}
+
+
+async def upgrade(conn) -> None:
+    """Create base tables and indexes."""
+    # Posts table
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS posts (
+            id SERIAL PRIMARY KEY,
+            text TEXT NOT NULL,
+            tweet_id VARCHAR(50),
+            include_picture BOOLEAN DEFAULT FALSE,
+            created_at TIMESTAMP DEFAULT NOW()
+        )
+    """)
+    await conn.execute("""
+        ALTER TABLE posts ADD COLUMN IF NOT EXISTS include_picture BOOLEAN DEFAULT FALSE
+    """)
+
+    # Mentions table
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS mentions (
+            id SERIAL PRIMARY KEY,
+            tweet_id VARCHAR(50) UNIQUE,
+            author_handle VARCHAR(50),
+            author_text TEXT,
+            our_reply TEXT,
+            action VARCHAR(20),
+            tools_used TEXT,
+            created_at TIMESTAMP DEFAULT NOW()
+        )
+    """)
+    await conn.execute("""
+        ALTER TABLE mentions ADD COLUMN IF NOT EXISTS tools_used TEXT
+    """)
+
+    # Bot state table (for storing last_mention_id, etc.)
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS bot_state (
+            key VARCHAR(50) PRIMARY KEY,
+            value TEXT,
+            updated_at TIMESTAMP DEFAULT NOW()
+        )
+    """)
+
+    # Actions table (unified agent - posts + replies)
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS actions (
+            id SERIAL PRIMARY KEY,
+            action_type VARCHAR(20) NOT NULL,
+            text TEXT NOT NULL,
+            tweet_id VARCHAR(50),
+            include_picture BOOLEAN DEFAULT FALSE,
+            reply_to_tweet_id VARCHAR(50),
+            reply_to_author VARCHAR(50),
+            created_at TIMESTAMP DEFAULT NOW()
+        )
+    """)
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_actions_created_at ON actions(created_at DESC)
+    """)
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_actions_type ON actions(action_type)
+    """)
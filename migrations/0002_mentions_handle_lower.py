@@ -0,0 +1,30 @@
+"""
+Normalized lowercase author handle on mentions.
+
+Adds the column, then backfills existing rows in small batches so the
+table is never locked for long.
+"""
+
+from services.migrations import backfill_in_batches
+
+MIGRATION_CONFIG = {
+    "version": 2,
+    "name": "mentions_handle_lower",
+    "transactional": False
+}
+
+
+async def upgrade(conn) -> None:
+    """Add author_handle_lower and backfill it online."""
+    await conn.execute("""
+        ALTER TABLE mentions ADD COLUMN IF NOT EXISTS author_handle_lower VARCHAR(50)
+    """)
+
+    await backfill_in_batches(conn, """
+        UPDATE mentions SET author_handle_lower = LOWER(author_handle)
+        WHERE id IN (
+            SELECT id FROM mentions
+            WHERE author_handle_lower IS NULL AND author_handle IS NOT NULL
+            LIMIT $1
+        )
+    """)
@@ -0,0 +1,22 @@
+"""
+Partial index for per-user mention history lookups.
+
+Built concurrently so writes to mentions are not blocked.
+"""
+
+from services.migrations import create_index_concurrently
+
+MIGRATION_CONFIG = {
+    "version": 3,
+    "name": "mentions_handle_index",
+    "transactional": False
+}
+
+
+async def upgrade(conn) -> None:
+    """Index (author_handle_lower, created_at DESC) for replied mentions."""
+    await create_index_concurrently(conn, "idx_mentions_handle_replied", """
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_mentions_handle_replied
+        ON mentions(author_handle_lower, created_at DESC)
+        WHERE our_reply IS NOT NULL
+    """)
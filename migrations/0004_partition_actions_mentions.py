@@ -0,0 +1,162 @@
+"""
+Convert actions and mentions to monthly range partitions on created_at.
+
+Runs online: a partitioned copy is built next to each table and filled in
+small autocommitted batches while the bot keeps writing, then a short
+final transaction copies the stragglers and swaps the tables. Only that
+swap takes the ACCESS EXCLUSIVE lock. Ids keep coming from the original
+sequences.
+
+Partitioned tables can't enforce UNIQUE(tweet_id) on mentions (unique
+keys must include the partition key), so it becomes a plain index and
+uniqueness moves to the mention_ids table (migration 0009).
+"""
+
+from datetime import datetime, timezone
+
+from config.settings import settings
+from services.migrations import backfill_in_batches
+from services.partitions import add_months, month_start, partition_name
+
+MIGRATION_CONFIG = {
+    "version": 4,
+    "name": "partition_actions_mentions",
+    "transactional": False
+}
+
+# Ids re-checked during the swap, for rows whose transactions committed
+# after a later id had already been copied
+CATCHUP_ID_WINDOW = 10_000
+
+TABLES = {
+    "actions": {
+        "columns": """
+            action_type VARCHAR(20) NOT NULL,
+            text TEXT NOT NULL,
+            tweet_id VARCHAR(50),
+            include_picture BOOLEAN DEFAULT FALSE,
+            reply_to_tweet_id VARCHAR(50),
+            reply_to_author VARCHAR(50)
+        """,
+        "copy_columns": "action_type, text, tweet_id, include_picture, reply_to_tweet_id, reply_to_author",
+        "indexes": {
+            "idx_actions_created_at": "(created_at DESC)",
+            "idx_actions_type": "(action_type)"
+        },
+        # Actions are never updated after insert
+        "sync_pending": None
+    },
+    "mentions": {
+        "columns": """
+            tweet_id VARCHAR(50),
+            author_handle VARCHAR(50),
+            author_handle_lower VARCHAR(50),
+            author_text TEXT,
+            our_reply TEXT,
+            action VARCHAR(20),
+            tools_used TEXT
+        """,
+        "copy_columns": "tweet_id, author_handle, author_handle_lower, author_text, our_reply, action, tools_used",
+        "indexes": {
+            "idx_mentions_tweet_id": "(tweet_id)",
+            "idx_mentions_created_at": "(created_at DESC)",
+            "idx_mentions_handle_replied": "(author_handle_lower, created_at DESC) WHERE our_reply IS NOT NULL"
+        },
+        # Only pending mentions are updated after insert (to their outcome)
+        "sync_pending": "our_reply = o.our_reply, action = o.action, tools_used = o.tools_used"
+    }
+}
+
+
+async def _is_partitioned(conn, table: str) -> bool:
+    """True if table exists and is already a partitioned table."""
+    return bool(await conn.fetchval(
+        "SELECT relkind = 'p' FROM pg_class WHERE relname = $1",
+        table
+    ))
+
+
+async def _create_shadow(conn, table: str, new: str, spec: dict) -> None:
+    """Create the partitioned copy with its partitions and indexes (idempotent)."""
+    await conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {new} (
+            id INTEGER NOT NULL DEFAULT nextval('{table}_id_seq'),
+            {spec["columns"]},
+            created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+            PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+    """)
+    await conn.execute(f"CREATE TABLE IF NOT EXISTS {table}_default PARTITION OF {new} DEFAULT")
+
+    # Cover every month that already has data, plus the premake window.
+    # Partitions get their final names, so they need no rename at swap time.
+    today = datetime.now(timezone.utc).date()
+    oldest = await conn.fetchval(f"SELECT MIN(created_at) FROM {table}")
+    month = month_start(oldest.date() if oldest else today)
+    last = add_months(today, settings.partition_premake_months)
+    while month <= last:
+        await conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {partition_name(table, month)} PARTITION OF {new}
+            FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')
+        """)
+        month = add_months(month, 1)
+
+    # Built empty, so cheap; renamed to the final names after the swap
+    for index_name, index_def in spec["indexes"].items():
+        await conn.execute(f"CREATE INDEX IF NOT EXISTS {index_name}_new ON {new} {index_def}")
+
+
+async def _swap(conn, table: str, new: str, spec: dict) -> None:
+    """Copy the last rows and swap the tables in one short transaction."""
+    copy_columns = spec["copy_columns"]
+
+    async with conn.transaction():
+        await conn.execute(f"LOCK TABLE {table} IN ACCESS EXCLUSIVE MODE")
+
+        await conn.execute(f"""
+            INSERT INTO {new} (id, {copy_columns}, created_at)
+            SELECT id, {copy_columns}, COALESCE(created_at, NOW()) FROM {table} o
+            WHERE o.id > (SELECT COALESCE(MAX(id), 0) FROM {new}) - {CATCHUP_ID_WINDOW}
+              AND NOT EXISTS (SELECT 1 FROM {new} n WHERE n.id = o.id)
+        """)
+        if spec["sync_pending"]:
+            await conn.execute(f"""
+                UPDATE {new} n SET {spec["sync_pending"]}
+                FROM {table} o
+                WHERE n.action = 'pending' AND o.id = n.id AND o.action != 'pending'
+            """)
+
+        # The sequence belongs to the old table's id and would be dropped with it
+        await conn.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {new}.id")
+        await conn.execute(f"DROP TABLE {table}")
+        await conn.execute(f"ALTER TABLE {new} RENAME TO {table}")
+        await conn.execute(f"ALTER TABLE {table} RENAME CONSTRAINT {new}_pkey TO {table}_pkey")
+        for index_name in spec["indexes"]:
+            await conn.execute(f"ALTER INDEX {index_name}_new RENAME TO {index_name}")
+
+
+async def _partition_table(conn, table: str, spec: dict) -> None:
+    """Swap a plain table for a partitioned copy with the same data."""
+    if await _is_partitioned(conn, table):
+        return
+
+    new = f"{table}_partitioned"
+    await _create_shadow(conn, table, new, spec)
+
+    # Resumes from the highest copied id if a previous run was interrupted
+    copy_columns = spec["copy_columns"]
+    await backfill_in_batches(conn, f"""
+        INSERT INTO {new} (id, {copy_columns}, created_at)
+        SELECT id, {copy_columns}, COALESCE(created_at, NOW()) FROM {table}
+        WHERE id > (SELECT COALESCE(MAX(id), 0) FROM {new})
+        ORDER BY id
+        LIMIT $1
+    """)
+
+    await _swap(conn, table, new, spec)
+
+
+async def upgrade(conn) -> None:
+    """Partition actions and mentions by month."""
+    for table, spec in TABLES.items():
+        await _partition_table(conn, table, spec)
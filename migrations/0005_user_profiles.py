@@ -0,0 +1,29 @@
+"""
+Cached Twitter user profiles.
+
+One row per handle, refreshed when older than PROFILE_CACHE_TTL_SECONDS,
+so profile lookups survive restarts without spending Twitter reads.
+"""
+
+MIGRATION_CONFIG = {
+    "version": 5,
+    "name": "user_profiles",
+    "transactional": True
+}
+
+
+async def upgrade(conn) -> None:
+    """Create user_profiles keyed by lowercase handle."""
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS user_profiles (
+            username_lower VARCHAR(50) PRIMARY KEY,
+            user_id VARCHAR(50),
+            username VARCHAR(50) NOT NULL,
+            bio TEXT,
+            followers BIGINT DEFAULT 0,
+            following BIGINT DEFAULT 0,
+            tweets BIGINT DEFAULT 0,
+            location TEXT,
+            fetched_at TIMESTAMP DEFAULT NOW()
+        )
+    """)
@@ -0,0 +1,31 @@
+"""
+Cached conversation trees.
+
+Every tweet seen in a mention thread (mentions, their ancestors and our
+own replies) is stored once, so reply context for later mentions in the
+same conversation is assembled without spending Twitter reads.
+"""
+
+MIGRATION_CONFIG = {
+    "version": 6,
+    "name": "conversation_tweets",
+    "transactional": True
+}
+
+
+async def upgrade(conn) -> None:
+    """Create conversation_tweets keyed by tweet id, indexed by conversation."""
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS conversation_tweets (
+            tweet_id VARCHAR(50) PRIMARY KEY,
+            conversation_id VARCHAR(50) NOT NULL,
+            author VARCHAR(50) NOT NULL,
+            text TEXT NOT NULL,
+            in_reply_to_tweet_id VARCHAR(50),
+            fetched_at TIMESTAMP DEFAULT NOW()
+        )
+    """)
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_conversation_tweets_conversation
+        ON conversation_tweets(conversation_id)
+    """)
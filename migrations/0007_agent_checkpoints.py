@@ -0,0 +1,26 @@
+"""
+Agent cycle checkpoints.
+
+One row per agent holding the zlib-compressed state of its unfinished
+cycle, so a cycle interrupted by a crash or a failed LLM call can resume
+instead of starting over.
+"""
+
+MIGRATION_CONFIG = {
+    "version": 7,
+    "name": "agent_checkpoints",
+    "transactional": True
+}
+
+
+async def upgrade(conn) -> None:
+    """Create agent_checkpoints keyed by agent name."""
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS agent_checkpoints (
+            agent VARCHAR(50) PRIMARY KEY,
+            cycle_id VARCHAR(64) NOT NULL,
+            iteration INTEGER NOT NULL DEFAULT 0,
+            state BYTEA NOT NULL,
+            updated_at TIMESTAMP DEFAULT NOW()
+        )
+    """)
@@ -0,0 +1,38 @@
+"""
+Action intents.
+
+create_post / create_reply claim a row here before calling Twitter, so a
+retried action is posted at most once and a crash between the Twitter call
+and the actions insert can be reconciled at startup.
+"""
+
+MIGRATION_CONFIG = {
+    "version": 8,
+    "name": "action_intents",
+    "transactional": True
+}
+
+
+async def upgrade(conn) -> None:
+    """Create action_intents keyed by intent hash, indexed on open intents."""
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS action_intents (
+            intent_key VARCHAR(64) PRIMARY KEY,
+            cycle_id VARCHAR(64),
+            action_type VARCHAR(20) NOT NULL,
+            text TEXT NOT NULL,
+            reply_to_tweet_id VARCHAR(50),
+            reply_to_author VARCHAR(50),
+            include_picture BOOLEAN DEFAULT FALSE,
+            status VARCHAR(20) NOT NULL DEFAULT 'pending',
+            tweet_id VARCHAR(50),
+            created_at TIMESTAMP DEFAULT NOW(),
+            updated_at TIMESTAMP DEFAULT NOW()
+        )
+    """)
+    # Startup reconciliation only looks at intents that haven't settled
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_action_intents_open
+        ON action_intents(created_at)
+        WHERE status IN ('pending', 'posted')
+    """)
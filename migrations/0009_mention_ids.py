@@ -0,0 +1,39 @@
+"""
+Mention ids.
+
+The partitioned mentions table can't hold UNIQUE(tweet_id), so uniqueness
+lives in this unpartitioned table instead: save_mention claims the tweet_id
+here with ON CONFLICT DO NOTHING and only inserts the mention if the claim
+succeeded. The stored created_at is the mention row's partition key, so
+lookups by tweet_id probe a single partition, and archiving a month can
+delete that month's ids by range.
+"""
+
+MIGRATION_CONFIG = {
+    "version": 9,
+    "name": "mention_ids",
+    "transactional": True
+}
+
+
+async def upgrade(conn) -> None:
+    """Create mention_ids and claim every tweet_id already in mentions."""
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS mention_ids (
+            tweet_id VARCHAR(50) PRIMARY KEY,
+            created_at TIMESTAMP NOT NULL
+        )
+    """)
+    # Partition archiving deletes ids by month
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_mention_ids_created_at ON mention_ids(created_at)
+    """)
+    # Duplicates from before this table existed keep their oldest row
+    await conn.execute("""
+        INSERT INTO mention_ids (tweet_id, created_at)
+        SELECT tweet_id, MIN(created_at)
+        FROM mentions
+        WHERE tweet_id IS NOT NULL
+        GROUP BY tweet_id
+        ON CONFLICT (tweet_id) DO NOTHING
+    """)
@@ -0,0 +1,13 @@
+"""
+Versioned schema migrations with auto-discovery.
+
+Each migration file is named NNNN_description.py and should export:
+- MIGRATION_CONFIG: dict with version, name, optional transactional
+- An async function upgrade(conn) that applies the change
+
+Migrations run in version order and are recorded in schema_migrations.
+Set transactional=False for steps that cannot run inside a transaction
+(CREATE INDEX CONCURRENTLY, batched online backfills).
+
+Use services/migrations.py to apply them.
+"""
@@ -0,0 +1,247 @@
+"""
+Idempotent posting for create_post and create_reply.
+
+Before calling Twitter, a tool claims an intent row keyed by
+sha256(cycle, action, text, target). The same action in the same cycle
+(an LLM retry, or a cycle resumed from its checkpoint - see
+services/checkpoints.py) is then posted at most once. Intent statuses:
+- pending: claimed, the Twitter call is in flight or its outcome is unknown
+- failed: Twitter rejected the call, so it may be claimed again
+- posted: the tweet exists but is not saved to actions yet
+- recorded: done
+
+reconcile_intents runs at startup and before every agent cycle (cycles never
+overlap, so no intent is in flight then) and settles what a crash or a
+failed record left open.
+Posted intents are saved to actions. Pending ones are looked up among our
+recent tweets: they become posted if found. They become failed (and may be
+claimed again) only once they have been pending for
+intent_pending_grace_seconds, since a timed-out tweet can still show up on
+our timeline later.
+"""
+
+import asyncio
+import hashlib
+import html
+import logging
+import re
+from datetime import timedelta
+from typing import Any
+
+import tweepy
+
+from config.settings import settings
+from services.metrics import ACTION_INTENTS
+from services.storage.base import utcnow
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+FAILED = "failed"
+POSTED = "posted"
+RECORDED = "recorded"
+
+_URL_RE = re.compile(r"https?://\S+")
+
+
+class DuplicateAction(Exception):
+    """The action was already claimed; intent holds the existing row."""
+
+    def __init__(self, intent: dict[str, Any]):
+        super().__init__(f"{intent['action_type']} already {intent['status']}")
+        self.intent = intent
+
+
+def intent_key(cycle_id: str | None, action_type: str, text: str, target: str | None = None) -> str:
+    """Stable hash identifying one action of one cycle."""
+    parts = (cycle_id or "", action_type, text, target or "")
+    return hashlib.sha256("\x1f".join(parts).encode()).hexdigest()
+
+
+async def claim_intent(
+    db,
+    cycle_id: str | None,
+    action_type: str,
+    text: str,
+    reply_to_tweet_id: str | None = None,
+    reply_to_author: str | None = None
+) -> str:
+    """
+    Record the intent to post before calling Twitter.
+
+    Args:
+        db: Database instance.
+        cycle_id: Agent cycle the action belongs to.
+        action_type: "post" or "reply".
+        text: Final tweet text (after truncation).
+        reply_to_tweet_id: Tweet replied to, for replies.
+        reply_to_author: Author replied to, for replies.
+
+    Returns:
+        Intent key.
+
+    Raises:
+        DuplicateAction: The same action is pending or already posted.
+    """
+    key = intent_key(cycle_id, action_type, text, reply_to_tweet_id)
+    claimed = await db.claim_intent({
+        "intent_key": key,
+        "cycle_id": cycle_id,
+        "action_type": action_type,
+        "text": text,
+        "reply_to_tweet_id": reply_to_tweet_id,
+        "reply_to_author": reply_to_author
+    })
+    if not claimed:
+        ACTION_INTENTS.inc(action=action_type, outcome="duplicate")
+        intent = await db.get_intent(key) or {"action_type": action_type, "status": PENDING, "tweet_id": None}
+        logger.warning(f"[INTENTS] Skipping duplicate {action_type}: already {intent['status']}")
+        raise DuplicateAction(intent)
+
+    ACTION_INTENTS.inc(action=action_type, outcome="claimed")
+    return key
+
+
+def describe_duplicate(intent: dict[str, Any]) -> str:
+    """Tool result for an action that was not repeated."""
+    if intent["status"] in (POSTED, RECORDED):
+        return f"Error: Already done this cycle (tweet {intent['tweet_id']}). Not posting it again."
+    return "Error: This action is already in progress or its outcome is unknown. Not posting it again."
+
+
+async def mark_failed(db, key: str, action_type: str, error: Exception) -> None:
+    """
+    Settle an intent whose Twitter call raised.
+
+    Only an error response below 500 proves nothing was posted, so the
+    intent becomes failed and may be retried. Anything else (timeouts,
+    connection resets, 5xx) stays pending for reconcile_intents.
+    """
+    response = getattr(error, "response", None)
+    if isinstance(error, tweepy.HTTPException) and response is not None and response.status_code < 500:
+        await db.update_intent(key, FAILED)
+        ACTION_INTENTS.inc(action=action_type, outcome="failed")
+    else:
+        logger.warning(f"[INTENTS] Outcome of intent {key[:12]} unknown, leaving it pending: {error}")
+
+
+async def mark_posted(db, key: str, tweet_id: str, include_picture: bool) -> None:
+    """The tweet exists; it still has to be saved to actions."""
+    await db.update_intent(key, POSTED, tweet_id=tweet_id, include_picture=include_picture)
+
+
+async def mark_recorded(db, key: str) -> None:
+    """The tweet is saved to actions; the intent is done."""
+    await db.update_intent(key, RECORDED)
+
+
+def _normalize(text: str) -> str:
+    """Compare texts the way Twitter returns them (links shortened, entities escaped)."""
+    return " ".join(_URL_RE.sub("", html.unescape(text)).split())
+
+
+def _find_tweet(intent: dict[str, Any], tweets: list[dict[str, Any]]) -> dict[str, Any] | None:
+    text = _normalize(intent["text"])
+    for tweet in tweets:
+        if _normalize(tweet["text"]) != text:
+            continue
+        if intent["action_type"] == "reply" and tweet["in_reply_to_tweet_id"] != intent["reply_to_tweet_id"]:
+            continue
+        return tweet
+    return None
+
+
+async def _record(db, intent: dict[str, Any]) -> None:
+    """Save a posted intent the way create_post / create_reply would have."""
+    if intent["action_type"] == "post":
+        await db.save_action(
+            action_type="post",
+            text=intent["text"],
+            tweet_id=intent["tweet_id"],
+            include_picture=intent["include_picture"]
+        )
+        return
+
+    await db.save_action(
+        action_type="reply",
+        text=intent["text"],
+        reply_to_tweet_id=intent["reply_to_tweet_id"],
+        reply_to_author=intent["reply_to_author"],
+        include_picture=intent["include_picture"]
+    )
+    saved = await db.save_mention(
+        tweet_id=intent["reply_to_tweet_id"],
+        author_handle=intent["reply_to_author"] or "unknown",
+        author_text="",
+        our_reply=intent["text"],
+        action="agent_replied"
+    )
+    if saved is None:
+        await db.update_mention(
+            tweet_id=intent["reply_to_tweet_id"],
+            our_reply=intent["text"],
+            action="agent_replied"
+        )
+
+
+async def reconcile_intents(twitter, db) -> dict[str, int]:
+    """
+    Settle intents left open by a crash. Run only while no cycle is running.
+
+    Args:
+        twitter: TwitterClient instance (our recent tweets).
+        db: Database instance.
+
+    Returns:
+        Counts of intents recorded, failed and left pending.
+    """
+    counts = {"recorded": 0, "failed": 0, "pending": 0}
+    grace = timedelta(seconds=settings.intent_pending_grace_seconds)
+    try:
+        intents = await db.get_open_intents()
+    except Exception as e:
+        logger.error(f"[INTENTS] Failed to load open intents: {e}")
+        return counts
+
+    if not intents:
+        return counts
+
+    recent = None
+    if any(intent["status"] == PENDING for intent in intents):
+        try:
+            recent = await asyncio.to_thread(twitter.get_my_tweets)
+        except Exception as e:
+            logger.error(f"[INTENTS] Could not fetch our recent tweets, pending intents stay open: {e}")
+
+    for intent in intents:
+        key = intent["intent_key"]
+        try:
+            if intent["status"] == PENDING:
+                if recent is None:
+                    counts["pending"] += 1
+                    continue
+                tweet = _find_tweet(intent, recent)
+                if not tweet and utcnow() - intent["updated_at"] < grace:
+                    counts["pending"] += 1
+                    continue
+                if not tweet:
+                    await db.update_intent(key, FAILED)
+                    counts["failed"] += 1
+                    ACTION_INTENTS.inc(action=intent["action_type"], outcome="reconciled_failed")
+                    continue
+                intent["tweet_id"] = tweet["tweet_id"]
+                await db.update_intent(key, POSTED, tweet_id=tweet["tweet_id"])
+
+            await _record(db, intent)
+            await mark_recorded(db, key)
+            counts["recorded"] += 1
+            ACTION_INTENTS.inc(action=intent["action_type"], outcome="reconciled_posted")
+        except Exception as e:
+            logger.error(f"[INTENTS] Failed to reconcile intent {key[:12]}: {e}")
+            counts["pending"] += 1
+
+    logger.info(
+        f"[INTENTS] Reconciled {len(intents)} open intents: {counts['recorded']} recorded, "
+        f"{counts['failed']} not posted, {counts['pending']} still open"
+    )
+    return counts
@@ -0,0 +1,202 @@
+"""
+Adaptive scheduling for the unified agent.
+
+Instead of a fixed agent_interval_minutes, each cycle schedules the next
+one (an APScheduler date job):
+- mention arrivals are tracked as an EWMA rate from ingestion (new tweet ids
+  seen by fetch_unprocessed_mentions), weighted by the time between fetches
+  so extra fetches within a cycle don't damp it, and the interval is sized
+  so a cycle handles about agent_mentions_per_cycle of them
+- after an idle cycle (nothing arrived, nothing done, or the LLM was
+  skipped) the interval grows by agent_idle_backoff, up to the maximum;
+  a failed cycle is retried after the base interval instead
+- the interval is stretched when TierManager forecasts that the monthly
+  read cap would run out before it resets, and waits for UTC midnight once
+  both daily post and reply quotas are used up
+"""
+
+import logging
+import math
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable
+
+from config.settings import settings
+from services.metrics import AGENT_NEXT_INTERVAL, MENTION_ARRIVAL_RATE
+
+logger = logging.getLogger(__name__)
+
+
+class ArrivalTracker:
+    """Time-weighted EWMA of new mentions per minute, fed by every mentions fetch."""
+
+    def __init__(self, tau_minutes: float, max_seen: int = 5000):
+        self.tau_minutes = tau_minutes
+        self.max_seen = max_seen
+        self.rate = 0.0
+        # New mentions since the scheduler last called take_new()
+        self.new_since_take = 0
+        self._last_observed: float | None = None
+        # Tweet ids already counted (fetches overlap, pending mentions come back)
+        self._seen: OrderedDict[str, None] = OrderedDict()
+
+    def observe(self, tweet_ids: list[str], now: float | None = None) -> int:
+        """
+        Count the mentions not seen before and update the rate.
+
+        Args:
+            tweet_ids: Ids returned by one mentions fetch.
+            now: Fetch time (time.time()).
+
+        Returns:
+            Number of new mentions.
+        """
+        now = time.time() if now is None else now
+        new = 0
+        for tweet_id in tweet_ids:
+            if tweet_id not in self._seen:
+                self._seen[tweet_id] = None
+                new += 1
+        while len(self._seen) > self.max_seen:
+            self._seen.popitem(last=False)
+
+        # The first fetch only establishes the baseline (its mentions may be days old).
+        # Weighting by elapsed time keeps a second fetch seconds later from
+        # pulling the rate towards zero.
+        if self._last_observed is not None:
+            elapsed = max((now - self._last_observed) / 60, 1 / 60)
+            alpha = 1 - math.exp(-elapsed / self.tau_minutes)
+            self.rate = alpha * (new / elapsed) + (1 - alpha) * self.rate
+            self.new_since_take += new
+        self._last_observed = now
+
+        MENTION_ARRIVAL_RATE.set(round(self.rate, 4))
+        return new
+
+    def take_new(self) -> int:
+        """New mentions seen since the last call (one scheduler cycle)."""
+        new, self.new_since_take = self.new_since_take, 0
+        return new
+
+
+mention_arrivals = ArrivalTracker(settings.agent_arrival_ewma_tau_minutes)
+
+
+def _minutes_until_midnight(now: datetime) -> float:
+    midnight = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    return (midnight - now).total_seconds() / 60
+
+
+class AdaptiveSchedule:
+    """Runs a cycle function, choosing the delay before each next run."""
+
+    def __init__(
+        self,
+        scheduler,
+        job_id: str,
+        run: Callable[[], Awaitable[dict[str, Any]]],
+        db,
+        tier_manager,
+        arrivals: ArrivalTracker = mention_arrivals
+    ):
+        """
+        Args:
+            scheduler: APScheduler AsyncIOScheduler.
+            job_id: Id of the date job (replaced on every reschedule).
+            run: Cycle function (UnifiedAgent.run).
+            db: Database instance (daily quotas).
+            tier_manager: TierManager instance (limits, read-cap forecast).
+            arrivals: Mention arrival tracker.
+        """
+        self.scheduler = scheduler
+        self.job_id = job_id
+        self.run = run
+        self.db = db
+        self.tier_manager = tier_manager
+        self.arrivals = arrivals
+        self.interval = float(settings.agent_interval_minutes)
+
+    def start(self) -> None:
+        """Schedule the first cycle after the base interval."""
+        self._schedule(self.interval)
+
+    def _schedule(self, minutes: float) -> None:
+        self.scheduler.add_job(
+            self._tick,
+            "date",
+            run_date=datetime.now(timezone.utc) + timedelta(minutes=minutes),
+            id=self.job_id,
+            replace_existing=True
+        )
+
+    async def _tick(self) -> None:
+        result: dict[str, Any] = {}
+        try:
+            result = await self.run()
+        except Exception as e:
+            logger.error(f"[SCHEDULE] Cycle raised: {e}")
+            result = {"success": False, "error": str(e)}
+
+        try:
+            self.interval = await self.next_interval(result)
+        except Exception as e:
+            logger.error(f"[SCHEDULE] Could not compute next interval, using base: {e}")
+            self.interval = float(settings.agent_interval_minutes)
+
+        AGENT_NEXT_INTERVAL.set(round(self.interval, 2))
+        self._schedule(self.interval)
+
+    async def _quotas_exhausted(self) -> bool:
+        """True when no post and no reply is allowed for the rest of the UTC day."""
+        daily_posts, daily_replies = self.tier_manager.get_daily_limits()
+        can_mentions, _ = self.tier_manager.can_use_mentions()
+        posts_left = daily_posts - await self.db.count_actions_today("post")
+        replies_left = daily_replies - await self.db.count_actions_today("reply") if can_mentions else 0
+        return posts_left <= 0 and replies_left <= 0
+
+    async def next_interval(self, result: dict[str, Any]) -> float:
+        """
+        Minutes until the next cycle.
+
+        Args:
+            result: Return value of the cycle that just ran.
+
+        Returns:
+            Delay in minutes.
+        """
+        low = settings.agent_min_interval_minutes
+        high = settings.agent_max_interval_minutes
+        rate = self.arrivals.rate
+        acted = result.get("posts", 0) + result.get("replies", 0)
+        # A failed cycle isn't idle; its arrivals count towards the retry's decision
+        failed = result.get("success") is False
+        arrived = 0 if failed else self.arrivals.take_new()
+        idle = result.get("skipped") or (not acted and not arrived)
+
+        if failed:
+            interval = float(settings.agent_interval_minutes)
+            reason = "retry after failed cycle"
+        elif idle:
+            interval = self.interval * settings.agent_idle_backoff
+            reason = "idle backoff"
+        elif rate > 0:
+            interval = settings.agent_mentions_per_cycle / rate
+            reason = f"{rate:.2f} mentions/min"
+        else:
+            interval = float(settings.agent_interval_minutes)
+            reason = "base"
+        interval = min(max(interval, low), high)
+
+        # Spread the remaining reads over the time left until the cap resets
+        pressure = self.tier_manager.read_cap_pressure()
+        if pressure > 1:
+            interval = min(interval * pressure, high)
+            reason += f", read cap forecast {pressure:.0%}"
+
+        if await self._quotas_exhausted():
+            interval = max(interval, _minutes_until_midnight(datetime.now(timezone.utc)))
+            reason = "daily limits reached"
+
+        logger.info(f"[SCHEDULE] Next agent cycle in {interval:.1f} min ({reason})")
+        return interval
@@ -8,13 +8,15 @@ import time
 from pathlib import Path
 from typing import Any
 
+from config.settings import settings
 from services.database import Database
 from services.llm import LLMClient
+from services.tracing import span, traced
 from services.twitter import TwitterClient
 from tools.registry import TOOLS, get_tools_description
 from config.personality import SYSTEM_PROMPT
 from config.prompts.agent_autopost import AUTOPOST_AGENT_PROMPT
-from config.schemas import PLAN_SCHEMA, POST_TEXT_SCHEMA, TOOL_REACTION_SCHEMA
+from config.schemas import PLAN_OR_POST_SCHEMA, PLAN_SCHEMA, POST_TEXT_SCHEMA, TOOL_REACTION_SCHEMA
 
 logger = logging.getLogger(__name__)
 
@@ -46,10 +48,10 @@ def get_agent_system_prompt() -> str:
 class AutoPostService:
     """Agent-based autoposting service with guards and safe tool handling."""
 
-    def __init__(self, db: Database, tier_manager=None):
+    def __init__(self, db: Database, tier_manager=None, twitter: TwitterClient | None = None):
         self.db = db
         self.llm = LLMClient()
-        self.twitter = TwitterClient()
+        self.twitter = twitter or TwitterClient()
         self.tier_manager = tier_manager
 
     # -----------------------
@@ -126,6 +128,7 @@ class AutoPostService:
     # -----------------------
     # Main run
     # -----------------------
+    @traced("autopost.run", cycle=True)
     async def run(self) -> dict[str, Any]:
         start = time.time()
 
@@ -160,8 +163,15 @@ Create a plan if needed, then write the post.""",
                 },
             ]
 
-            # Ask for plan
-            plan_result = await self.llm.chat(messages, PLAN_SCHEMA)
+            # Ask for plan (fast path: the post too, when no tools are needed)
+            plan_schema = PLAN_SCHEMA
+            if settings.llm_fast_path:
+                plan_schema = PLAN_OR_POST_SCHEMA
+                messages[-1]["content"] += """
+If you need no tools, leave plan empty and write your final tweet (max 280 characters) in post_text.
+Otherwise leave post_text empty - you'll write it after seeing the tool results."""
+
+            plan_result = await self.llm.chat(messages, plan_schema)
             raw_plan = plan_result.get("plan", [])
 
             plan = self._validate_plan(raw_plan)
@@ -177,7 +187,8 @@ Create a plan if needed, then write the post.""",
                 params = step.get("params", {})
 
                 if tool == "web_search":
-                    result = await TOOLS[tool](params.get("query", ""))
+                    with span(f"tool.{tool}"):
+                        result = await TOOLS[tool](params.get("query", ""))
                     messages.append(
                         {
                             "role": "user",
@@ -187,21 +198,26 @@ Create a plan if needed, then write the post.""",
 
                 # No image tools allowed
 
-                reaction = await self.llm.chat(messages, TOOL_REACTION_SCHEMA)
+                if settings.llm_tool_reactions:
+                    reaction = await self.llm.chat(messages, TOOL_REACTION_SCHEMA)
+                    messages.append(
+                        {"role": "assistant", "content": reaction.get("thinking", "")}
+                    )
+
+            # Fast path: no tools ran, post already written with the plan
+            post_text = "" if plan else plan_result.get("post_text", "").strip()
+
+            if not post_text:
+                # Final tweet
                 messages.append(
-                    {"role": "assistant", "content": reaction.get("thinking", "")}
+                    {
+                        "role": "user",
+                        "content": "Now write your final tweet text (max 280 characters).",
+                    }
                 )
 
-            # Final tweet
-            messages.append(
-                {
-                    "role": "user",
-                    "content": "Now write your final tweet text (max 280 characters).",
-                }
-            )
-
-            post_result = await self.llm.chat(messages, POST_TEXT_SCHEMA)
-            post_text = post_result["post_text"].strip()
+                post_result = await self.llm.chat(messages, POST_TEXT_SCHEMA)
+                post_text = post_result["post_text"].strip()
 
             if len(post_text) > 280:
                 post_text = post_text[:277] + "..."
@@ -0,0 +1,128 @@
+"""
+Durable checkpoints for agent cycles.
+
+UnifiedAgent.run saves its state after every step: the conversation
+(including fetched mentions and web search results), tools used for the
+current action, post/reply counts, iteration and the side-effecting tool
+call in flight. If the process restarts or an LLM call fails mid-cycle,
+the next cycle resumes from the last checkpoint instead of redoing the
+expensive work, as long as the checkpoint is younger than
+agent_checkpoint_ttl_seconds and has been resumed fewer than
+agent_checkpoint_max_resumes times (so a cycle that keeps failing is
+eventually dropped).
+
+State is compact JSON compressed with zlib, one row per agent. Checkpoint
+errors are logged and never fail the cycle.
+"""
+
+import json
+import logging
+import zlib
+from typing import Any
+
+from config.settings import settings
+from services.metrics import AGENT_CHECKPOINTS
+
+logger = logging.getLogger(__name__)
+
+# Bump when the state layout changes; older checkpoints are discarded
+CHECKPOINT_VERSION = 1
+# Conversations are mostly English text and JSON, which level 6 already compresses ~4x
+COMPRESSION_LEVEL = 6
+
+
+def encode_state(state: dict[str, Any]) -> bytes:
+    """Serialize cycle state to compressed JSON."""
+    payload = {"version": CHECKPOINT_VERSION, **state}
+    return zlib.compress(json.dumps(payload, separators=(",", ":")).encode(), COMPRESSION_LEVEL)
+
+
+def decode_state(data: bytes) -> dict[str, Any]:
+    """Inverse of encode_state."""
+    return json.loads(zlib.decompress(data))
+
+
+async def load_checkpoint(db, agent: str) -> dict[str, Any] | None:
+    """
+    Load the resumable checkpoint of an agent.
+
+    Args:
+        db: Database instance.
+        agent: Agent name.
+
+    Returns:
+        Decoded state plus cycle_id, with resumes already incremented and
+        saved, or None when there is nothing to resume (disabled, none
+        saved, expired, unreadable or resumed too often - the last three
+        are deleted).
+    """
+    if not settings.agent_checkpoints:
+        return None
+
+    try:
+        row = await db.get_checkpoint(agent, settings.agent_checkpoint_ttl_seconds)
+    except Exception as e:
+        logger.warning(f"[CHECKPOINT] Failed to load checkpoint for {agent}: {e}")
+        return None
+
+    if not row:
+        return None
+
+    try:
+        state = decode_state(bytes(row["state"]))
+    except (zlib.error, ValueError) as e:
+        logger.warning(f"[CHECKPOINT] Unreadable checkpoint for {agent}, discarding: {e}")
+        await clear_checkpoint(db, agent)
+        return None
+
+    if state.get("version") != CHECKPOINT_VERSION:
+        logger.info(f"[CHECKPOINT] Checkpoint for {agent} has an old layout, discarding")
+        await clear_checkpoint(db, agent)
+        return None
+
+    if state.get("resumes", 0) >= settings.agent_checkpoint_max_resumes:
+        logger.warning(f"[CHECKPOINT] Cycle {row['cycle_id']} already resumed {state['resumes']} times, starting over")
+        AGENT_CHECKPOINTS.inc(event="abandoned")
+        await clear_checkpoint(db, agent)
+        return None
+
+    # Count the resume before any work, so a cycle that fails straight away
+    # still reaches agent_checkpoint_max_resumes
+    state["resumes"] = state.get("resumes", 0) + 1
+    await save_checkpoint(db, agent, row["cycle_id"], state)
+
+    AGENT_CHECKPOINTS.inc(event="resumed")
+    state["cycle_id"] = row["cycle_id"]
+    return state
+
+
+async def save_checkpoint(db, agent: str, cycle_id: str, state: dict[str, Any]) -> None:
+    """
+    Save the state of a running cycle, replacing the previous checkpoint.
+
+    Args:
+        db: Database instance.
+        agent: Agent name.
+        cycle_id: Trace id of the cycle that started the conversation.
+        state: JSON-serializable state (must include iteration).
+    """
+    if not settings.agent_checkpoints:
+        return
+
+    try:
+        data = encode_state(state)
+        await db.save_checkpoint(agent, cycle_id, state["iteration"], data)
+        AGENT_CHECKPOINTS.inc(event="saved")
+    except Exception as e:
+        logger.warning(f"[CHECKPOINT] Failed to save checkpoint for {agent}: {e}")
+
+
+async def clear_checkpoint(db, agent: str) -> None:
+    """Delete the checkpoint of an agent once its cycle has finished."""
+    if not settings.agent_checkpoints:
+        return
+
+    try:
+        await db.delete_checkpoint(agent)
+    except Exception as e:
+        logger.warning(f"[CHECKPOINT] Failed to delete checkpoint for {agent}: {e}")
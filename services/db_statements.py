@@ -0,0 +1,259 @@
+"""
+Named SQL statements used by the Database service.
+
+asyncpg prepares every query on first use and keeps it in a per-connection
+statement cache keyed by the exact SQL text. Keeping all hot queries here,
+with stable text, means each connection parses a statement once and then
+only sends Bind/Execute with parameters. Names are also used for per-query
+timing.
+"""
+
+STATEMENTS: dict[str, str] = {
+    # ==================== Posts ====================
+    "recent_posts_formatted": """
+        WITH numbered AS (
+            SELECT
+                text,
+                include_picture,
+                row_number() OVER (ORDER BY created_at ASC) AS rn
+            FROM posts
+        )
+        SELECT
+            COALESCE(
+                string_agg(
+                    'post ' || rn || ' (pic: ' || include_picture || '): ' || text,
+                    E'\\n' ORDER BY rn
+                ),
+                'No previous posts'
+            ) AS texts
+        FROM numbered
+        WHERE rn > (SELECT COUNT(*) FROM posts) - $1
+    """,
+    "recent_posts": """
+        SELECT id, text, tweet_id, include_picture, created_at
+        FROM posts
+        ORDER BY created_at DESC
+        LIMIT $1
+    """,
+    "save_post": """
+        INSERT INTO posts (text, tweet_id, include_picture)
+        VALUES ($1, $2, $3)
+        RETURNING id
+    """,
+
+    # ==================== Mentions ====================
+    # Claims tweet_id in mention_ids first; no row back means it was already saved
+    "save_mention": """
+        WITH claimed AS (
+            INSERT INTO mention_ids (tweet_id, created_at)
+            VALUES ($1, NOW())
+            ON CONFLICT (tweet_id) DO NOTHING
+            RETURNING created_at
+        )
+        INSERT INTO mentions (
+            tweet_id, author_handle, author_handle_lower,
+            author_text, our_reply, action, tools_used, created_at
+        )
+        SELECT $1, $2, LOWER($2), $3, $4, $5, $6, created_at FROM claimed
+        RETURNING id
+    """,
+    "user_mention_history": """
+        SELECT author_text, our_reply, created_at
+        FROM mentions
+        WHERE author_handle_lower = LOWER($1) AND our_reply IS NOT NULL
+        ORDER BY created_at DESC
+        LIMIT $2
+    """,
+    # Uses idx_mentions_handle_replied
+    "last_reply_times": """
+        SELECT author_handle_lower, MAX(created_at) AS last_reply_at
+        FROM mentions
+        WHERE author_handle_lower = ANY($1::text[]) AND our_reply IS NOT NULL
+        GROUP BY author_handle_lower
+    """,
+    "recent_mention_replies": """
+        SELECT author_handle, author_text, our_reply, action
+        FROM mentions
+        WHERE our_reply IS NOT NULL
+        ORDER BY created_at DESC
+        LIMIT $1
+    """,
+    # The created_at bound from mention_ids prunes mentions to one partition
+    "mention_exists_any": """
+        SELECT 1 FROM mention_ids WHERE tweet_id = $1
+    """,
+    "mention_exists_processed": """
+        SELECT 1 FROM mentions
+        WHERE tweet_id = $1 AND action != 'pending'
+          AND created_at = (SELECT created_at FROM mention_ids WHERE tweet_id = $1)
+    """,
+    "pending_mention": """
+        SELECT author_handle, author_text FROM mentions
+        WHERE tweet_id = $1
+          AND created_at = (SELECT created_at FROM mention_ids WHERE tweet_id = $1)
+    """,
+    "update_mention": """
+        UPDATE mentions
+        SET our_reply = $2, action = $3, tools_used = $4
+        WHERE tweet_id = $1
+          AND created_at = (SELECT created_at FROM mention_ids WHERE tweet_id = $1)
+    """,
+
+    # ==================== Bot state ====================
+    "get_state": """
+        SELECT value FROM bot_state WHERE key = $1
+    """,
+    "set_state": """
+        INSERT INTO bot_state (key, value, updated_at)
+        VALUES ($1, $2, NOW())
+        ON CONFLICT (key) DO UPDATE SET value = $2, updated_at = NOW()
+    """,
+
+    # ==================== Metrics ====================
+    "ping": "SELECT 1",
+    "count_posts": "SELECT COUNT(*) FROM posts",
+    "count_posts_today": "SELECT COUNT(*) FROM posts WHERE created_at >= CURRENT_DATE",
+    "count_mentions": "SELECT COUNT(*) FROM mentions",
+    "count_mentions_today": "SELECT COUNT(*) FROM mentions WHERE created_at >= CURRENT_DATE",
+    "last_post_time": "SELECT created_at FROM posts ORDER BY created_at DESC LIMIT 1",
+    "last_mention_time": "SELECT created_at FROM mentions ORDER BY created_at DESC LIMIT 1",
+    # All /metrics counts in one round trip
+    "metrics_snapshot": """
+        SELECT
+            (SELECT COUNT(*) FROM posts) AS posts_total,
+            (SELECT COUNT(*) FROM posts WHERE created_at >= CURRENT_DATE) AS posts_today,
+            (SELECT COUNT(*) FROM mentions) AS mentions_total,
+            (SELECT COUNT(*) FROM mentions WHERE created_at >= CURRENT_DATE) AS mentions_today,
+            (SELECT COUNT(*) FROM actions WHERE created_at >= CURRENT_DATE) AS actions_today,
+            (SELECT MAX(created_at) FROM posts) AS last_post_at,
+            (SELECT MAX(created_at) FROM mentions) AS last_mention_at
+    """,
+
+    # ==================== User profiles ====================
+    "user_profiles_fresh": """
+        SELECT user_id, username, bio, followers, following, tweets, location
+        FROM user_profiles
+        WHERE username_lower = ANY($1::text[])
+          AND fetched_at >= NOW() - make_interval(secs => $2)
+    """,
+    # Batch upsert, one row per element of the parallel arrays
+    "save_user_profiles": """
+        INSERT INTO user_profiles (
+            username_lower, user_id, username, bio,
+            followers, following, tweets, location, fetched_at
+        )
+        SELECT LOWER(u.username), u.user_id, u.username, u.bio,
+               u.followers, u.following, u.tweets, u.location, NOW()
+        FROM unnest($1::text[], $2::text[], $3::text[], $4::bigint[], $5::bigint[], $6::bigint[], $7::text[])
+            AS u(user_id, username, bio, followers, following, tweets, location)
+        ON CONFLICT (username_lower) DO UPDATE SET
+            user_id = EXCLUDED.user_id,
+            username = EXCLUDED.username,
+            bio = EXCLUDED.bio,
+            followers = EXCLUDED.followers,
+            following = EXCLUDED.following,
+            tweets = EXCLUDED.tweets,
+            location = EXCLUDED.location,
+            fetched_at = NOW()
+    """,
+
+    # ==================== Conversation tweets ====================
+    "conversation_tweets": """
+        SELECT tweet_id, conversation_id, author, text, in_reply_to_tweet_id
+        FROM conversation_tweets
+        WHERE conversation_id = ANY($1::text[])
+    """,
+    # Tweets don't change, so existing rows are kept as they are
+    "save_conversation_tweets": """
+        INSERT INTO conversation_tweets (
+            tweet_id, conversation_id, author, text, in_reply_to_tweet_id
+        )
+        SELECT * FROM unnest($1::text[], $2::text[], $3::text[], $4::text[], $5::text[])
+        ON CONFLICT (tweet_id) DO NOTHING
+    """,
+
+    # ==================== Agent checkpoints ====================
+    "get_checkpoint": """
+        SELECT cycle_id, iteration, state, updated_at
+        FROM agent_checkpoints
+        WHERE agent = $1 AND updated_at >= NOW() - make_interval(secs => $2)
+    """,
+    "save_checkpoint": """
+        INSERT INTO agent_checkpoints (agent, cycle_id, iteration, state, updated_at)
+        VALUES ($1, $2, $3, $4, NOW())
+        ON CONFLICT (agent) DO UPDATE SET
+            cycle_id = EXCLUDED.cycle_id,
+            iteration = EXCLUDED.iteration,
+            state = EXCLUDED.state,
+            updated_at = EXCLUDED.updated_at
+    """,
+    "delete_checkpoint": """
+        DELETE FROM agent_checkpoints WHERE agent = $1
+    """,
+
+    # ==================== Action intents ====================
+    # Returns a row only when claimed: new, or retrying an intent Twitter rejected
+    "claim_intent": """
+        INSERT INTO action_intents (
+            intent_key, cycle_id, action_type, text, reply_to_tweet_id, reply_to_author
+        )
+        VALUES ($1, $2, $3, $4, $5, $6)
+        ON CONFLICT (intent_key) DO UPDATE SET
+            status = 'pending',
+            tweet_id = NULL,
+            updated_at = NOW()
+        WHERE action_intents.status = 'failed'
+        RETURNING intent_key
+    """,
+    "get_intent": """
+        SELECT intent_key, cycle_id, action_type, text, reply_to_tweet_id, reply_to_author,
+               include_picture, status, tweet_id, created_at, updated_at
+        FROM action_intents
+        WHERE intent_key = $1
+    """,
+    "update_intent": """
+        UPDATE action_intents
+        SET status = $2,
+            tweet_id = COALESCE($3, tweet_id),
+            include_picture = COALESCE($4, include_picture),
+            updated_at = NOW()
+        WHERE intent_key = $1
+    """,
+    "open_intents": """
+        SELECT intent_key, cycle_id, action_type, text, reply_to_tweet_id, reply_to_author,
+               include_picture, status, tweet_id, created_at, updated_at
+        FROM action_intents
+        WHERE status IN ('pending', 'posted')
+        ORDER BY created_at ASC
+    """,
+
+    # ==================== Actions ====================
+    "recent_actions": """
+        SELECT action_type, text, include_picture, reply_to_author, created_at
+        FROM actions
+        ORDER BY created_at DESC
+        LIMIT $1
+    """,
+    "save_action": """
+        INSERT INTO actions (
+            action_type, text, tweet_id, include_picture,
+            reply_to_tweet_id, reply_to_author
+        )
+        VALUES ($1, $2, $3, $4, $5, $6)
+        RETURNING id
+    """,
+    "user_actions_history": """
+        SELECT text, reply_to_author, created_at
+        FROM actions
+        WHERE LOWER(reply_to_author) = LOWER($1) AND action_type = 'reply'
+        ORDER BY created_at DESC
+        LIMIT $2
+    """,
+    "count_actions_today": """
+        SELECT COUNT(*) FROM actions WHERE created_at >= CURRENT_DATE
+    """,
+    "count_actions_today_by_type": """
+        SELECT COUNT(*) FROM actions
+        WHERE created_at >= CURRENT_DATE AND action_type = $1
+    """,
+}
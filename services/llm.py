@@ -3,31 +3,401 @@ LLM client for OpenRouter API.
 
 Provides async interface for text generation with tool calling support.
 Unified client for all LLM interactions in the bot.
+
+Every call goes through one execution layer that:
+- retries retryable failures (timeouts, connection errors, 408/429/5xx,
+  malformed bodies) with jittered exponential backoff, honoring Retry-After
+- enforces a per-call deadline across all attempts
+- optionally hedges: fires a duplicate request when the first one is
+  slower than LLM_HEDGE_AFTER_SECONDS and keeps whichever finishes first
+- falls back through LLM_FALLBACK_MODELS (config/models.py) once a model
+  keeps failing or rejects the request
+
+Structured replies are extracted, validated and repaired locally
+(services/structured_output.py); the model is only re-asked with a
+targeted correction prompt when local repair fails.
+
+chat_stream() streams a structured reply over SSE and reports each
+top-level field as soon as it is complete (e.g. the agent's tool and
+params before its thinking), recording time-to-first-token.
 """
 
+import asyncio
 import json
 import logging
-from typing import Any
+import random
+import time
+from typing import Any, Callable
 
 import httpx
 
-from config.models import LLM_MODEL
+from config.models import LLM_FALLBACK_MODELS, LLM_MODEL
+from config.settings import settings
+from services.structured_output import (
+    IncrementalJSONParser,
+    StructuredOutputError,
+    correction_prompt,
+    parse_structured
+)
+from services.tracing import span
 from utils.api import OPENROUTER_URL, get_openrouter_headers
 
 logger = logging.getLogger(__name__)
 
+RETRYABLE_STATUSES = {408, 409, 425, 429, 500, 502, 503, 504, 520, 522, 524}
+# Auth/billing problems won't be fixed by another model
+FATAL_STATUSES = {401, 402, 403}
+
+
+class LLMError(Exception):
+    """LLM call failed after all retries and fallbacks."""
+
+
+class _AttemptError(Exception):
+    """One failed attempt; retryable decides between retry and next model."""
+
+    def __init__(self, message: str, retryable: bool, retry_after: float | None = None, status: int | None = None):
+        super().__init__(message)
+        self.retryable = retryable
+        self.retry_after = retry_after
+        self.status = status
+
+
+def _schema_name(response_format: dict[str, Any] | None) -> str | None:
+    if not response_format:
+        return None
+    return response_format.get("json_schema", {}).get("name")
+
+
+def _retry_after(response: httpx.Response) -> float | None:
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        return None
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough prompt token count (~4 characters per token) for budgeting."""
+    return len(text) // 4 + 1
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """
+    Full-jitter exponential backoff.
+
+    Args:
+        attempt: 1-based attempt number that just failed.
+        base: Base delay in seconds.
+        cap: Maximum delay in seconds.
+    """
+    return random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
+
 
 class LLMClient:
     """Async client for OpenRouter LLM API."""
 
-    def __init__(self, model: str = LLM_MODEL):
+    def __init__(self, model: str = LLM_MODEL, fallback_models: list[str] | None = None):
         """
         Initialize LLM client.
 
         Args:
             model: Model identifier for OpenRouter.
+            fallback_models: Models tried in order after `model` fails
+                (defaults to LLM_FALLBACK_MODELS).
         """
         self.model = model
+        fallbacks = LLM_FALLBACK_MODELS if fallback_models is None else fallback_models
+        self.models = [model] + [m for m in fallbacks if m != model]
+
+    # ==================== Execution layer ====================
+
+    async def _post(self, client: httpx.AsyncClient, payload: dict[str, Any], timeout: float) -> dict[str, Any]:
+        """Single HTTP attempt; returns the assistant message or raises _AttemptError."""
+        try:
+            response = await client.post(
+                OPENROUTER_URL,
+                headers=get_openrouter_headers(),
+                json=payload,
+                timeout=timeout
+            )
+        except httpx.TimeoutException:
+            raise _AttemptError(f"timeout after {timeout:.1f}s", retryable=True)
+        except httpx.TransportError as e:
+            raise _AttemptError(f"transport error: {e}", retryable=True)
+
+        if response.status_code >= 400:
+            raise _AttemptError(
+                f"HTTP {response.status_code}: {response.text[:200]}",
+                retryable=response.status_code in RETRYABLE_STATUSES,
+                retry_after=_retry_after(response),
+                status=response.status_code
+            )
+
+        try:
+            data = response.json()
+            message = data["choices"][0]["message"]
+        except (ValueError, KeyError, IndexError, TypeError):
+            # OpenRouter reports upstream failures as 200 + {"error": ...}
+            raise _AttemptError(f"malformed response: {response.text[:200]}", retryable=True)
+
+        if message.get("content") is None and not message.get("images"):
+            raise _AttemptError("empty completion", retryable=True)
+
+        usage = data.get("usage") or {}
+        message["_usage"] = usage
+        message["_finish_reason"] = data["choices"][0].get("finish_reason")
+        return message
+
+    async def _attempt(self, client: httpx.AsyncClient, payload: dict[str, Any], timeout: float) -> dict[str, Any]:
+        """One logical attempt, hedged with a duplicate request when enabled."""
+        hedge_after = settings.llm_hedge_after_seconds
+        if hedge_after <= 0 or hedge_after >= timeout:
+            return await self._post(client, payload, timeout)
+
+        primary = asyncio.create_task(self._post(client, payload, timeout))
+        done, _ = await asyncio.wait({primary}, timeout=hedge_after)
+        if done:
+            return primary.result()
+
+        logger.info(f"[LLM] No response after {hedge_after}s, sending hedged request")
+        with span("llm.hedge", model=payload["model"]):
+            hedge = asyncio.create_task(self._post(client, payload, timeout - hedge_after))
+            pending = {primary, hedge}
+            error: _AttemptError | None = None
+            try:
+                while pending:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        if task.exception() is None:
+                            return task.result()
+                        error = task.exception()
+                raise error
+            finally:
+                for task in pending:
+                    task.cancel()
+
+    async def _complete(self, payload: dict[str, Any]) -> dict[str, Any]:
+        """
+        Run a chat completion with retries, deadline, hedging and model fallback.
+
+        Args:
+            payload: Request body without "model".
+
+        Returns:
+            Assistant message dict from the first model that succeeds.
+
+        Raises:
+            LLMError: When every model failed or the deadline passed.
+        """
+        deadline = time.monotonic() + settings.llm_call_deadline_seconds
+        last_error: _AttemptError | None = None
+
+        async with httpx.AsyncClient() as client:
+            for model in self.models:
+                for attempt in range(1, settings.llm_max_attempts + 1):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise LLMError(f"deadline of {settings.llm_call_deadline_seconds}s exceeded: {last_error}")
+
+                    timeout = min(settings.llm_request_timeout_seconds, remaining)
+                    with span("llm.attempt", model=model, attempt=attempt) as s:
+                        try:
+                            message = await self._attempt(client, {**payload, "model": model}, timeout)
+                            usage = message.pop("_usage", {})
+                            if s:
+                                s.set_attribute("llm.prompt_tokens", usage.get("prompt_tokens"))
+                                s.set_attribute("llm.completion_tokens", usage.get("completion_tokens"))
+                            if model != self.model:
+                                logger.warning(f"[LLM] Served by fallback model {model}")
+                            return message
+                        except _AttemptError as e:
+                            last_error = e
+                            if s:
+                                s.status = "ERROR"
+                                s.set_attribute("error", str(e))
+                                s.set_attribute("http.status_code", e.status)
+
+                    if last_error.status in FATAL_STATUSES:
+                        raise LLMError(str(last_error))
+
+                    if not last_error.retryable or attempt == settings.llm_max_attempts:
+                        logger.warning(f"[LLM] {model} failed ({last_error}), trying next model")
+                        break
+
+                    delay = backoff_delay(attempt, settings.llm_backoff_base_seconds, settings.llm_backoff_max_seconds)
+                    if last_error.retry_after is not None:
+                        delay = max(delay, last_error.retry_after)
+                    delay = min(delay, max(deadline - time.monotonic(), 0))
+                    logger.warning(f"[LLM] {model} attempt {attempt} failed ({last_error}), retrying in {delay:.1f}s")
+                    await asyncio.sleep(delay)
+
+        raise LLMError(f"all models failed, last error: {last_error}")
+
+    async def complete(self, payload: dict[str, Any]) -> dict[str, Any]:
+        """
+        Raw chat completion through the resilient execution layer.
+
+        Used by tools that need the full message (web search annotations, images).
+
+        Args:
+            payload: OpenRouter request body; "model" is ignored in favor of
+                the client's model chain.
+
+        Returns:
+            Assistant message dict.
+        """
+        payload = {k: v for k, v in payload.items() if k != "model"}
+        with span("llm.complete", model=self.model):
+            message = await self._complete(payload)
+            message.pop("_finish_reason", None)
+            return message
+
+    async def _structured(
+        self,
+        messages: list[dict[str, Any]],
+        response_format: dict[str, Any],
+        max_tokens: int,
+        reply: str | None = None
+    ) -> Any:
+        """
+        Structured completion with local repair and targeted re-asks.
+
+        Args:
+            messages: Conversation so far (not modified).
+            response_format: JSON schema for structured output.
+            max_tokens: Completion token limit.
+            reply: Reply already received (streamed); parsed before asking.
+
+        Returns:
+            Schema-valid parsed JSON.
+
+        Raises:
+            StructuredOutputError: Reply still invalid after LLM_STRUCTURED_MAX_REASKS re-asks.
+        """
+        schema = _schema_name(response_format)
+        messages = list(messages)
+
+        for reask in range(settings.llm_structured_max_reasks + 1):
+            if reask == 0 and reply is not None:
+                content = reply
+                truncated = False
+            else:
+                message = await self._complete({
+                    "messages": messages,
+                    "max_tokens": max_tokens,
+                    "response_format": response_format
+                })
+                content = message["content"] or ""
+                truncated = message.pop("_finish_reason", None) == "length"
+            logger.info(f"Structured response ({schema}): {content[:200]}...")
+
+            with span("llm.parse", schema=schema, reask=reask) as s:
+                result, errors, repairs = parse_structured(content, response_format)
+                # Brackets closed locally still leave a reply cut short at max_tokens
+                if truncated:
+                    errors = [f"reply was cut off at max_tokens ({max_tokens}); answer more briefly"] + errors
+                outcome = "invalid" if errors else "repaired" if repairs else "valid"
+                if s:
+                    s.set_attribute("outcome", outcome)
+                    if repairs:
+                        s.set_attribute("repairs", repairs[:10])
+
+            if not errors:
+                if repairs:
+                    logger.info(f"[LLM] Repaired {schema} output locally: {', '.join(repairs[:5])}")
+                return result
+
+            logger.warning(f"[LLM] Invalid {schema} output ({'; '.join(errors[:3])})")
+            messages += [
+                {"role": "assistant", "content": content},
+                {"role": "user", "content": correction_prompt(errors, response_format)}
+            ]
+
+        raise StructuredOutputError(f"{schema} output invalid after {reask} re-asks: {errors[0]}", content, errors)
+
+    async def _stream(
+        self,
+        payload: dict[str, Any],
+        on_field: Callable[[str, Any], None] | None
+    ) -> str:
+        """
+        One streamed attempt on the primary model.
+
+        Args:
+            payload: Request body without "model" and "stream".
+            on_field: Called with (name, value) for each completed top-level field.
+
+        Returns:
+            Full reply content.
+        """
+        parser = IncrementalJSONParser()
+        parts: list[str] = []
+        finish_reason = None
+        started = time.monotonic()
+
+        with span("llm.attempt", model=self.model, attempt=1, stream=True) as s:
+            try:
+                async with httpx.AsyncClient() as client:
+                    async with client.stream(
+                        "POST",
+                        OPENROUTER_URL,
+                        headers=get_openrouter_headers(),
+                        json={**payload, "model": self.model, "stream": True},
+                        timeout=settings.llm_request_timeout_seconds
+                    ) as response:
+                        if response.status_code >= 400:
+                            await response.aread()
+                            raise _AttemptError(
+                                f"HTTP {response.status_code}: {response.text[:200]}",
+                                retryable=response.status_code in RETRYABLE_STATUSES,
+                                status=response.status_code
+                            )
+
+                        async for line in response.aiter_lines():
+                            # SSE comments (": OPENROUTER PROCESSING") and blank keep-alives
+                            if not line.startswith("data:"):
+                                continue
+                            data = line[5:].strip()
+                            if data == "[DONE]":
+                                break
+                            try:
+                                chunk = json.loads(data)
+                            except ValueError:
+                                continue
+                            if "error" in chunk:
+                                raise _AttemptError(f"stream error: {chunk['error']}", retryable=True)
+
+                            usage = chunk.get("usage")
+                            if usage and s:
+                                s.set_attribute("llm.prompt_tokens", usage.get("prompt_tokens"))
+                                s.set_attribute("llm.completion_tokens", usage.get("completion_tokens"))
+
+                            choices = chunk.get("choices") or [{}]
+                            finish_reason = choices[0].get("finish_reason") or finish_reason
+                            delta = (choices[0].get("delta") or {}).get("content")
+                            if not delta:
+                                continue
+                            if not parts and s:
+                                s.set_attribute("llm.ttft_ms", round((time.monotonic() - started) * 1000, 1))
+                            parts.append(delta)
+                            for name, value in parser.feed(delta):
+                                if on_field:
+                                    on_field(name, value)
+            except httpx.TimeoutException:
+                raise _AttemptError("stream timeout", retryable=True)
+            except httpx.TransportError as e:
+                raise _AttemptError(f"transport error: {e}", retryable=True)
+
+        if not parts:
+            raise _AttemptError("empty completion", retryable=True)
+        if finish_reason == "length":
+            raise _AttemptError("reply cut off at max_tokens", retryable=True)
+        return "".join(parts)
+
+    # ==================== Public API ====================
 
     async def generate(self, system: str, user: str) -> str:
         """
@@ -45,22 +415,12 @@ class LLMClient:
             {"role": "user", "content": user}
         ]
 
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(
-                OPENROUTER_URL,
-                headers=get_openrouter_headers(),
-                json={
-                    "model": self.model,
-                    "messages": messages,
-                    "max_tokens": 500
-                }
-            )
-            response.raise_for_status()
-            data = response.json()
+        with span("llm.generate", model=self.model):
+            message = await self._complete({"messages": messages, "max_tokens": 500})
 
-            content = data["choices"][0]["message"]["content"]
-            logger.info(f"Generated response: {content[:100]}...")
-            return content
+        content = message["content"]
+        logger.info(f"Generated response: {content[:100]}...")
+        return content
 
     async def generate_structured(
         self,
@@ -84,24 +444,8 @@ class LLMClient:
             {"role": "user", "content": user}
         ]
 
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(
-                OPENROUTER_URL,
-                headers=get_openrouter_headers(),
-                json={
-                    "model": self.model,
-                    "messages": messages,
-                    "max_tokens": 500,
-                    "response_format": response_format
-                }
-            )
-            response.raise_for_status()
-            data = response.json()
-
-            content = data["choices"][0]["message"]["content"]
-            logger.info(f"Generated structured response: {content}")
-
-            return json.loads(content)
+        with span("llm.generate_structured", model=self.model, schema=_schema_name(response_format)):
+            return await self._structured(messages, response_format, max_tokens=500)
 
     async def chat(
         self,
@@ -120,27 +464,51 @@ class LLMClient:
         Returns:
             Parsed JSON response if response_format provided, else raw content dict.
         """
+        with span("llm.chat", model=self.model, schema=_schema_name(response_format), messages=len(messages)):
+            if response_format:
+                return await self._structured(messages, response_format, max_tokens=1024)
+            message = await self._complete({"messages": messages, "max_tokens": 1024})
+
+        content = message["content"]
+        logger.info(f"Chat response: {content[:200]}...")
+        return {"content": content}
+
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        response_format: dict[str, Any],
+        on_field: Callable[[str, Any], None] | None = None
+    ) -> dict[str, Any]:
+        """
+        Structured chat completion streamed over SSE.
+
+        Top-level fields are reported through on_field as soon as they are
+        complete, so callers can act before the reply ends. If streaming
+        fails the call falls back to chat() with retries and fallback models;
+        fields already reported may then differ from the returned result.
+
+        Args:
+            messages: List of message dicts with role and content.
+            response_format: JSON schema for structured output.
+            on_field: Called with (name, value) for each completed field.
+
+        Returns:
+            Parsed, schema-valid JSON response.
+        """
         payload = {
-            "model": self.model,
             "messages": messages,
-            "max_tokens": 1024
+            "max_tokens": 1024,
+            "response_format": response_format
         }
 
-        if response_format:
-            payload["response_format"] = response_format
+        with span("llm.chat_stream", model=self.model, schema=_schema_name(response_format), messages=len(messages)):
+            try:
+                content = await asyncio.wait_for(
+                    self._stream(payload, on_field),
+                    timeout=settings.llm_request_timeout_seconds
+                )
+            except (_AttemptError, asyncio.TimeoutError) as e:
+                logger.warning(f"[LLM] Streaming failed ({e or 'timeout'}), falling back to regular request")
+                return await self._structured(messages, response_format, max_tokens=1024)
 
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(
-                OPENROUTER_URL,
-                headers=get_openrouter_headers(),
-                json=payload
-            )
-            response.raise_for_status()
-            data = response.json()
-
-            content = data["choices"][0]["message"]["content"]
-            logger.info(f"Chat response: {content[:200]}...")
-
-            if response_format:
-                return json.loads(content)
-            return {"content": content}
+            return await self._structured(messages, response_format, max_tokens=1024, reply=content)
@@ -0,0 +1,172 @@
+"""
+Deterministic mention pre-filter.
+
+Runs before LLM selection so spam, bare tags and copy-pasted mentions
+don't cost tokens, and caps what the LLM sees when volume spikes. Each
+mention is:
+- rejected (blocked author or word, too short, duplicate text, bot-like
+  author) - callers save it as 'filtered' so it is never scored again
+- deferred (we replied to the author within the cooldown) - left for a
+  later batch
+- scored, with only the top mention_llm_candidates passed on
+
+Bot-likeness uses cached profile metrics only (the get_mentions user
+expansion seeds the cache), so filtering costs no Twitter reads.
+"""
+
+import hashlib
+import logging
+import math
+import re
+from datetime import timedelta
+from typing import Any
+
+from config.settings import settings
+from services.metrics import MENTIONS_PREFILTERED
+from services.storage.base import utcnow
+from services.tracing import span
+
+logger = logging.getLogger(__name__)
+
+_HANDLE_RE = re.compile(r"@\w+")
+_URL_RE = re.compile(r"https?://\S+")
+_WORD_RE = re.compile(r"\w+")
+# Handles like "name84629103" are usually auto-generated
+_DEFAULT_HANDLE_RE = re.compile(r"\d{6,}$")
+
+
+def mention_content(text: str) -> str:
+    """Mention text without @handles and links."""
+    return " ".join(_URL_RE.sub(" ", _HANDLE_RE.sub(" ", text)).split())
+
+
+def _text_hash(content: str) -> str:
+    """Hash that ignores case, punctuation and spacing."""
+    words = _WORD_RE.findall(content.lower())
+    return hashlib.sha1(" ".join(words).encode()).hexdigest()
+
+
+def bot_score(profile: dict[str, Any] | None) -> float:
+    """
+    Bot-likeness from profile metrics.
+
+    Args:
+        profile: Cached profile, or None when unknown.
+
+    Returns:
+        0 (looks human, or unknown) to 1 (looks automated).
+    """
+    if not profile:
+        return 0.0
+
+    score = 0.0
+    # Follow-spam: follows many, followed by almost nobody
+    if profile["followers"] < 10 and profile["following"] > 500:
+        score += 0.4
+    # High volume with no audience
+    if profile["tweets"] > 20_000 and profile["followers"] < 50:
+        score += 0.3
+    if _DEFAULT_HANDLE_RE.search(profile["username"]):
+        score += 0.25
+    if not profile["bio"]:
+        score += 0.15
+    return min(score, 1.0)
+
+
+def _score(content: str, profile: dict[str, Any] | None, replies_to_us: bool, bot: float) -> float:
+    """Rank mentions: substance, questions, replies to us and audience first."""
+    score = min(len(content), 140) / 140
+    if "?" in content:
+        score += 0.5
+    if replies_to_us:
+        score += 0.5
+    if profile:
+        score += min(math.log10(profile["followers"] + 1), 5) / 10
+    return score - bot
+
+
+async def prefilter_mentions(twitter, db, mentions: list[dict]) -> tuple[list[dict], list[tuple[dict, str]]]:
+    """
+    Filter and rank mentions before LLM selection.
+
+    Args:
+        twitter: TwitterClient instance (profile and tweet caches).
+        db: Database instance (per-author reply history).
+        mentions: Unprocessed mentions as returned by TwitterClient.get_mentions.
+
+    Returns:
+        (candidates best first, at most mention_llm_candidates;
+        rejected mentions with the reason, to be saved as 'filtered').
+    """
+    blocked_authors = {a.lstrip("@").lower() for a in settings.mention_blocked_authors}
+    blocked_words = [w.lower() for w in settings.mention_blocked_words]
+
+    with span("mentions.prefilter", mentions=len(mentions)) as s:
+        last_replies = {}
+        if mentions and settings.mention_author_cooldown_minutes > 0:
+            try:
+                last_replies = await db.get_last_reply_times(
+                    list({m["user"]["screen_name"] for m in mentions})
+                )
+            except Exception as e:
+                logger.warning(f"[PREFILTER] Reply history lookup failed, no cooldown this batch: {e}")
+        cooldown_start = utcnow() - timedelta(minutes=settings.mention_author_cooldown_minutes)
+
+        rejected: list[tuple[dict, str]] = []
+        deferred = 0
+        scored: list[tuple[float, dict]] = []
+        seen_hashes: set[str] = set()
+
+        # Oldest first, so the original of a copy-pasted text is the one kept
+        for mention in reversed(mentions):
+            author = mention["user"]["screen_name"].lower()
+            content = mention_content(mention["text"])
+            text_lower = mention["text"].lower()
+            text_hash = _text_hash(content)
+            _, profile = twitter.profile_cache.get(author)
+            bot = bot_score(profile)
+
+            reason = None
+            if author in blocked_authors:
+                reason = "blocked_author"
+            elif any(word in text_lower for word in blocked_words):
+                reason = "blocked_word"
+            elif len(content) < settings.mention_min_chars:
+                reason = "too_short"
+            elif text_hash in seen_hashes:
+                reason = "duplicate"
+            elif bot >= settings.mention_bot_score_threshold:
+                reason = "bot"
+
+            if reason:
+                rejected.append((mention, reason))
+                MENTIONS_PREFILTERED.inc(reason=reason)
+                continue
+            seen_hashes.add(text_hash)
+
+            last_reply = last_replies.get(author)
+            if last_reply and last_reply >= cooldown_start:
+                deferred += 1
+                MENTIONS_PREFILTERED.inc(reason="cooldown")
+                continue
+
+            parent = twitter.tweet_cache.get(mention.get("in_reply_to_tweet_id") or "")
+            replies_to_us = bool(parent and twitter.username and parent["author"].lower() == twitter.username.lower())
+            scored.append((_score(content, profile, replies_to_us, bot), mention))
+
+        scored.sort(key=lambda item: item[0], reverse=True)
+        candidates = [mention for _, mention in scored[:settings.mention_llm_candidates]]
+        over_cap = len(scored) - len(candidates)
+        if over_cap:
+            MENTIONS_PREFILTERED.inc(over_cap, reason="over_cap")
+
+        if s:
+            s.set_attribute("rejected", len(rejected))
+            s.set_attribute("deferred", deferred)
+            s.set_attribute("candidates", len(candidates))
+
+    logger.info(
+        f"[PREFILTER] {len(mentions)} mentions: {len(candidates)} candidates, "
+        f"{len(rejected)} rejected, {deferred} in cooldown, {over_cap} over cap"
+    )
+    return candidates, rejected
@@ -2,29 +2,43 @@
 Agent-based mention handler service.
 
 Processes Twitter mentions using autonomous agent architecture:
-1. Select mentions worth replying to
-2. For each selected mention:
-   - Create a plan (tools to use)
+1. Pre-filter and rank mentions without the LLM (spam, duplicates, cooldown)
+2. Assemble the reply thread of every candidate (one pass per batch)
+3. Select mentions worth replying to (large lists: per chunk concurrently,
+   then one ranking pass over the merged shortlists)
+4. Reply to the simple ones (no tools needed) in one batched LLM call
+5. For each remaining selected mention:
+   - Create a plan (tools to use), with the reply written in the same call
+     when no tools are needed
    - Execute tools
-   - Generate reply
+   - Generate reply (only when tools ran)
    - Post reply
 """
 
+import asyncio
 import json
 import logging
 import time
 from typing import Any
 
 from services.database import Database
-from services.llm import LLMClient
+from config.settings import settings
+from services.llm import LLMClient, estimate_tokens
+from services.mention_filter import prefilter_mentions
+from services.metrics import MENTION_QUEUE_DEPTH
+from services.thread_context import build_thread_contexts, format_thread_line, record_reply
+from services.tracing import current_span, span, traced
 from services.twitter import TwitterClient
 from tools.registry import TOOLS, get_tools_description
 from config.personality import SYSTEM_PROMPT
-from config.prompts.mention_selector_agent import MENTION_SELECTOR_AGENT_PROMPT
+from config.prompts.mention_selector_agent import MENTION_RANKING_PROMPT, MENTION_SELECTOR_AGENT_PROMPT
+from config.prompts.mention_batch_reply import MENTION_BATCH_REPLY_PROMPT
 from config.prompts.mention_reply_agent import MENTION_REPLY_AGENT_PROMPT
 from config.schemas import (
+    BATCH_REPLY_SCHEMA,
     MENTION_SELECTION_SCHEMA,
     MENTION_PLAN_SCHEMA,
+    MENTION_PLAN_OR_REPLY_SCHEMA,
     REPLY_TEXT_SCHEMA,
     TOOL_REACTION_SCHEMA
 )
@@ -39,11 +53,11 @@ MENTIONS_WHITELIST = []
 class MentionAgentHandler:
     """Agent-based handler for processing Twitter mentions."""
 
-    def __init__(self, db: Database, tier_manager=None):
+    def __init__(self, db: Database, tier_manager=None, twitter: TwitterClient | None = None):
         """Initialize mention agent handler."""
         self.db = db
         self.llm = LLMClient()
-        self.twitter = TwitterClient()
+        self.twitter = twitter or TwitterClient()
         self.tier_manager = tier_manager
 
     def _validate_plan(self, plan: list[dict]) -> None:
@@ -74,6 +88,7 @@ class MentionAgentHandler:
 
         logger.info(f"[MENTIONS] Plan validated: {len(plan)} steps")
 
+    @traced("mentions.batch", cycle=True)
     async def process_mentions_batch(self) -> dict:
         """
         Process mentions using agent architecture.
@@ -81,14 +96,16 @@ class MentionAgentHandler:
         Flow:
         1. Tier check (Free=blocked)
         2. Fetch unprocessed mentions
-        3. LLM #1: Select mentions worth replying to (array)
-        4. For EACH selected mention:
-           a. LLM #2: Create plan (tools to use)
+        3. Pre-filter and rank candidates (no LLM), build reply threads
+        4. LLM #1: Select mentions worth replying to (array)
+        5. LLM #2: Batch replies for mentions that need no tools
+        6. For EACH remaining selected mention:
+           a. LLM #2: Create plan (tools to use), or the reply if none needed
            b. Execute tools
-           c. LLM #3: Generate reply text
+           c. LLM #3: Generate reply text (skipped when written in a.)
            d. Post reply
            e. Save to database
-        5. Return batch summary
+        7. Return batch summary
 
         Returns:
             Summary of what happened.
@@ -129,10 +146,12 @@ class MentionAgentHandler:
                 unprocessed.append(mention)
 
         if not unprocessed:
+            MENTION_QUEUE_DEPTH.set(0)
             logger.info("[MENTIONS] [1/4] All mentions already processed")
             return {"success": True, "found": len(mentions), "processed": 0}
 
         logger.info(f"[MENTIONS] [1/4] Unprocessed: {len(unprocessed)}")
+        MENTION_QUEUE_DEPTH.set(len(unprocessed))
 
         # Filter by whitelist (for testing on main account)
         if MENTIONS_WHITELIST:
@@ -152,9 +171,37 @@ class MentionAgentHandler:
                     "processed": 0
                 }
 
+        # Deterministic pre-filter, so the LLM only sees the top candidates
+        candidates, rejected = await prefilter_mentions(self.twitter, self.db, unprocessed)
+        for mention, reason in rejected:
+            logger.info(f"[MENTIONS] [1/4] Filtered {mention['id_str']} from @{mention['user']['screen_name']}: {reason}")
+            await self.db.save_mention(
+                tweet_id=mention["id_str"],
+                author_handle=mention["user"]["screen_name"],
+                author_text=mention["text"],
+                our_reply=None,
+                action="filtered"
+            )
+
+        if not candidates:
+            logger.info("[MENTIONS] [1/4] No candidates left after pre-filter")
+            return {
+                "success": True,
+                "found": len(mentions),
+                "unprocessed": len(unprocessed),
+                "filtered": len(rejected),
+                "selected": 0,
+                "processed": 0
+            }
+
+        # Reply threads for the whole batch, before selection so it can use them
+        threads = await build_thread_contexts(self.twitter, self.db, candidates)
+        for mention in candidates:
+            mention["thread"] = threads.get(mention["id_str"], "")
+
         # Step 3: LLM #1 - Select mentions worth replying to
-        logger.info("[MENTIONS] [2/4] Selecting mentions - calling LLM...")
-        selected = await self._select_mentions(unprocessed)
+        logger.info(f"[MENTIONS] [2/4] Selecting from {len(candidates)} candidates - calling LLM...")
+        selected = await self._select_mentions(candidates)
 
         if not selected:
             logger.info("[MENTIONS] [2/4] No mentions selected for reply")
@@ -162,6 +209,7 @@ class MentionAgentHandler:
                 "success": True,
                 "found": len(mentions),
                 "unprocessed": len(unprocessed),
+                "filtered": len(rejected),
                 "selected": 0,
                 "processed": 0
             }
@@ -170,25 +218,30 @@ class MentionAgentHandler:
 
         # Step 4: Process each selected mention
         logger.info("[MENTIONS] [3/4] Processing selected mentions...")
-        results = []
-        for i, selection in enumerate(selected):
-            tweet_id = selection["tweet_id"]
-            mention = self._find_mention_by_id(unprocessed, tweet_id)
-
+        pending = []
+        for selection in selected:
+            mention = self._find_mention_by_id(candidates, selection["tweet_id"])
             if not mention:
-                logger.warning(f"[MENTIONS] Could not find mention {tweet_id}")
+                logger.warning(f"[MENTIONS] Could not find mention {selection['tweet_id']}")
                 continue
+            pending.append((mention, selection))
 
+        results = []
+        if settings.mention_batch_replies and len(pending) > 1:
+            batch_results, pending = await self._process_batch_replies(pending)
+            results.extend(batch_results)
+
+        for i, (mention, selection) in enumerate(pending):
             author = mention["user"]["screen_name"]
-            logger.info(f"[MENTIONS] [3/4] [{i+1}/{len(selected)}] Processing @{author}...")
+            logger.info(f"[MENTIONS] [3/4] [{i+1}/{len(pending)}] Processing @{author}...")
 
             result = await self._process_single_mention(mention, selection)
             results.append(result)
 
             if result.get("success"):
-                logger.info(f"[MENTIONS] [3/4] [{i+1}/{len(selected)}] @{author}: OK")
+                logger.info(f"[MENTIONS] [3/4] [{i+1}/{len(pending)}] @{author}: OK")
             else:
-                logger.warning(f"[MENTIONS] [3/4] [{i+1}/{len(selected)}] @{author}: FAILED - {result.get('error')}")
+                logger.warning(f"[MENTIONS] [3/4] [{i+1}/{len(pending)}] @{author}: FAILED - {result.get('error')}")
 
         successful = sum(1 for r in results if r.get("success"))
 
@@ -197,10 +250,17 @@ class MentionAgentHandler:
         logger.info(f"[MENTIONS] === Completed in {duration}s ===")
         logger.info(f"[MENTIONS] Summary: found={len(mentions)} | selected={len(selected)} | replied={successful}")
 
+        cycle = current_span()
+        if cycle:
+            cycle.attributes.update(
+                found=len(mentions), filtered=len(rejected), selected=len(selected), replied=successful
+            )
+
         return {
             "success": True,
             "found": len(mentions),
             "unprocessed": len(unprocessed),
+            "filtered": len(rejected),
             "selected": len(selected),
             "processed": successful,
             "results": results,
@@ -211,6 +271,10 @@ class MentionAgentHandler:
         """
         LLM #1: Select mentions worth replying to.
 
+        Lists over settings.mention_selection_chunk_tokens are split into
+        chunks selected concurrently, and the merged shortlists get one
+        ranking pass, so selection time stays flat as the backlog grows.
+
         Args:
             mentions: List of unprocessed mentions.
 
@@ -219,9 +283,46 @@ class MentionAgentHandler:
         """
         logger.info("[MENTIONS] Step 1: Selecting mentions worth replying to")
 
-        # Format mentions for LLM
-        mentions_text = self._format_mentions_for_llm(mentions)
         recent_replies = await self.db.get_recent_mentions_formatted(limit=10)
+        chunks = self._chunk_mentions(mentions, settings.mention_selection_chunk_tokens)
+
+        if len(chunks) == 1:
+            selected = await self._select_chunk(mentions, recent_replies)
+        else:
+            logger.info(f"[MENTIONS] {len(mentions)} mentions in {len(chunks)} chunks")
+            with span("mentions.select_chunked", chunks=len(chunks), mentions=len(mentions)) as s:
+                semaphore = asyncio.Semaphore(settings.mention_selection_concurrency)
+
+                async def select(chunk: list[dict]) -> list[dict]:
+                    async with semaphore:
+                        return await self._select_chunk(chunk, recent_replies)
+
+                results = await asyncio.gather(*(select(c) for c in chunks), return_exceptions=True)
+
+                shortlist = []
+                for i, result in enumerate(results):
+                    if isinstance(result, BaseException):
+                        logger.warning(f"[MENTIONS] Chunk {i+1}/{len(chunks)} selection failed: {result}")
+                        continue
+                    shortlist.extend(result)
+
+                selected = await self._rank_shortlist(shortlist, mentions, recent_replies)
+                if s:
+                    s.set_attribute("shortlisted", len(shortlist))
+                    s.set_attribute("selected", len(selected))
+
+        # Sort by priority
+        selected.sort(key=lambda x: x.get("priority", 999))
+
+        for s in selected:
+            logger.info(f"[MENTIONS]   Selected: {s['tweet_id']} (priority {s['priority']})")
+            logger.info(f"[MENTIONS]     Reason: {s['reasoning']}")
+
+        return selected
+
+    async def _select_chunk(self, mentions: list[dict], recent_replies: str) -> list[dict]:
+        """One selection call over a list of mentions; drops ids not in the list."""
+        mentions_text = self._format_mentions_for_llm(mentions)
 
         system_prompt = SYSTEM_PROMPT + MENTION_SELECTOR_AGENT_PROMPT
 
@@ -232,7 +333,8 @@ class MentionAgentHandler:
 ## Your recent replies (don't repeat yourself):
 {recent_replies}
 
-Select which mentions to reply to. You can select multiple, one, or none."""
+Select which mentions to reply to. You can select multiple, one, or none.
+Select at most {settings.mention_selection_max}."""
 
         result = await self.llm.generate_structured(
             system_prompt,
@@ -240,17 +342,69 @@ Select which mentions to reply to. You can select multiple, one, or none."""
             MENTION_SELECTION_SCHEMA
         )
 
-        selected = result.get("selected_mentions", [])
+        return self._known_selections(result.get("selected_mentions", []), {m["id_str"] for m in mentions})
 
-        # Sort by priority
-        selected.sort(key=lambda x: x.get("priority", 999))
+    def _known_selections(self, selections: list[dict], ids: set[str]) -> list[dict]:
+        """Selections for ids in the prompt, deduplicated, best mention_selection_max by priority."""
+        selected = {}
+        for s in sorted(selections, key=lambda x: x.get("priority", 999)):
+            if s["tweet_id"] in ids:
+                selected.setdefault(s["tweet_id"], s)
+        return list(selected.values())[:settings.mention_selection_max]
 
-        for s in selected:
-            logger.info(f"[MENTIONS]   Selected: {s['tweet_id']} (priority {s['priority']})")
-            logger.info(f"[MENTIONS]     Reason: {s['reasoning']}")
+    async def _rank_shortlist(
+        self,
+        shortlist: list[dict],
+        mentions: list[dict],
+        recent_replies: str
+    ) -> list[dict]:
+        """
+        Ranking pass over per-chunk shortlists (chunk priorities aren't comparable).
 
-        return selected
+        Args:
+            shortlist: Selections from all chunks.
+            mentions: All mentions, to show the shortlisted ones in full.
+            recent_replies: Formatted recent replies.
+
+        Returns:
+            Final selections; the shortlist by chunk priority if the pass fails.
+        """
+        if len(shortlist) <= 1:
+            return shortlist
+
+        by_id = {m["id_str"]: m for m in mentions}
+        shortlist_text = "\n\n".join(
+            f"{self._format_mention_for_llm(by_id[s['tweet_id']])}\n  why shortlisted: {s['reasoning']}"
+            for s in shortlist
+        )
 
+        system_prompt = SYSTEM_PROMPT + MENTION_RANKING_PROMPT
+
+        user_prompt = f"""Shortlisted from {len(mentions)} mentions:
+
+{shortlist_text}
+
+## Your recent replies (don't repeat yourself):
+{recent_replies}
+
+Rank the shortlist and keep only the mentions worth replying to.
+Select at most {settings.mention_selection_max}."""
+
+        try:
+            result = await self.llm.generate_structured(
+                system_prompt,
+                user_prompt,
+                MENTION_SELECTION_SCHEMA
+            )
+        except Exception as e:
+            logger.warning(f"[MENTIONS] Ranking pass failed, using chunk shortlists: {e}")
+            return self._known_selections(shortlist, {s["tweet_id"] for s in shortlist})
+
+        ranked = self._known_selections(result.get("selected_mentions", []), {s["tweet_id"] for s in shortlist})
+        logger.info(f"[MENTIONS] Ranking pass kept {len(ranked)}/{len(shortlist)} shortlisted mentions")
+        return ranked
+
+    @traced("mentions.process")
     async def _process_single_mention(
         self,
         mention: dict,
@@ -268,7 +422,6 @@ Select which mentions to reply to. You can select multiple, one, or none."""
         """
         tweet_id = mention["id_str"]
         author_handle = mention["user"]["screen_name"]
-        author_text = mention["text"]
 
         try:
             # Get conversation history with this user
@@ -311,7 +464,8 @@ Select which mentions to reply to. You can select multiple, one, or none."""
                     query = params.get("query", "")
                     logger.info(f"[MENTIONS] @{author_handle}: [{i+1}/{len(plan)}] web_search - query: {query[:40]}...")
 
-                    result = await TOOLS[tool_name](query)
+                    with span(f"tool.{tool_name}"):
+                        result = await TOOLS[tool_name](query)
 
                     if result.get("error"):
                         logger.warning(f"[MENTIONS] @{author_handle}: web_search: FAILED")
@@ -324,7 +478,8 @@ Select which mentions to reply to. You can select multiple, one, or none."""
                     prompt = params.get("prompt", "")
                     logger.info(f"[MENTIONS] @{author_handle}: [{i+1}/{len(plan)}] generate_image - prompt: {prompt[:40]}...")
 
-                    image_bytes = await TOOLS[tool_name](prompt)
+                    with span(f"tool.{tool_name}"):
+                        image_bytes = await TOOLS[tool_name](prompt)
 
                     if image_bytes:
                         logger.info(f"[MENTIONS] @{author_handle}: generate_image: OK ({len(image_bytes)} bytes)")
@@ -334,21 +489,27 @@ Select which mentions to reply to. You can select multiple, one, or none."""
                         messages.append({"role": "user", "content": "Tool result (generate_image): Failed. Continue without image."})
 
                 # Step-by-step: LLM reacts to tool result
-                logger.info(f"[MENTIONS] @{author_handle}: [{i+1}/{len(plan)}] Getting LLM reaction...")
-                reaction = await self.llm.chat(messages, TOOL_REACTION_SCHEMA)
-                thinking = reaction.get("thinking", "")
-                logger.info(f"[MENTIONS] @{author_handle}: [{i+1}/{len(plan)}] Thinking: {thinking[:80]}...")
-                messages.append({"role": "assistant", "content": thinking})
-
-            # LLM #3: Generate reply
-            logger.info(f"[MENTIONS] @{author_handle}: Generating reply...")
-            messages.append({
-                "role": "user",
-                "content": "Now write your final reply (max 280 characters)."
-            })
+                if settings.llm_tool_reactions:
+                    logger.info(f"[MENTIONS] @{author_handle}: [{i+1}/{len(plan)}] Getting LLM reaction...")
+                    reaction = await self.llm.chat(messages, TOOL_REACTION_SCHEMA)
+                    thinking = reaction.get("thinking", "")
+                    logger.info(f"[MENTIONS] @{author_handle}: [{i+1}/{len(plan)}] Thinking: {thinking[:80]}...")
+                    messages.append({"role": "assistant", "content": thinking})
+
+            # Fast path: no tools, reply already written with the plan
+            reply_text = "" if plan else plan_result.get("reply_text", "").strip()
+            if reply_text:
+                logger.info(f"[MENTIONS] @{author_handle}: Reply written with the plan")
+            else:
+                # LLM #3: Generate reply
+                logger.info(f"[MENTIONS] @{author_handle}: Generating reply...")
+                messages.append({
+                    "role": "user",
+                    "content": "Now write your final reply (max 280 characters)."
+                })
 
-            reply_result = await self.llm.chat(messages, REPLY_TEXT_SCHEMA)
-            reply_text = reply_result.get("reply_text", "").strip()
+                reply_result = await self.llm.chat(messages, REPLY_TEXT_SCHEMA)
+                reply_text = reply_result.get("reply_text", "").strip()
 
             if not reply_text:
                 logger.warning(f"[MENTIONS] @{author_handle}: Empty reply generated")
@@ -371,20 +532,9 @@ Select which mentions to reply to. You can select multiple, one, or none."""
                     logger.error(f"[MENTIONS] @{author_handle}: Image upload FAILED: {e}")
                     image_bytes = None
 
-            # Post reply
-            await self.twitter.reply(reply_text, tweet_id, media_ids=media_ids)
-            logger.info(f"[MENTIONS] @{author_handle}: Reply posted!")
-
-            # Save to database
+            # Post reply and save to database
             tools_used_str = ",".join(tools_used) if tools_used else None
-            await self.db.save_mention(
-                tweet_id=tweet_id,
-                author_handle=author_handle,
-                author_text=author_text,
-                our_reply=reply_text,
-                action="agent_replied",
-                tools_used=tools_used_str
-            )
+            await self._post_reply(mention, reply_text, media_ids=media_ids, tools_used=tools_used_str)
 
             return {
                 "success": True,
@@ -400,6 +550,161 @@ Select which mentions to reply to. You can select multiple, one, or none."""
             logger.exception(e)
             return {"success": False, "error": str(e), "tweet_id": tweet_id}
 
+    async def _post_reply(
+        self,
+        mention: dict,
+        reply_text: str,
+        media_ids: list[str] | None = None,
+        tools_used: str | None = None
+    ) -> None:
+        """Post a reply, add it to the conversation tree and save the mention as replied."""
+        author_handle = mention["user"]["screen_name"]
+
+        reply = await self.twitter.reply(reply_text, mention["id_str"], media_ids=media_ids)
+        logger.info(f"[MENTIONS] @{author_handle}: Reply posted!")
+        await record_reply(self.twitter, self.db, reply)
+
+        saved = await self.db.save_mention(
+            tweet_id=mention["id_str"],
+            author_handle=author_handle,
+            author_text=mention["text"],
+            our_reply=reply_text,
+            action="agent_replied",
+            tools_used=tools_used
+        )
+        if saved is None:
+            await self.db.update_mention(
+                tweet_id=mention["id_str"],
+                our_reply=reply_text,
+                action="agent_replied",
+                tools_used=tools_used
+            )
+
+    @traced("mentions.batch_reply")
+    async def _process_batch_replies(
+        self,
+        pending: list[tuple[dict, dict]]
+    ) -> tuple[list[dict], list[tuple[dict, dict]]]:
+        """
+        Reply to simple mentions with one LLM call per settings.mention_batch_size.
+
+        The shared system prompt is sent once per call instead of once per
+        mention. Mentions the model flags as needing tools, and items that
+        fail validation, fall back to the single-mention flow.
+
+        Args:
+            pending: (mention, selection) pairs in priority order.
+
+        Returns:
+            (results for mentions replied to here, pairs left for _process_single_mention).
+        """
+        results = []
+        fallback = []
+
+        for i in range(0, len(pending), settings.mention_batch_size):
+            chunk = pending[i:i + settings.mention_batch_size]
+            try:
+                replies = await self._generate_batch_replies(chunk)
+            except Exception as e:
+                logger.warning(f"[MENTIONS] Batch reply failed for {len(chunk)} mentions, replying one by one: {e}")
+                fallback.extend(chunk)
+                continue
+
+            for mention, selection in chunk:
+                tweet_id = mention["id_str"]
+                author_handle = mention["user"]["screen_name"]
+                reply_text = replies.get(tweet_id)
+                if not reply_text:
+                    fallback.append((mention, selection))
+                    continue
+
+                logger.info(f"[MENTIONS] @{author_handle}: Batch reply: {reply_text[:50]}... ({len(reply_text)} chars)")
+                try:
+                    await self._post_reply(mention, reply_text)
+                except Exception as e:
+                    logger.error(f"[MENTIONS] @{author_handle}: Error: {e}")
+                    results.append({"success": False, "error": str(e), "tweet_id": tweet_id})
+                    continue
+
+                results.append({
+                    "success": True,
+                    "tweet_id": tweet_id,
+                    "author": author_handle,
+                    "reply": reply_text,
+                    "tools_used": None,
+                    "has_image": False,
+                    "batched": True
+                })
+
+        logger.info(f"[MENTIONS] Batch replies: {len(results)} written together, {len(fallback)} need the full flow")
+        cycle = current_span()
+        if cycle:
+            cycle.attributes.update(batched=len(results), fallback=len(fallback))
+
+        return results, fallback
+
+    async def _generate_batch_replies(self, chunk: list[tuple[dict, dict]]) -> dict[str, str]:
+        """
+        LLM call writing replies for several mentions, validated per item.
+
+        Args:
+            chunk: (mention, selection) pairs.
+
+        Returns:
+            Dict of tweet_id -> reply text for valid items (needs_tools,
+            empty, unknown, repeated ids and duplicate texts are left out).
+        """
+        histories = await asyncio.gather(*(
+            self.db.get_user_mention_history(mention["user"]["screen_name"], limit=5)
+            for mention, _ in chunk
+        ))
+        recent_replies = await self.db.get_recent_mentions_formatted(limit=10)
+
+        entries = []
+        for (mention, selection), history in zip(chunk, histories):
+            author_handle = mention["user"]["screen_name"]
+            entries.append(
+                f"""{self._format_mention_for_llm(mention)}
+  why selected: {selection.get('reasoning', 'Interesting mention')}
+  suggested approach: {selection.get('suggested_approach', 'Reply authentically')}
+  your history with @{author_handle}:
+    {history.replace(chr(10), chr(10) + '    ')}"""
+            )
+
+        system_prompt = SYSTEM_PROMPT + MENTION_BATCH_REPLY_PROMPT
+        mentions_text = "\n\n".join(entries)
+
+        user_prompt = f"""Reply to each of these {len(chunk)} mentions:
+
+{mentions_text}
+
+## Your recent replies (don't repeat yourself):
+{recent_replies}
+
+Return one entry per tweet_id."""
+
+        result = await self.llm.generate_structured(
+            system_prompt,
+            user_prompt,
+            BATCH_REPLY_SCHEMA
+        )
+
+        ids = {mention["id_str"] for mention, _ in chunk}
+        replies: dict[str, str] = {}
+        for item in result.get("replies", []):
+            tweet_id = item["tweet_id"]
+            reply_text = item["reply_text"].strip()
+            if tweet_id not in ids or tweet_id in replies:
+                logger.warning(f"[MENTIONS] Batch reply: ignoring unexpected tweet_id {tweet_id}")
+                continue
+            if item["needs_tools"] or not reply_text or reply_text in replies.values():
+                continue
+            if len(reply_text) > 280:
+                reply_text = reply_text[:277] + "..."
+            replies[tweet_id] = reply_text
+
+        return replies
+
     async def _create_plan(
         self,
         mention: dict,
@@ -409,6 +714,9 @@ Select which mentions to reply to. You can select multiple, one, or none."""
         """
         LLM #2: Create plan for replying to mention.
 
+        With settings.llm_fast_path the same call also writes the reply
+        (reply_text) when the plan is empty.
+
         Args:
             mention: The mention data.
             selection: Selection info with suggested_approach.
@@ -423,7 +731,7 @@ Select which mentions to reply to. You can select multiple, one, or none."""
         tools_desc = get_tools_description()
         system_prompt = SYSTEM_PROMPT + MENTION_REPLY_AGENT_PROMPT + f"\n\n{tools_desc}"
 
-        user_prompt = f"""@{author_handle} mentioned you: {author_text}
+        user_prompt = f"""{self._thread_section(mention)}@{author_handle} mentioned you: {author_text}
 
 ## Why this mention was selected:
 {selection.get('reasoning', 'Interesting mention')}
@@ -436,10 +744,17 @@ Select which mentions to reply to. You can select multiple, one, or none."""
 
 Create your plan. What tools do you need (if any)?"""
 
+        schema = MENTION_PLAN_SCHEMA
+        if settings.llm_fast_path:
+            schema = MENTION_PLAN_OR_REPLY_SCHEMA
+            user_prompt += """
+If you need no tools, leave plan empty and write your final reply (max 280 characters) in reply_text.
+Otherwise leave reply_text empty - you'll write the reply after seeing the tool results."""
+
         result = await self.llm.generate_structured(
             system_prompt,
             user_prompt,
-            MENTION_PLAN_SCHEMA
+            schema
         )
 
         logger.info(f"[MENTIONS]   Plan reasoning: {result.get('reasoning', 'N/A')}")
@@ -463,7 +778,7 @@ Create your plan. What tools do you need (if any)?"""
             {"role": "system", "content": system_prompt},
             {
                 "role": "user",
-                "content": f"""@{author_handle} mentioned you: {author_text}
+                "content": f"""{self._thread_section(mention)}@{author_handle} mentioned you: {author_text}
 
 ## Why this mention was selected:
 {selection.get('reasoning', 'Interesting mention')}
@@ -475,15 +790,37 @@ Create your plan."""
             }
         ]
 
+    def _thread_section(self, mention: dict) -> str:
+        """Conversation above the mention as a prompt section, or ""."""
+        thread = mention.get("thread")
+        if not thread:
+            return ""
+        return f"## Thread this mention replies to (oldest first):\n{thread}\n\n"
+
+    def _format_mention_for_llm(self, mention: dict) -> str:
+        """Format one mention as a list entry for LLM prompts."""
+        tweet_id = mention["id_str"]
+        author = mention["user"]["screen_name"]
+        text = mention["text"]
+        thread = format_thread_line(mention.get("thread", ""))
+        return f"- tweet_id: {tweet_id}\n  from: @{author}{thread}\n  text: {text}"
+
     def _format_mentions_for_llm(self, mentions: list[dict]) -> str:
         """Format mentions list for LLM prompt."""
-        lines = []
-        for m in mentions:
-            tweet_id = m["id_str"]
-            author = m["user"]["screen_name"]
-            text = m["text"]
-            lines.append(f"- tweet_id: {tweet_id}\n  from: @{author}\n  text: {text}")
-        return "\n\n".join(lines)
+        return "\n\n".join(self._format_mention_for_llm(m) for m in mentions)
+
+    def _chunk_mentions(self, mentions: list[dict], max_tokens: int) -> list[list[dict]]:
+        """Split mentions into consecutive chunks whose entries fit max_tokens (at least one each)."""
+        chunks: list[list[dict]] = [[]]
+        used = 0
+        for mention in mentions:
+            tokens = estimate_tokens(self._format_mention_for_llm(mention))
+            if chunks[-1] and used + tokens > max_tokens:
+                chunks.append([])
+                used = 0
+            chunks[-1].append(mention)
+            used += tokens
+        return chunks
 
     def _find_mention_by_id(
         self,
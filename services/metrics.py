@@ -0,0 +1,299 @@
+"""
+In-memory metrics with Prometheus text exposition.
+
+Counters, gauges and histograms are fed from finished tracing spans
+(LLM, tool, Twitter, DB and cycle spans), so call sites stay free of
+metrics code and a scrape never touches the database. Business counts
+(posts, mentions, actions) come from a MetricsSnapshot owned by the
+Database facade.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from datetime import date
+from typing import Any, Awaitable, Callable
+
+from services import tracing
+from services.storage.base import utcnow
+
+logger = logging.getLogger(__name__)
+
+PREFIX = "purrple_"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+CYCLE_BUCKETS = (1, 5, 10, 30, 60, 120, 240, 480, 900)
+ITERATION_BUCKETS = (1, 2, 3, 5, 8, 13, 21, 30)
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values)) + "}"
+
+
+def _fmt(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...] = ()):
+        self.name = PREFIX + name
+        self.help = help_text
+        self.label_names = labels
+        self.values: dict[tuple[str, ...], Any] = {}
+
+    def _key(self, labels: dict[str, Any]) -> tuple[str, ...]:
+        return tuple(str(labels.get(n, "")) for n in self.label_names)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for key, value in sorted(self.values.items()):
+            lines.append(f"{self.name}{_labels(self.label_names, key)} {_fmt(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    """Monotonic counter."""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        key = self._key(labels)
+        self.values[key] = self.values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    """Value that can go up and down."""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels: Any) -> None:
+        self.values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    """Cumulative histogram with fixed buckets."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...] = (), buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(buckets) + (math.inf,)
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        series = self.values.get(key)
+        if series is None:
+            series = self.values[key] = {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series["counts"][i] += 1
+                break
+        series["sum"] += value
+        series["count"] += 1
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        names = self.label_names + ("le",)
+        for key, series in sorted(self.values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, series["counts"]):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_labels(names, key + (_fmt(bound),))} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.label_names, key)} {_fmt(series['sum'])}")
+            lines.append(f"{self.name}_count{_labels(self.label_names, key)} {series['count']}")
+        return lines
+
+
+class Registry:
+    """Collection of metrics rendered together."""
+
+    def __init__(self):
+        self.metrics: list[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+LLM_LATENCY = registry.register(Histogram(
+    "llm_request_duration_seconds", "OpenRouter request latency", ("caller", "schema", "status")
+))
+LLM_ATTEMPTS = registry.register(Counter(
+    "llm_attempts_total", "OpenRouter HTTP attempts (retries, hedges and fallbacks included)", ("model", "status")
+))
+LLM_TTFT = registry.register(Histogram(
+    "llm_time_to_first_token_seconds", "Time to first streamed token", ("model",)
+))
+LLM_PARSE = registry.register(Counter(
+    "llm_structured_outputs_total", "Structured replies by parse outcome (valid, repaired, invalid)", ("schema", "outcome")
+))
+TOOL_LATENCY = registry.register(Histogram(
+    "tool_duration_seconds", "Tool execution latency", ("tool", "status")
+))
+TWITTER_LATENCY = registry.register(Histogram(
+    "twitter_request_duration_seconds", "Twitter API call latency", ("endpoint", "status")
+))
+DB_LATENCY = registry.register(Histogram(
+    "db_query_duration_seconds", "Database query latency", ("query", "status")
+))
+CYCLE_DURATION = registry.register(Histogram(
+    "cycle_duration_seconds", "Agent cycle / mention batch / autopost duration", ("cycle", "status"), CYCLE_BUCKETS
+))
+CYCLE_ITERATIONS = registry.register(Histogram(
+    "agent_iterations_per_cycle", "LLM tool-loop iterations per agent cycle", (), ITERATION_BUCKETS
+))
+CYCLES_TOTAL = registry.register(Counter(
+    "cycles_total", "Finished cycles", ("cycle", "status")
+))
+MENTION_QUEUE_DEPTH = registry.register(Gauge(
+    "mention_queue_depth", "Unprocessed mentions seen by the last fetch"
+))
+MENTIONS_PREFILTERED = registry.register(Counter(
+    "mentions_prefiltered_total", "Mentions dropped before LLM selection", ("reason",)
+))
+AGENT_CHECKPOINTS = registry.register(Counter(
+    "agent_checkpoints_total", "Agent cycle checkpoints by event (saved, resumed, abandoned)", ("event",)
+))
+ACTION_INTENTS = registry.register(Counter(
+    "action_intents_total", "Post/reply intents by outcome (claimed, duplicate, failed, reconciled_*)", ("action", "outcome")
+))
+MENTION_ARRIVAL_RATE = registry.register(Gauge(
+    "mention_arrival_rate_per_minute", "EWMA of new mentions per minute, from ingestion"
+))
+AGENT_NEXT_INTERVAL = registry.register(Gauge(
+    "agent_next_interval_minutes", "Delay chosen by the adaptive schedule before the next agent cycle"
+))
+BUSINESS = registry.register(Gauge(
+    "business_total", "Stored posts/mentions/actions (cached snapshot)", ("kind",)
+))
+
+_SPAN_HISTOGRAMS = {
+    "tool": (TOOL_LATENCY, "tool"),
+    "twitter": (TWITTER_LATENCY, "endpoint"),
+    "db": (DB_LATENCY, "query")
+}
+
+
+def record_span(span: tracing.Span) -> None:
+    """Span listener turning finished spans into metric observations."""
+    seconds = span.duration_ms / 1000
+    status = span.status.lower()
+
+    if span.parent_span_id is None:
+        CYCLE_DURATION.observe(seconds, cycle=span.name, status=status)
+        CYCLES_TOTAL.inc(cycle=span.name, status=status)
+        if "iterations" in span.attributes:
+            CYCLE_ITERATIONS.observe(span.attributes["iterations"])
+        return
+
+    kind, _, name = span.name.partition(".")
+    if span.name == "llm.attempt":
+        LLM_ATTEMPTS.inc(model=span.attributes.get("model"), status=status)
+        if "llm.ttft_ms" in span.attributes:
+            LLM_TTFT.observe(span.attributes["llm.ttft_ms"] / 1000, model=span.attributes.get("model"))
+    elif span.name == "llm.parse":
+        LLM_PARSE.inc(schema=span.attributes.get("schema") or "none", outcome=span.attributes.get("outcome", "error"))
+    elif span.name == "llm.hedge":
+        return
+    elif kind == "llm":
+        caller = span._trace.name
+        LLM_LATENCY.observe(seconds, caller=caller, schema=span.attributes.get("schema") or "none", status=status)
+    elif kind in _SPAN_HISTOGRAMS:
+        histogram, label = _SPAN_HISTOGRAMS[kind]
+        histogram.observe(seconds, **{label: name, "status": status})
+
+
+tracing.add_span_listener(record_span)
+
+
+# ==================== Business snapshot ====================
+
+class MetricsSnapshot:
+    """
+    Business counts for /metrics, kept in memory so scrapes don't hit the DB.
+
+    Refreshed in the background with one backend query, patched
+    incrementally by the Database facade on every save, and re-read inline
+    only when older than the staleness window or when the UTC day rolled over.
+    """
+
+    def __init__(self, max_staleness_seconds: float):
+        self.max_staleness_seconds = max_staleness_seconds
+        self.data: dict[str, Any] | None = None
+        self.refreshed_at = 0.0
+        self.day: date | None = None
+        self._lock = asyncio.Lock()
+
+    def is_stale(self) -> bool:
+        return (
+            self.data is None
+            or self.day != utcnow().date()
+            or time.monotonic() - self.refreshed_at > self.max_staleness_seconds
+        )
+
+    async def _load(self, load: Callable[[], Awaitable[dict[str, Any]]]) -> None:
+        self.data = await load()
+        self.refreshed_at = time.monotonic()
+        self.day = utcnow().date()
+
+    async def refresh(self, load: Callable[[], Awaitable[dict[str, Any]]]) -> None:
+        """
+        Reload all counts (background job).
+
+        Args:
+            load: Coroutine function returning the backend's metrics snapshot.
+        """
+        async with self._lock:
+            await self._load(load)
+
+    async def get(self, load: Callable[[], Awaitable[dict[str, Any]]]) -> dict[str, Any]:
+        """Cached counts, reloaded inline only when stale."""
+        if self.is_stale():
+            async with self._lock:
+                # Concurrent scrapes wait for one reload instead of each querying
+                if self.is_stale():
+                    await self._load(load)
+        return {**self.data, "snapshot_age_seconds": round(time.monotonic() - self.refreshed_at, 1)}
+
+    def record(self, kind: str) -> None:
+        """
+        Count a row just written ("post", "mention" or "action").
+
+        Args:
+            kind: Table the row went to.
+        """
+        if self.data is None or self.day != utcnow().date():
+            return  # next read refreshes anyway
+
+        self.data[f"{kind}s_today"] = self.data.get(f"{kind}s_today", 0) + 1
+        if kind in ("post", "mention"):
+            self.data[f"{kind}s_total"] = self.data.get(f"{kind}s_total", 0) + 1
+            self.data[f"last_{kind}_at"] = utcnow().isoformat()
+
+
+async def render_prometheus(db) -> str:
+    """Prometheus text exposition of all collectors plus cached business counts."""
+    counts = await db.get_metrics_snapshot()
+    for kind in ("posts_total", "posts_today", "mentions_total", "mentions_today", "actions_today"):
+        BUSINESS.set(counts.get(kind, 0), kind=kind)
+    return registry.render()
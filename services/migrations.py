@@ -0,0 +1,236 @@
+"""
+Versioned schema migration runner.
+
+Discovers migration files from the migrations/ package, records applied
+versions in schema_migrations and only runs what is missing. When the
+database is already at head, startup costs two cheap SELECTs and no DDL.
+
+Run manually with: python -m services.migrations [--status]
+"""
+
+import asyncio
+import importlib
+import logging
+import pkgutil
+from pathlib import Path
+from typing import Any
+
+import asyncpg
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_PATH = Path(__file__).parent.parent / "migrations"
+
+# Arbitrary constant key so only one process applies migrations at a time
+MIGRATION_LOCK_ID = 72_190_026
+
+# Rows updated per statement in online backfills
+BACKFILL_BATCH_SIZE = 5_000
+
+
+def discover_migrations() -> list[dict[str, Any]]:
+    """
+    Discover migration modules from the migrations folder.
+
+    Returns:
+        List of migrations sorted by version, each with version, name,
+        transactional and upgrade.
+    """
+    migrations = []
+    seen_versions: dict[int, str] = {}
+
+    for _, module_name, _ in pkgutil.iter_modules([str(MIGRATIONS_PATH)]):
+        if module_name.startswith("_"):
+            continue
+
+        module = importlib.import_module(f"migrations.{module_name}")
+
+        if not hasattr(module, "MIGRATION_CONFIG") or not hasattr(module, "upgrade"):
+            logger.warning(f"[MIGRATIONS] {module_name} has no MIGRATION_CONFIG/upgrade, skipping")
+            continue
+
+        config = module.MIGRATION_CONFIG
+        version = config["version"]
+
+        if version in seen_versions:
+            raise RuntimeError(
+                f"Duplicate migration version {version}: {seen_versions[version]} and {module_name}"
+            )
+        seen_versions[version] = module_name
+
+        migrations.append({
+            "version": version,
+            "name": config["name"],
+            "transactional": config.get("transactional", True),
+            "upgrade": module.upgrade
+        })
+
+    migrations.sort(key=lambda m: m["version"])
+    return migrations
+
+
+async def get_current_version(conn: asyncpg.Connection) -> int:
+    """
+    Get the highest applied migration version.
+
+    Returns:
+        Applied version, or 0 if schema_migrations doesn't exist yet.
+    """
+    exists = await conn.fetchval("SELECT to_regclass('schema_migrations') IS NOT NULL")
+    if not exists:
+        return 0
+    return await conn.fetchval("SELECT COALESCE(MAX(version), 0) FROM schema_migrations")
+
+
+async def _ensure_migrations_table(conn: asyncpg.Connection) -> None:
+    """Create schema_migrations if needed."""
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            name VARCHAR(100) NOT NULL,
+            applied_at TIMESTAMP DEFAULT NOW()
+        )
+    """)
+
+
+async def _apply_migration(conn: asyncpg.Connection, migration: dict[str, Any]) -> None:
+    """Apply a single migration and record its version."""
+    version = migration["version"]
+    name = migration["name"]
+    logger.info(f"[MIGRATIONS] Applying {version:04d}_{name}...")
+
+    record_sql = "INSERT INTO schema_migrations (version, name) VALUES ($1, $2)"
+
+    if migration["transactional"]:
+        async with conn.transaction():
+            await migration["upgrade"](conn)
+            await conn.execute(record_sql, version, name)
+    else:
+        # Non-transactional steps must be idempotent: a failure halfway
+        # leaves the version unrecorded and the step is re-run next time.
+        await migration["upgrade"](conn)
+        await conn.execute(record_sql, version, name)
+
+    logger.info(f"[MIGRATIONS] Applied {version:04d}_{name}")
+
+
+async def run_migrations(pool: asyncpg.Pool) -> int:
+    """
+    Bring the schema up to head.
+
+    Args:
+        pool: Connected asyncpg pool.
+
+    Returns:
+        Number of migrations applied.
+    """
+    migrations = discover_migrations()
+    head = migrations[-1]["version"] if migrations else 0
+
+    async with pool.acquire() as conn:
+        current = await get_current_version(conn)
+        if current >= head:
+            logger.info(f"[MIGRATIONS] Schema at head (version {current})")
+            return 0
+
+        await conn.execute("SELECT pg_advisory_lock($1)", MIGRATION_LOCK_ID)
+        try:
+            await _ensure_migrations_table(conn)
+
+            # Another process may have migrated while we waited for the lock
+            applied = set(await conn.fetchval(
+                "SELECT COALESCE(array_agg(version), '{}') FROM schema_migrations"
+            ))
+            pending = [m for m in migrations if m["version"] not in applied]
+
+            for migration in pending:
+                await _apply_migration(conn, migration)
+        finally:
+            await conn.execute("SELECT pg_advisory_unlock($1)", MIGRATION_LOCK_ID)
+
+    logger.info(f"[MIGRATIONS] Applied {len(pending)} migrations, now at version {head}")
+    return len(pending)
+
+
+# ==================== Helpers for migration files ====================
+
+async def backfill_in_batches(
+    conn: asyncpg.Connection,
+    sql: str,
+    batch_size: int = BACKFILL_BATCH_SIZE
+) -> int:
+    """
+    Run an UPDATE (or INSERT ... SELECT) repeatedly in small autocommitted batches.
+
+    Each batch holds row locks only briefly, so the backfill can run
+    while the bot keeps writing. Must be called outside a transaction.
+
+    Args:
+        conn: Database connection.
+        sql: Statement taking the batch size as $1.
+        batch_size: Rows per batch.
+
+    Returns:
+        Total rows written.
+    """
+    total = 0
+    while True:
+        status = await conn.execute(sql, batch_size)
+        updated = int(status.split()[-1])
+        total += updated
+        if updated < batch_size:
+            break
+        logger.info(f"[MIGRATIONS] Backfilled {total} rows...")
+    return total
+
+
+async def create_index_concurrently(conn: asyncpg.Connection, index_name: str, sql: str) -> None:
+    """
+    Build an index without blocking writes.
+
+    A failed CONCURRENTLY build leaves an INVALID index behind that
+    IF NOT EXISTS would silently keep, so drop it before retrying.
+
+    Args:
+        conn: Database connection (outside a transaction).
+        index_name: Name of the index being created.
+        sql: CREATE INDEX CONCURRENTLY IF NOT EXISTS statement.
+    """
+    invalid = await conn.fetchval(
+        """
+        SELECT NOT i.indisvalid
+        FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+        WHERE c.relname = $1
+        """,
+        index_name
+    )
+    if invalid:
+        logger.warning(f"[MIGRATIONS] Dropping invalid index {index_name}")
+        await conn.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}")
+
+    await conn.execute(sql)
+
+
+async def _main(status_only: bool) -> None:
+    """Apply migrations (or print status) from the command line."""
+    from config.settings import settings
+
+    pool = await asyncpg.create_pool(settings.database_url, min_size=1, max_size=1)
+    try:
+        if status_only:
+            async with pool.acquire() as conn:
+                current = await get_current_version(conn)
+            for migration in discover_migrations():
+                mark = "x" if migration["version"] <= current else " "
+                print(f"[{mark}] {migration['version']:04d}_{migration['name']}")
+        else:
+            await run_migrations(pool)
+    finally:
+        await pool.close()
+
+
+if __name__ == "__main__":
+    import sys
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    asyncio.run(_main(status_only="--status" in sys.argv))
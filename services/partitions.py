@@ -0,0 +1,282 @@
+"""
+Monthly range partitioning for the actions and mentions tables.
+
+Creates upcoming monthly partitions ahead of time and archives partitions
+older than the retention window to gzipped JSONL files before dropping them.
+Dropping a mentions month also deletes its rows from mention_ids, so the
+retention window bounds the uniqueness table too.
+"""
+
+import asyncio
+import gzip
+import json
+import logging
+import os
+import re
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import asyncpg
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+PARTITIONED_TABLES = ("actions", "mentions")
+
+# Partition names look like actions_p2026_01
+_PARTITION_RE = re.compile(r"^(?P<table>\w+)_p(?P<year>\d{4})_(?P<month>\d{2})$")
+
+# Rows per write when exporting a partition
+ARCHIVE_BATCH_SIZE = 1_000
+
+# Unpartitioned tables keyed by created_at whose rows go with an archived month
+# (mention_ids enforces tweet_id uniqueness for mentions, see migration 0009)
+ARCHIVE_COMPANION_TABLES = {"mentions": "mention_ids"}
+
+
+def month_start(day: date) -> date:
+    """First day of the month containing day."""
+    return date(day.year, day.month, 1)
+
+
+def add_months(day: date, months: int) -> date:
+    """First day of the month `months` after the month containing day."""
+    index = day.year * 12 + (day.month - 1) + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    """Partition table name for a given month."""
+    return f"{table}_p{month:%Y_%m}"
+
+
+async def list_partitions(conn: asyncpg.Connection, table: str) -> dict[str, date]:
+    """
+    Get monthly partitions of a table.
+
+    Args:
+        conn: Database connection.
+        table: Parent table name.
+
+    Returns:
+        Dict mapping partition name -> first day of its month.
+    """
+    rows = await conn.fetch(
+        """
+        SELECT c.relname
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        JOIN pg_class p ON p.oid = i.inhparent
+        WHERE p.relname = $1
+        """,
+        table
+    )
+
+    partitions = {}
+    for row in rows:
+        match = _PARTITION_RE.match(row["relname"])
+        if match and match["table"] == table:
+            partitions[row["relname"]] = date(int(match["year"]), int(match["month"]), 1)
+    return partitions
+
+
+async def ensure_partitions(
+    conn: asyncpg.Connection,
+    table: str,
+    start: date | None = None,
+    months_ahead: int | None = None
+) -> list[str]:
+    """
+    Create any missing monthly partitions from start through months_ahead.
+
+    Args:
+        conn: Database connection.
+        table: Parent table name.
+        start: First month to cover (default: current month).
+        months_ahead: Months to pre-create past the current one.
+
+    Returns:
+        Names of partitions created.
+    """
+    if months_ahead is None:
+        months_ahead = settings.partition_premake_months
+
+    today = datetime.now(timezone.utc).date()
+    month = month_start(start or today)
+    last = add_months(today, months_ahead)
+
+    existing = await list_partitions(conn, table)
+    created = []
+
+    while month <= last:
+        name = partition_name(table, month)
+        if name not in existing:
+            await _create_partition(conn, table, month)
+            created.append(name)
+        month = add_months(month, 1)
+
+    return created
+
+
+async def _create_partition(conn: asyncpg.Connection, table: str, month: date) -> None:
+    """
+    Create one monthly partition, moving its rows out of the default partition.
+
+    Postgres refuses to create a partition whose range already has rows in
+    the default partition, so those rows are moved across with the default
+    detached, all in one transaction.
+    """
+    name = partition_name(table, month)
+    default = f"{table}_default"
+    bounds = f"created_at >= '{month.isoformat()}' AND created_at < '{add_months(month, 1).isoformat()}'"
+    create_sql = f"""
+        CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table}
+        FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')
+    """
+
+    async with conn.transaction():
+        has_default = await conn.fetchval("SELECT to_regclass($1) IS NOT NULL", default)
+        stranded = has_default and await conn.fetchval(f"SELECT EXISTS (SELECT 1 FROM {default} WHERE {bounds})")
+        if not stranded:
+            await conn.execute(create_sql)
+            logger.info(f"[PARTITIONS] Created {name}")
+            return
+
+        await conn.execute(f"ALTER TABLE {table} DETACH PARTITION {default}")
+        await conn.execute(create_sql)
+        moved = await conn.execute(f"INSERT INTO {table} SELECT * FROM {default} WHERE {bounds}")
+        await conn.execute(f"DELETE FROM {default} WHERE {bounds}")
+        await conn.execute(f"ALTER TABLE {table} ATTACH PARTITION {default} DEFAULT")
+        logger.info(f"[PARTITIONS] Created {name}, moved {moved.split()[-1]} rows from {default}")
+
+
+async def count_default_rows(conn: asyncpg.Connection, table: str) -> int:
+    """
+    Count rows stuck in a table's default partition.
+
+    Rows land there when no monthly partition covers their created_at. They
+    are moved out when that month's partition is created, but never archived.
+    """
+    default = f"{table}_default"
+    if not await conn.fetchval("SELECT to_regclass($1) IS NOT NULL", default):
+        return 0
+    return await conn.fetchval(f"SELECT COUNT(*) FROM {default}")
+
+
+async def _export_partition(conn: asyncpg.Connection, name: str, path: Path) -> int:
+    """
+    Stream a partition to a gzipped JSONL file.
+
+    Writes to a temp file and renames on success so a half-written
+    archive is never mistaken for a complete one.
+
+    Returns:
+        Number of rows exported.
+    """
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    count = 0
+
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+        async with conn.transaction():
+            batch = []
+            async for record in conn.cursor(f"SELECT * FROM {name} ORDER BY created_at", prefetch=ARCHIVE_BATCH_SIZE):
+                batch.append(json.dumps(dict(record), default=str))
+                if len(batch) >= ARCHIVE_BATCH_SIZE:
+                    await asyncio.to_thread(f.write, "\n".join(batch) + "\n")
+                    count += len(batch)
+                    batch = []
+            if batch:
+                await asyncio.to_thread(f.write, "\n".join(batch) + "\n")
+                count += len(batch)
+
+    os.replace(tmp_path, path)
+    return count
+
+
+async def archive_old_partitions(
+    conn: asyncpg.Connection,
+    table: str,
+    retention_months: int | None = None,
+    archive_dir: str | None = None
+) -> list[dict[str, Any]]:
+    """
+    Archive and drop partitions older than the retention window.
+
+    Args:
+        conn: Database connection.
+        table: Parent table name.
+        retention_months: Full months to keep besides the current one.
+        archive_dir: Directory for archive files.
+
+    Returns:
+        List of archived partitions with row counts and file paths.
+    """
+    if retention_months is None:
+        retention_months = settings.partition_retention_months
+    directory = Path(archive_dir or settings.partition_archive_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    today = datetime.now(timezone.utc).date()
+    cutoff = add_months(today, -retention_months)
+
+    archived = []
+    partitions = await list_partitions(conn, table)
+
+    for name, month in sorted(partitions.items(), key=lambda p: p[1]):
+        if month >= cutoff:
+            continue
+
+        path = directory / f"{name}.jsonl.gz"
+        rows = await _export_partition(conn, name, path)
+
+        async with conn.transaction():
+            await conn.execute(f"ALTER TABLE {table} DETACH PARTITION {name}")
+            await conn.execute(f"DROP TABLE {name}")
+            companion = ARCHIVE_COMPANION_TABLES.get(table)
+            if companion:
+                await conn.execute(
+                    f"""
+                    DELETE FROM {companion}
+                    WHERE created_at >= '{month.isoformat()}' AND created_at < '{add_months(month, 1).isoformat()}'
+                    """
+                )
+
+        logger.info(f"[PARTITIONS] Archived {name}: {rows} rows -> {path}")
+        archived.append({"partition": name, "rows": rows, "file": str(path)})
+
+    return archived
+
+
+async def run_maintenance(pool: asyncpg.Pool, archive: bool = True) -> dict[str, Any]:
+    """
+    Pre-create upcoming partitions and archive expired ones.
+
+    Args:
+        pool: Connected asyncpg pool.
+        archive: If False, only pre-create partitions.
+
+    Returns:
+        Summary of created and archived partitions, plus row counts for
+        any non-empty default partitions.
+    """
+    created = []
+    archived = []
+    default_rows = {}
+
+    async with pool.acquire() as conn:
+        for table in PARTITIONED_TABLES:
+            created.extend(await ensure_partitions(conn, table))
+            if archive:
+                archived.extend(await archive_old_partitions(conn, table))
+
+            rows = await count_default_rows(conn, table)
+            if rows:
+                default_rows[table] = rows
+                logger.error(
+                    f"[PARTITIONS] {table}_default holds {rows} rows outside every monthly partition; "
+                    f"they are moved when their month's partition is created"
+                )
+
+    return {"created": created, "archived": archived, "default_rows": default_rows}
@@ -0,0 +1,132 @@
+"""
+Speculative context prefetch for the unified agent.
+
+Almost every cycle starts with get_mentions, followed by
+get_twitter_profile / get_conversation_history for the authors - one LLM
+round trip each. Before the first LLM call the agent fetches mentions and,
+concurrently, profile and history of the top new authors. The results are
+inlined into the initial context and kept in a PrefetchCache, so the same
+tool calls made later in the cycle are answered without re-fetching.
+"""
+
+import asyncio
+import logging
+from typing import Any
+
+from services.profile_cache import resolve_profiles
+from services.tracing import span
+from tools.registry import get_tool_func, tool_call_key
+from tools.unified.get_mentions import fetch_unprocessed_mentions, format_mentions
+
+logger = logging.getLogger(__name__)
+
+
+class PrefetchCache:
+    """
+    Tool results fetched ahead of the LLM, keyed by tool call.
+
+    Entries are served once: a repeated call later in the cycle (e.g.
+    get_mentions after replying) fetches fresh data.
+    """
+
+    def __init__(self):
+        self.entries: dict[tuple[str, str], str] = {}
+        self.hits = 0
+        # Unprocessed mentions found by the prefetch, None if it didn't fetch them
+        self.mentions: int | None = None
+
+    def put(self, tool_name: str, params: dict, result: str) -> None:
+        self.entries[tool_call_key(tool_name, params)] = result
+
+    def pop(self, tool_name: str, params: dict) -> str | None:
+        """Cached result for this call, or None."""
+        result = self.entries.pop(tool_call_key(tool_name, params), None)
+        if result is not None:
+            self.hits += 1
+        return result
+
+
+async def _run_tool(tool_name: str, params: dict, context: dict[str, Any]) -> str:
+    func = get_tool_func(tool_name)
+    with span(f"tool.{tool_name}", prefetch=True):
+        return await func(**context, **params)
+
+
+async def prefetch_context(
+    twitter,
+    db,
+    tier_manager,
+    tools: list[str],
+    max_authors: int
+) -> tuple[str, PrefetchCache]:
+    """
+    Fetch mentions and author context before the first LLM call.
+
+    Args:
+        twitter: TwitterClient instance.
+        db: Database instance.
+        tier_manager: TierManager instance.
+        tools: Tools available this cycle (prefetch only what the agent could call).
+        max_authors: Number of distinct new authors to look up.
+
+    Returns:
+        (context section for the system prompt, cache for the tool calls).
+    """
+    cache = PrefetchCache()
+    if "get_mentions" not in tools:
+        return "", cache
+
+    with span("agent.prefetch") as s:
+        try:
+            mentions = await fetch_unprocessed_mentions(twitter, db)
+        except Exception as e:
+            logger.error(f"[PREFETCH] Failed to fetch mentions: {e}")
+            return "", cache
+
+        cache.mentions = len(mentions)
+        mentions_text = format_mentions(mentions)
+        cache.put("get_mentions", {}, mentions_text)
+        sections = [f"### Mentions\n\n{mentions_text}"]
+
+        authors = list(dict.fromkeys(m["author"] for m in mentions))[:max_authors]
+        calls = [
+            (tool_name, {"username": author})
+            for author in authors
+            for tool_name in ("get_twitter_profile", "get_conversation_history")
+            if tool_name in tools
+        ]
+
+        # One batched lookup for all authors not already cached from the mentions expansion
+        if authors and "get_twitter_profile" in tools:
+            try:
+                await resolve_profiles(twitter, db, authors)
+            except Exception as e:
+                logger.warning(f"[PREFETCH] Profile batch lookup failed: {e}")
+
+        context = {"twitter": twitter, "db": db, "tier_manager": tier_manager}
+        results = await asyncio.gather(
+            *(_run_tool(tool_name, params, context) for tool_name, params in calls),
+            return_exceptions=True
+        )
+
+        by_author: dict[str, list[str]] = {}
+        for (tool_name, params), result in zip(calls, results):
+            if isinstance(result, BaseException):
+                logger.warning(f"[PREFETCH] {tool_name}(@{params['username']}) failed: {result}")
+                continue
+            cache.put(tool_name, params, result)
+            by_author.setdefault(params["username"], []).append(result)
+
+        for author, parts in by_author.items():
+            sections.append(f"### @{author}\n\n" + "\n\n".join(parts))
+
+        if s:
+            s.set_attribute("mentions", len(mentions))
+            s.set_attribute("authors", len(authors))
+
+    logger.info(f"[PREFETCH] {len(mentions)} mentions, {len(by_author)} authors prefetched")
+    return (
+        "## PREFETCHED CONTEXT\n\n"
+        "Already fetched this cycle - no need to call these tools again for the same input.\n\n"
+        + "\n\n".join(sections)
+    ), cache
@@ -0,0 +1,125 @@
+"""
+Twitter profile cache.
+
+Profile lookups go through three tiers:
+1. in-process LRU with TTL (also seeded from the includes.users expansion
+   of get_mentions, so mention authors are usually already here)
+2. the user_profiles table, so the cache survives restarts
+3. one batched get_users request per 100 missing handles
+
+Handles that don't exist are remembered in memory too, so typos don't
+cost a read every time.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ProfileCache:
+    """In-memory LRU of profiles keyed by lowercase handle, with TTL."""
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, dict[str, Any] | None]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, username: str) -> tuple[bool, dict[str, Any] | None]:
+        """
+        Look up a handle.
+
+        Returns:
+            (hit, profile); profile is None on a hit for a missing user.
+        """
+        key = username.lower()
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() - entry[0] > self.ttl_seconds:
+            self._entries.pop(key, None)
+            self.misses += 1
+            return False, None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return True, entry[1]
+
+    def put(self, username: str, profile: dict[str, Any] | None) -> None:
+        """Store a profile (None records that the user doesn't exist)."""
+        key = username.lower()
+        self._entries[key] = (time.monotonic(), profile)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> dict[str, Any]:
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+async def resolve_profiles(twitter, db, usernames: list[str]) -> dict[str, dict[str, Any] | None]:
+    """
+    Resolve profiles through memory, DB and batched Twitter lookups.
+
+    Args:
+        twitter: TwitterClient instance (owns the in-memory cache).
+        db: Database instance, or None to skip the persistent tier.
+        usernames: Handles, with or without @.
+
+    Returns:
+        Dict of lowercase handle -> profile, or None if the user doesn't exist.
+        Handles whose lookup failed are left out (and not cached).
+    """
+    cache: ProfileCache = twitter.profile_cache
+    wanted = list(dict.fromkeys(u.lstrip("@").lower() for u in usernames if u))
+    result: dict[str, dict[str, Any] | None] = {}
+
+    missing = []
+    for username in wanted:
+        hit, profile = cache.get(username)
+        if hit:
+            result[username] = profile
+        else:
+            missing.append(username)
+
+    if missing and db:
+        try:
+            for profile in await db.get_user_profiles(missing, settings.profile_cache_ttl_seconds):
+                key = profile["username"].lower()
+                cache.put(key, profile)
+                result[key] = profile
+        except Exception as e:
+            logger.warning(f"[PROFILES] DB lookup failed: {e}")
+        missing = [u for u in missing if u not in result]
+
+    if missing:
+        fetched = await asyncio.to_thread(twitter.get_user_profiles, missing)
+        found = []
+        for username in missing:
+            # Not in the response: its batch failed, so retry on the next lookup
+            if username not in fetched:
+                continue
+            profile = fetched[username]
+            cache.put(username, profile)
+            result[username] = profile
+            if profile:
+                found.append(profile)
+
+        if found and db:
+            try:
+                await db.save_user_profiles(found)
+            except Exception as e:
+                logger.warning(f"[PROFILES] Failed to persist profiles: {e}")
+
+        failed = len(missing) - len(fetched)
+        logger.info(
+            f"[PROFILES] Fetched {len(found)}/{len(missing)} profiles from Twitter"
+            + (f" ({failed} lookups failed)" if failed else "")
+        )
+
+    return result
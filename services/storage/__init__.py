@@ -0,0 +1,38 @@
+"""
+Pluggable storage backends for the Database service.
+
+Backend is chosen from the DATABASE_URL scheme:
+- postgres:// / postgresql://  - PostgresBackend (production)
+- sqlite:///path.db            - SQLiteBackend (requires aiosqlite)
+- memory://                    - MemoryBackend (no persistence)
+"""
+
+from services.storage.base import StorageBackend
+
+
+def get_backend(url: str) -> StorageBackend:
+    """
+    Create the storage backend for a database URL.
+
+    Args:
+        url: Database URL.
+
+    Returns:
+        Unconnected backend instance.
+    """
+    scheme = url.split("://", 1)[0].lower()
+
+    if scheme in ("postgres", "postgresql"):
+        from services.storage.postgres import PostgresBackend
+        return PostgresBackend(url)
+    if scheme == "sqlite":
+        from services.storage.sqlite import SQLiteBackend
+        return SQLiteBackend(url)
+    if scheme == "memory":
+        from services.storage.memory import MemoryBackend
+        return MemoryBackend(url)
+
+    raise ValueError(f"Unsupported DATABASE_URL scheme: {scheme}")
+
+
+__all__ = ["StorageBackend", "get_backend"]
@@ -0,0 +1,309 @@
+"""
+Storage backend interface and shared formatting helpers.
+
+Every backend implements the same methods with the same semantics for
+posts, mentions, actions and bot_state, so services can run against
+PostgreSQL in production and in-memory/SQLite storage in local runs,
+CI and benchmarks.
+"""
+
+from datetime import datetime, timezone
+from typing import Any
+
+
+def utcnow() -> datetime:
+    """Naive UTC timestamp, matching TIMESTAMP DEFAULT NOW() columns."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def today_start() -> datetime:
+    """Midnight UTC today, matching CURRENT_DATE."""
+    return utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+# Columns of user_profiles besides the handle key and user id, in statement order
+PROFILE_FIELDS = ("username", "bio", "followers", "following", "tweets", "location")
+
+# Columns of conversation_tweets, in statement order
+TWEET_FIELDS = ("tweet_id", "conversation_id", "author", "text", "in_reply_to_tweet_id")
+
+# Columns of action_intents set when an intent is claimed, in statement order
+INTENT_FIELDS = ("intent_key", "cycle_id", "action_type", "text", "reply_to_tweet_id", "reply_to_author")
+
+
+# ==================== Formatting ====================
+
+def format_recent_posts(rows: list[dict[str, Any]], total: int) -> str:
+    """
+    Format posts for LLM context, numbered by position in the full history.
+
+    Args:
+        rows: Most recent posts, oldest first.
+        total: Total number of posts.
+    """
+    if not rows:
+        return "No previous posts"
+
+    first = total - len(rows) + 1
+    return "\n".join(
+        f"post {first + i} (pic: {str(bool(row['include_picture'])).lower()}): {row['text']}"
+        for i, row in enumerate(rows)
+    )
+
+
+def format_user_mention_history(author_handle: str, rows: list[Any]) -> str:
+    """Format mention history with a user (rows newest first)."""
+    if not rows:
+        return "No previous conversations with this user."
+
+    history = []
+    for row in reversed(rows):  # Oldest first
+        history.append(f"@{author_handle}: {row['author_text']}")
+        history.append(f"You replied: {row['our_reply']}")
+
+    return "\n".join(history)
+
+
+def format_recent_mention_replies(rows: list[Any]) -> str:
+    """Format recent mention replies (rows newest first)."""
+    if not rows:
+        return "No previous mention replies."
+
+    history = []
+    for i, row in enumerate(reversed(rows), 1):  # Oldest first
+        history.append(f"{i}. @{row['author_handle']}: {row['author_text']}")
+        history.append(f"   Your reply: {row['our_reply']}")
+
+    return "\n".join(history)
+
+
+def format_recent_actions(rows: list[Any]) -> str:
+    """Format recent actions (rows newest first)."""
+    if not rows:
+        return "No previous actions."
+
+    lines = []
+    for i, row in enumerate(reversed(rows), 1):  # Oldest first
+        action_type = row["action_type"]
+        text = row["text"]
+        has_pic = bool(row["include_picture"])
+
+        if action_type == "post":
+            lines.append(f"{i}. POST (pic: {has_pic}): {text}")
+        elif action_type == "reply":
+            author = row["reply_to_author"] or "unknown"
+            lines.append(f"{i}. REPLY to @{author} (pic: {has_pic}): {text}")
+
+    return "\n".join(lines)
+
+
+def format_user_actions_history(rows: list[Any]) -> str:
+    """Format reply history with a user from actions (rows newest first)."""
+    if not rows:
+        return "No previous conversations with this user."
+
+    history = []
+    for row in reversed(rows):  # Oldest first
+        history.append(f"You replied to @{row['reply_to_author']}: {row['text']}")
+
+    return "\n".join(history)
+
+
+class StorageBackend:
+    """
+    Interface implemented by every storage backend.
+
+    Methods mirror the public Database API. Backends that have no pool
+    or partitions inherit the no-op defaults below.
+    """
+
+    name = "base"
+
+    async def connect(self) -> None:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        raise NotImplementedError
+
+    async def ping(self) -> bool:
+        raise NotImplementedError
+
+    def get_pool_stats(self) -> dict[str, Any]:
+        """Connection pool metrics (empty for pool-less backends)."""
+        return {}
+
+    async def run_partition_maintenance(self, archive: bool = True) -> dict[str, Any]:
+        """Partition maintenance (no-op for unpartitioned backends)."""
+        return {"created": [], "archived": [], "default_rows": {}}
+
+    # ==================== Posts ====================
+
+    async def get_recent_posts_formatted(self, limit: int = 50) -> str:
+        raise NotImplementedError
+
+    async def get_recent_posts(self, limit: int = 10) -> list[dict[str, Any]]:
+        raise NotImplementedError
+
+    async def save_post(self, text: str, tweet_id: str, include_picture: bool) -> int:
+        raise NotImplementedError
+
+    # ==================== Mentions ====================
+
+    async def save_mention(
+        self,
+        tweet_id: str,
+        author_handle: str,
+        author_text: str,
+        our_reply: str | None,
+        action: str,
+        tools_used: str | None = None
+    ) -> int:
+        raise NotImplementedError
+
+    async def get_user_mention_history(self, author_handle: str, limit: int = 5) -> str:
+        raise NotImplementedError
+
+    async def get_last_reply_times(self, author_handles: list[str]) -> dict[str, datetime]:
+        """Lowercase handle -> when we last replied to them, for handles we ever replied to."""
+        raise NotImplementedError
+
+    async def get_recent_mentions_formatted(self, limit: int = 15) -> str:
+        raise NotImplementedError
+
+    async def get_state(self, key: str) -> str | None:
+        raise NotImplementedError
+
+    async def set_state(self, key: str, value: str) -> None:
+        raise NotImplementedError
+
+    async def mention_exists(self, tweet_id: str, include_pending: bool = False) -> bool:
+        raise NotImplementedError
+
+    async def get_pending_mention(self, tweet_id: str) -> dict | None:
+        raise NotImplementedError
+
+    async def update_mention(
+        self,
+        tweet_id: str,
+        our_reply: str,
+        action: str = "agent_replied",
+        tools_used: str | None = None
+    ) -> None:
+        raise NotImplementedError
+
+    # ==================== Metrics ====================
+
+    async def count_posts(self) -> int:
+        raise NotImplementedError
+
+    async def count_posts_today(self) -> int:
+        raise NotImplementedError
+
+    async def count_mentions(self) -> int:
+        raise NotImplementedError
+
+    async def count_mentions_today(self) -> int:
+        raise NotImplementedError
+
+    async def get_last_post_time(self) -> str | None:
+        raise NotImplementedError
+
+    async def get_last_mention_time(self) -> str | None:
+        raise NotImplementedError
+
+    async def get_metrics_snapshot(self) -> dict[str, Any]:
+        """
+        All /metrics counts at once.
+
+        Backends override this with a single query; this fallback issues
+        one query per count.
+        """
+        return {
+            "posts_total": await self.count_posts(),
+            "posts_today": await self.count_posts_today(),
+            "mentions_total": await self.count_mentions(),
+            "mentions_today": await self.count_mentions_today(),
+            "actions_today": await self.count_actions_today(),
+            "last_post_at": await self.get_last_post_time(),
+            "last_mention_at": await self.get_last_mention_time()
+        }
+
+    # ==================== User profiles ====================
+
+    async def get_user_profiles(self, usernames: list[str], max_age_seconds: float) -> list[dict[str, Any]]:
+        """Stored profiles for these handles fetched within max_age_seconds."""
+        raise NotImplementedError
+
+    async def save_user_profiles(self, profiles: list[dict[str, Any]]) -> None:
+        """Upsert profiles (keys: id, username, bio, followers, following, tweets, location)."""
+        raise NotImplementedError
+
+    # ==================== Conversation tweets ====================
+
+    async def get_conversation_tweets(self, conversation_ids: list[str]) -> list[dict[str, Any]]:
+        """All stored tweets of these conversations."""
+        raise NotImplementedError
+
+    async def save_conversation_tweets(self, tweets: list[dict[str, Any]]) -> None:
+        """Insert tweets not stored yet (keys: TWEET_FIELDS)."""
+        raise NotImplementedError
+
+    # ==================== Agent checkpoints ====================
+
+    async def get_checkpoint(self, agent: str, max_age_seconds: float) -> dict[str, Any] | None:
+        """Checkpoint of this agent saved within max_age_seconds (keys: cycle_id, iteration, state, updated_at)."""
+        raise NotImplementedError
+
+    async def save_checkpoint(self, agent: str, cycle_id: str, iteration: int, state: bytes) -> None:
+        """Replace the checkpoint of this agent."""
+        raise NotImplementedError
+
+    async def delete_checkpoint(self, agent: str) -> None:
+        """Drop the checkpoint of this agent, if any."""
+        raise NotImplementedError
+
+    # ==================== Action intents ====================
+
+    async def claim_intent(self, intent: dict[str, Any]) -> bool:
+        """Insert a pending intent (keys: INTENT_FIELDS), or re-claim a failed one; False if already claimed."""
+        raise NotImplementedError
+
+    async def get_intent(self, intent_key: str) -> dict[str, Any] | None:
+        """Intent row (INTENT_FIELDS plus include_picture, status, tweet_id, created_at, updated_at)."""
+        raise NotImplementedError
+
+    async def update_intent(
+        self,
+        intent_key: str,
+        status: str,
+        tweet_id: str | None = None,
+        include_picture: bool | None = None
+    ) -> None:
+        """Set the status of an intent; tweet_id/include_picture are kept when None."""
+        raise NotImplementedError
+
+    async def get_open_intents(self) -> list[dict[str, Any]]:
+        """Pending and posted intents, oldest first."""
+        raise NotImplementedError
+
+    # ==================== Actions ====================
+
+    async def get_recent_actions_formatted(self, limit: int = 20) -> str:
+        raise NotImplementedError
+
+    async def save_action(
+        self,
+        action_type: str,
+        text: str,
+        tweet_id: str | None = None,
+        include_picture: bool = False,
+        reply_to_tweet_id: str | None = None,
+        reply_to_author: str | None = None
+    ) -> int:
+        raise NotImplementedError
+
+    async def get_user_actions_history(self, author_handle: str, limit: int = 10) -> str:
+        raise NotImplementedError
+
+    async def count_actions_today(self, action_type: str | None = None) -> int:
+        raise NotImplementedError
@@ -0,0 +1,339 @@
+"""
+In-memory storage backend.
+
+Keeps posts, mentions, actions and bot_state in Python lists/dicts.
+No external dependencies and no I/O, so it is suited to unit runs, dry
+runs and hermetic benchmarks. Data is lost when the process exits.
+"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Any
+
+from services.storage.base import (
+    INTENT_FIELDS,
+    PROFILE_FIELDS,
+    TWEET_FIELDS,
+    StorageBackend,
+    format_recent_actions,
+    format_recent_mention_replies,
+    format_recent_posts,
+    format_user_actions_history,
+    format_user_mention_history,
+    today_start,
+    utcnow
+)
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryBackend(StorageBackend):
+    """Storage backend holding all tables in process memory."""
+
+    name = "memory"
+
+    def __init__(self, url: str = "memory://"):
+        """
+        Initialize empty tables.
+
+        Args:
+            url: Ignored, accepted for a uniform backend constructor.
+        """
+        self.url = url
+        self.connected = False
+        self.posts: list[dict[str, Any]] = []
+        self.mentions: list[dict[str, Any]] = []
+        self.actions: list[dict[str, Any]] = []
+        self.bot_state: dict[str, dict[str, Any]] = {}
+        self.user_profiles: dict[str, dict[str, Any]] = {}
+        self.conversation_tweets: dict[str, dict[str, Any]] = {}
+        self.agent_checkpoints: dict[str, dict[str, Any]] = {}
+        self.action_intents: dict[str, dict[str, Any]] = {}
+
+    async def connect(self) -> None:
+        """Mark backend as connected."""
+        self.connected = True
+        logger.info("In-memory database ready")
+
+    async def close(self) -> None:
+        """Mark backend as closed (data is kept until the object is dropped)."""
+        self.connected = False
+
+    async def ping(self) -> bool:
+        """In-memory storage is always reachable once connected."""
+        return self.connected
+
+    def _insert(self, table: list[dict[str, Any]], row: dict[str, Any]) -> int:
+        """Append a row with a serial id and created_at."""
+        row["id"] = len(table) + 1
+        row["created_at"] = utcnow()
+        table.append(row)
+        return row["id"]
+
+    @staticmethod
+    def _newest_first(rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Rows by created_at DESC (tables are append-only, so insertion order)."""
+        return rows[::-1]
+
+    # ==================== Posts ====================
+
+    async def get_recent_posts_formatted(self, limit: int = 50) -> str:
+        recent = self._newest_first(self.posts)[:limit]
+        return format_recent_posts(list(reversed(recent)), len(self.posts))
+
+    async def get_recent_posts(self, limit: int = 10) -> list[dict[str, Any]]:
+        return [
+            {k: row[k] for k in ("id", "text", "tweet_id", "include_picture", "created_at")}
+            for row in self._newest_first(self.posts)[:limit]
+        ]
+
+    async def save_post(self, text: str, tweet_id: str, include_picture: bool) -> int:
+        post_id = self._insert(self.posts, {
+            "text": text,
+            "tweet_id": tweet_id,
+            "include_picture": include_picture
+        })
+        logger.info(f"Saved post {post_id} with tweet_id {tweet_id}, include_picture={include_picture}")
+        return post_id
+
+    # ==================== Mentions ====================
+
+    async def save_mention(
+        self,
+        tweet_id: str,
+        author_handle: str,
+        author_text: str,
+        our_reply: str | None,
+        action: str,
+        tools_used: str | None = None
+    ) -> int | None:
+        if any(m["tweet_id"] == tweet_id for m in self.mentions):
+            logger.info(f"Mention {tweet_id} already saved, skipping")
+            return None
+        mention_id = self._insert(self.mentions, {
+            "tweet_id": tweet_id,
+            "author_handle": author_handle,
+            "author_handle_lower": author_handle.lower() if author_handle else None,
+            "author_text": author_text,
+            "our_reply": our_reply,
+            "action": action,
+            "tools_used": tools_used
+        })
+        logger.info(f"Saved mention {mention_id} with action '{action}', tools: {tools_used}")
+        return mention_id
+
+    async def get_user_mention_history(self, author_handle: str, limit: int = 5) -> str:
+        handle = author_handle.lower()
+        rows = [
+            m for m in self._newest_first(self.mentions)
+            if m["author_handle_lower"] == handle and m["our_reply"] is not None
+        ][:limit]
+        return format_user_mention_history(author_handle, rows)
+
+    async def get_recent_mentions_formatted(self, limit: int = 15) -> str:
+        rows = [m for m in self._newest_first(self.mentions) if m["our_reply"] is not None][:limit]
+        return format_recent_mention_replies(rows)
+
+    async def get_state(self, key: str) -> str | None:
+        row = self.bot_state.get(key)
+        return row["value"] if row else None
+
+    async def set_state(self, key: str, value: str) -> None:
+        self.bot_state[key] = {"value": value, "updated_at": utcnow()}
+        logger.info(f"Set state {key} = {value}")
+
+    async def mention_exists(self, tweet_id: str, include_pending: bool = False) -> bool:
+        return any(
+            m["tweet_id"] == tweet_id and (include_pending or m["action"] != "pending")
+            for m in self.mentions
+        )
+
+    async def get_last_reply_times(self, author_handles: list[str]) -> dict[str, datetime]:
+        wanted = {h.lower() for h in author_handles}
+        result: dict[str, datetime] = {}
+        for m in self.mentions:
+            handle = m["author_handle_lower"]
+            if handle in wanted and m["our_reply"] is not None:
+                result[handle] = max(result.get(handle, m["created_at"]), m["created_at"])
+        return result
+
+    async def get_pending_mention(self, tweet_id: str) -> dict | None:
+        for m in self.mentions:
+            if m["tweet_id"] == tweet_id:
+                return {"author": m["author_handle"], "text": m["author_text"]}
+        return None
+
+    async def update_mention(
+        self,
+        tweet_id: str,
+        our_reply: str,
+        action: str = "agent_replied",
+        tools_used: str | None = None
+    ) -> None:
+        for m in self.mentions:
+            if m["tweet_id"] == tweet_id:
+                m.update(our_reply=our_reply, action=action, tools_used=tools_used)
+        logger.info(f"Updated mention {tweet_id} with action '{action}', tools: {tools_used}")
+
+    # ==================== Metrics ====================
+
+    async def count_posts(self) -> int:
+        return len(self.posts)
+
+    async def count_posts_today(self) -> int:
+        start = today_start()
+        return sum(1 for p in self.posts if p["created_at"] >= start)
+
+    async def count_mentions(self) -> int:
+        return len(self.mentions)
+
+    async def count_mentions_today(self) -> int:
+        start = today_start()
+        return sum(1 for m in self.mentions if m["created_at"] >= start)
+
+    async def get_last_post_time(self) -> str | None:
+        if not self.posts:
+            return None
+        return self._newest_first(self.posts)[0]["created_at"].isoformat()
+
+    async def get_last_mention_time(self) -> str | None:
+        if not self.mentions:
+            return None
+        return self._newest_first(self.mentions)[0]["created_at"].isoformat()
+
+    # ==================== User profiles ====================
+
+    async def get_user_profiles(self, usernames: list[str], max_age_seconds: float) -> list[dict[str, Any]]:
+        cutoff = utcnow() - timedelta(seconds=max_age_seconds)
+        rows = [self.user_profiles.get(u.lower()) for u in usernames]
+        return [
+            {k: v for k, v in row.items() if k != "fetched_at"}
+            for row in rows
+            if row and row["fetched_at"] >= cutoff
+        ]
+
+    async def save_user_profiles(self, profiles: list[dict[str, Any]]) -> None:
+        now = utcnow()
+        for p in profiles:
+            self.user_profiles[p["username"].lower()] = {
+                "id": p.get("id"),
+                **{k: p[k] for k in PROFILE_FIELDS},
+                "fetched_at": now
+            }
+
+    # ==================== Conversation tweets ====================
+
+    async def get_conversation_tweets(self, conversation_ids: list[str]) -> list[dict[str, Any]]:
+        wanted = set(conversation_ids)
+        return [dict(t) for t in self.conversation_tweets.values() if t["conversation_id"] in wanted]
+
+    async def save_conversation_tweets(self, tweets: list[dict[str, Any]]) -> None:
+        for t in tweets:
+            self.conversation_tweets.setdefault(t["tweet_id"], {k: t[k] for k in TWEET_FIELDS})
+
+    # ==================== Agent checkpoints ====================
+
+    async def get_checkpoint(self, agent: str, max_age_seconds: float) -> dict[str, Any] | None:
+        checkpoint = self.agent_checkpoints.get(agent)
+        if not checkpoint or checkpoint["updated_at"] < utcnow() - timedelta(seconds=max_age_seconds):
+            return None
+        return dict(checkpoint)
+
+    async def save_checkpoint(self, agent: str, cycle_id: str, iteration: int, state: bytes) -> None:
+        self.agent_checkpoints[agent] = {
+            "cycle_id": cycle_id,
+            "iteration": iteration,
+            "state": state,
+            "updated_at": utcnow()
+        }
+
+    async def delete_checkpoint(self, agent: str) -> None:
+        self.agent_checkpoints.pop(agent, None)
+
+    # ==================== Action intents ====================
+
+    async def claim_intent(self, intent: dict[str, Any]) -> bool:
+        existing = self.action_intents.get(intent["intent_key"])
+        if existing:
+            if existing["status"] != "failed":
+                return False
+            existing.update(status="pending", tweet_id=None, updated_at=utcnow())
+            return True
+
+        now = utcnow()
+        self.action_intents[intent["intent_key"]] = {
+            **{k: intent[k] for k in INTENT_FIELDS},
+            "include_picture": False,
+            "status": "pending",
+            "tweet_id": None,
+            "created_at": now,
+            "updated_at": now
+        }
+        return True
+
+    async def get_intent(self, intent_key: str) -> dict[str, Any] | None:
+        intent = self.action_intents.get(intent_key)
+        return dict(intent) if intent else None
+
+    async def update_intent(
+        self,
+        intent_key: str,
+        status: str,
+        tweet_id: str | None = None,
+        include_picture: bool | None = None
+    ) -> None:
+        intent = self.action_intents.get(intent_key)
+        if not intent:
+            return
+        intent["status"] = status
+        intent["updated_at"] = utcnow()
+        if tweet_id is not None:
+            intent["tweet_id"] = tweet_id
+        if include_picture is not None:
+            intent["include_picture"] = include_picture
+
+    async def get_open_intents(self) -> list[dict[str, Any]]:
+        return [
+            dict(i) for i in sorted(self.action_intents.values(), key=lambda i: i["created_at"])
+            if i["status"] in ("pending", "posted")
+        ]
+
+    # ==================== Actions ====================
+
+    async def get_recent_actions_formatted(self, limit: int = 20) -> str:
+        return format_recent_actions(self._newest_first(self.actions)[:limit])
+
+    async def save_action(
+        self,
+        action_type: str,
+        text: str,
+        tweet_id: str | None = None,
+        include_picture: bool = False,
+        reply_to_tweet_id: str | None = None,
+        reply_to_author: str | None = None
+    ) -> int:
+        action_id = self._insert(self.actions, {
+            "action_type": action_type,
+            "text": text,
+            "tweet_id": tweet_id,
+            "include_picture": include_picture,
+            "reply_to_tweet_id": reply_to_tweet_id,
+            "reply_to_author": reply_to_author
+        })
+        logger.info(f"Saved action {action_id}: {action_type} (pic={include_picture})")
+        return action_id
+
+    async def get_user_actions_history(self, author_handle: str, limit: int = 10) -> str:
+        handle = author_handle.lower()
+        rows = [
+            a for a in self._newest_first(self.actions)
+            if a["action_type"] == "reply" and (a["reply_to_author"] or "").lower() == handle
+        ][:limit]
+        return format_user_actions_history(rows)
+
+    async def count_actions_today(self, action_type: str | None = None) -> int:
+        start = today_start()
+        return sum(
+            1 for a in self.actions
+            if a["created_at"] >= start and (not action_type or a["action_type"] == action_type)
+        )
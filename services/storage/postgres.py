@@ -0,0 +1,777 @@
+"""
+PostgreSQL storage backend using asyncpg.
+
+Production backend: pooled connections, named statements, versioned
+migrations and monthly partitions.
+"""
+
+import logging
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Any, AsyncIterator
+
+import asyncpg
+
+from config.settings import settings
+from services.db_statements import STATEMENTS
+from services.migrations import run_migrations
+from services import partitions
+from services.storage.base import (
+    INTENT_FIELDS,
+    PROFILE_FIELDS,
+    TWEET_FIELDS,
+    StorageBackend,
+    format_recent_actions,
+    format_recent_mention_replies,
+    format_user_actions_history,
+    format_user_mention_history
+)
+
+logger = logging.getLogger(__name__)
+
+
+class PoolStats:
+    """Connection pool utilization counters (acquisitions, in use, wait time)."""
+
+    def __init__(self):
+        self.acquisitions = 0
+        self.in_use = 0
+        self.max_in_use = 0
+        self.waiting = 0
+        self.max_waiting = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def start_wait(self) -> float:
+        """Mark a caller as waiting for a connection."""
+        self.waiting += 1
+        self.max_waiting = max(self.max_waiting, self.waiting)
+        return time.perf_counter()
+
+    def acquired(self, wait_started: float) -> None:
+        """Mark a connection as handed out."""
+        wait = time.perf_counter() - wait_started
+        self.waiting -= 1
+        self.acquisitions += 1
+        self.in_use += 1
+        self.max_in_use = max(self.max_in_use, self.in_use)
+        self.total_wait_seconds += wait
+        self.max_wait_seconds = max(self.max_wait_seconds, wait)
+
+    def wait_failed(self) -> None:
+        """Mark a waiter that gave up (timeout/cancel)."""
+        self.waiting -= 1
+
+    def released(self) -> None:
+        """Mark a connection as returned to the pool."""
+        self.in_use -= 1
+
+    def to_dict(self, pool: asyncpg.Pool | None) -> dict[str, Any]:
+        """Snapshot of counters plus live pool size."""
+        avg_wait = self.total_wait_seconds / self.acquisitions if self.acquisitions else 0.0
+        return {
+            "size": pool.get_size() if pool else 0,
+            "idle": pool.get_idle_size() if pool else 0,
+            "min_size": pool.get_min_size() if pool else 0,
+            "max_size": pool.get_max_size() if pool else 0,
+            "acquired": self.in_use,
+            "max_acquired": self.max_in_use,
+            "waiting": self.waiting,
+            "max_waiting": self.max_waiting,
+            "acquisitions": self.acquisitions,
+            "avg_wait_ms": round(avg_wait * 1000, 3),
+            "max_wait_ms": round(self.max_wait_seconds * 1000, 3)
+        }
+
+
+class PostgresBackend(StorageBackend):
+    """Async PostgreSQL storage backend using asyncpg."""
+
+    name = "postgres"
+
+    def __init__(self, url: str):
+        """
+        Initialize PostgreSQL backend.
+
+        Args:
+            url: PostgreSQL connection URL.
+        """
+        self.url = url
+        self.pool: asyncpg.Pool | None = None
+        self.pool_stats = PoolStats()
+
+    async def connect(self) -> None:
+        """
+        Connect to PostgreSQL and apply pending schema migrations.
+
+        Establishes connection pool. Schema changes live in migrations/
+        and are skipped entirely when the database is already at head.
+        """
+        logger.info("Connecting to database...")
+        self.pool = await asyncpg.create_pool(
+            self.url,
+            min_size=settings.db_pool_min_size,
+            max_size=settings.db_pool_max_size,
+            max_inactive_connection_lifetime=settings.db_pool_max_inactive_connection_lifetime,
+            statement_cache_size=settings.db_statement_cache_size
+        )
+
+        if settings.run_migrations_on_startup:
+            await run_migrations(self.pool)
+            await self.run_partition_maintenance(archive=False)
+
+        logger.info(
+            f"Database connected (pool {settings.db_pool_min_size}-{settings.db_pool_max_size}, "
+            f"statement cache {settings.db_statement_cache_size})"
+        )
+
+    async def run_partition_maintenance(self, archive: bool = True) -> dict[str, Any]:
+        """
+        Create upcoming monthly partitions and archive expired ones.
+
+        Args:
+            archive: If False, only pre-create partitions.
+
+        Returns:
+            Summary with created and archived partitions and non-empty
+            default partitions.
+        """
+        if not self.pool:
+            raise RuntimeError("Database not connected")
+
+        result = await partitions.run_maintenance(self.pool, archive=archive)
+        logger.info(f"[PARTITIONS] Maintenance: created={len(result['created'])}, archived={len(result['archived'])}")
+        return result
+
+    async def close(self) -> None:
+        """Close database connection pool."""
+        if self.pool:
+            await self.pool.close()
+            logger.info("Database connection closed")
+
+    def get_pool_stats(self) -> dict[str, Any]:
+        """Get connection pool utilization metrics."""
+        return self.pool_stats.to_dict(self.pool)
+
+    # ==================== Query Helpers ====================
+
+    @asynccontextmanager
+    async def _acquire(self) -> AsyncIterator[asyncpg.Connection]:
+        """Acquire a pooled connection, recording wait time and utilization."""
+        wait_started = self.pool_stats.start_wait()
+        try:
+            conn = await self.pool.acquire()
+        except BaseException:
+            self.pool_stats.wait_failed()
+            raise
+        self.pool_stats.acquired(wait_started)
+
+        try:
+            yield conn
+        finally:
+            self.pool_stats.released()
+            await self.pool.release(conn)
+
+    async def _fetch(self, name: str, *args) -> list[asyncpg.Record]:
+        """Run a named statement and return all rows."""
+        async with self._acquire() as conn:
+            return await conn.fetch(STATEMENTS[name], *args)
+
+    async def _fetchrow(self, name: str, *args) -> asyncpg.Record | None:
+        """Run a named statement and return the first row."""
+        async with self._acquire() as conn:
+            return await conn.fetchrow(STATEMENTS[name], *args)
+
+    async def _fetchval(self, name: str, *args) -> Any:
+        """Run a named statement and return the first column of the first row."""
+        async with self._acquire() as conn:
+            return await conn.fetchval(STATEMENTS[name], *args)
+
+    async def _execute(self, name: str, *args) -> str:
+        """Run a named statement without returning rows."""
+        async with self._acquire() as conn:
+            return await conn.execute(STATEMENTS[name], *args)
+
+    # ==================== Posts ====================
+
+    async def get_recent_posts_formatted(self, limit: int = 50) -> str:
+        """
+        Get recent posts formatted for LLM context.
+
+        Args:
+            limit: Maximum number of posts to retrieve.
+
+        Returns:
+            Formatted string with numbered posts.
+        """
+        if not self.pool:
+            raise RuntimeError("Database not connected")
+
+        row = await self._fetchrow("recent_posts_formatted", limit)
+        return row["texts"]
+
+    async def get_recent_posts(self, limit: int = 10) -> list[dict[str, Any]]:
+        """
+        Get recent posts from database.
+
+        Args:
+            limit: Maximum number of posts to retrieve.
+
+        Returns:
+            List of post dictionaries.
+        """
+        if not self.pool:
+            raise RuntimeError("Database not connected")
+
+        rows = await self._fetch("recent_posts", limit)
+        return [dict(row) for row in rows]
+
+    async def save_post(self, text: str, tweet_id: str, include_picture: bool) -> int:
+        """
+        Save a new post to database.
+
+        Args:
+            text: Post text content.
+            tweet_id: Twitter tweet ID.
+            include_picture: Whether post includes an image.
+
+        Returns:
+            Database ID of the created post.
+        """
+        if not self.pool:
+            raise RuntimeError("Database not connected")
+
+        row = await self._fetchrow("save_post", text, tweet_id, include_picture)
+        logger.info(f"Saved post {row['id']} with tweet_id {tweet_id}, include_picture={include_picture}")
+        return row["id"]
+
+    # ==================== Mentions ====================
+
+    async def save_mention(
+        self,
+        tweet_id: str,
+        author_handle: str,
+        author_text: str,
+        our_reply: str | None,
+        action: str,
+        tools_used: str | None = None
+    ) -> int | None:
+        """
+        Save a processed mention to database.
+
+        The tweet_id is claimed in mention_ids in the same statement, so
+        concurrent saves of one mention insert exactly one row.
+
+        Args:
+            tweet_id: Original tweet ID.
+            author_handle: Twitter handle of the author.
+            author_text: Text of the mention.
+            our_reply: Our reply text (None if ignored).
+            action: Action taken ('replied', 'ignored', 'agent_replied').
+            tools_used: Comma-separated list of tools used (e.g., 'web_search,generate_image').
+
+        Returns:
+            Database ID of the saved mention, or None if it was already saved.
+        """
+        if not self.pool:
+            raise RuntimeError("Database not connected")
+
+        row = await self._fetchrow(
+            "save_mention",
+            tweet_id,
+            author_handle,
+            author_text,
+            our_reply,
+            action,
+            tools_used
+        )
+        if row is None:
+            logger.info(f"Mention {tweet_id} already saved, skipping")
+            return None
+        logger.info(f"Saved mention {row['id']} with action '{action}', tools: {tools_used}")
+        return row["id"]
+
+    async def get_user_mention_history(self, author_handle: str, limit: int = 5) -> str:
+        """
+        Get recent mention history with a specific user.
+
+        Args:
+            author_handle: Twitter handle of the user.
+            limit: Maximum number of interactions to retrieve.
+
+        Returns:
+            Formatted string with conversation history.
+        """
+        if not self.pool:
+            raise RuntimeError("Database not connected")
+
+        rows = await self._fetch("user_mention_history", author_handle, limit)
+        return format_user_mention_history(author_handle, rows)
+
+    async def get_last_reply_times(self, author_handles: list[str]) -> dict[str, datetime]:
+        """
+        Get when we last replied to each of these users, in one query.
+
+        Args:
+            author_handles: Twitter handles (any case).
+
+        Returns:
+            Dict of lowercase handle -> last reply time (users never replied to are absent).
+        """
+        if not self.pool:
+            raise RuntimeError("Database not connected")
+
+        rows = await self._fetch("last_reply_times", [h.lower() for h in author_handles])
+        return {row["author_handle_lower"]: row["last_reply_at"] for row in rows}
+
+    async def get_recent_mentions_formatted(self, limit: int = 15) -> str:
+        """
+        Get recent mentions formatted for LLM context.
+
+        Args:
+            limit: Maximum number of mentions to retrieve.
+
+        Returns:
+            Formatted string with recent mentions and replies.
+        """
+        if not self.pool:
+            raise RuntimeError("Database not connected")
+
+        rows = await self._fetch("recent_mention_replies", limit)
+        return format_recent_mention_replies(rows)
+
+    async def get_state(self, key: str) -> str | None:
+        """
+        Get a value from bot_state table.
+
+        Args:
+            key: State key.
+
+        Returns:
+            Value or None if not found.
+        """
+        if not self.pool:
+            raise RuntimeError("Database not connected")
+
+        row = await self._fetchrow("get_state", key)
+        return row["value"] if row else None
+
+    async def set_state(self, key: str, value: str) -> None:
+        """
+        Set a value in bot_state table.
+
+        Args:
+            key: State key.
+            value: Value to store.
+        """
+        if not self.pool:
+            raise RuntimeError("Database not connected")
+
+        await self._execute("set_state", key, value)
+        logger.info(f"Set state {key} = {value}")
+
+    async def mention_exists(self, tweet_id: str, include_pending: bool = False) -> bool:
+        """
+        Check if a mention has already been processed.
+
+        Args:
+            tweet_id: Tweet ID to check.
+            include_pending: If False, pending mentions are not counted as "existing".
+
+        Returns:
+            True if mention exists in database (and is processed if include_pending=False).
+        """
+        if not self.pool:
+            raise RuntimeError("Database not connected")
+
+        if include_pending:
+            row = await self._fetchrow("mention_exists_any", tweet_id)
+        else:
+            row = await self._fetchrow("mention_exists_processed", tweet_id)
+        return row is not None
+
+    async def get_pending_mention(self, tweet_id: str) -> dict | None:
+        """
+        Get a pending mention by tweet_id.
+
+        Returns:
+            Dict with mention data or None.
+        """
+        if not self.pool:
+            raise RuntimeError("Database not connected")
+
+        row = await self._fetchrow("pending_mention", tweet_id)
+        if row:
+            return {"author": row["author_handle"], "text": row["author_text"]}
+        return None
+
+    async def update_mention(
+        self,
+        tweet_id: str,
+        our_reply: str,
+        action: str = "agent_replied",
+        tools_used: str | None = None
+    ) -> None:
+        """
+        Update a pending mention with our reply.
+
+        Args:
+            tweet_id: Tweet ID to update.
+            our_reply: Our reply text.
+            action: New action status.
+            tools_used: Comma-separated list of tools used.
+        """
+        if not self.pool:
+            raise RuntimeError("Database not connected")
+
+        await self._execute("update_mention", tweet_id, our_reply, action, tools_used)
+        logger.info(f"Updated mention {tweet_id} with action '{action}', tools: {tools_used}")
+
+    # ==================== Metrics Methods ====================
+
+    async def ping(self) -> bool:
+        """
+        Check database connection health.
+
+        Returns:
+            True if database is reachable.
+        """
+        if not self.pool:
+            return False
+
+        try:
+            await self._fetchval("ping")
+            return True
+        except Exception as e:
+            logger.error(f"Database ping failed: {e}")
+            return False
+
+    async def count_posts(self) -> int:
+        """Get total number of posts."""
+        if not self.pool:
+            return 0
+
+        return await self._fetchval("count_posts")
+
+    async def count_posts_today(self) -> int:
+        """Get number of posts created today."""
+        if not self.pool:
+            return 0
+
+        return await self._fetchval("count_posts_today")
+
+    async def count_mentions(self) -> int:
+        """Get total number of processed mentions."""
+        if not self.pool:
+            return 0
+
+        return await self._fetchval("count_mentions")
+
+    async def count_mentions_today(self) -> int:
+        """Get number of mentions processed today."""
+        if not self.pool:
+            return 0
+
+        return await self._fetchval("count_mentions_today")
+
+    async def get_last_post_time(self) -> str | None:
+        """Get timestamp of the last post."""
+        if not self.pool:
+            return None
+
+        row = await self._fetchrow("last_post_time")
+        if row:
+            return row["created_at"].isoformat()
+        return None
+
+    async def get_last_mention_time(self) -> str | None:
+        """Get timestamp of the last processed mention."""
+        if not self.pool:
+            return None
+
+        row = await self._fetchrow("last_mention_time")
+        if row:
+            return row["created_at"].isoformat()
+        return None
+
+    async def get_metrics_snapshot(self) -> dict[str, Any]:
+        """Get all /metrics counts in one statement."""
+        if not self.pool:
+            return {}
+
+        row = await self._fetchrow("metrics_snapshot")
+        snapshot = dict(row)
+        for key in ("last_post_at", "last_mention_at"):
+            snapshot[key] = snapshot[key].isoformat() if snapshot[key] else None
+        return snapshot
+
+    # ==================== User profiles ====================
+
+    async def get_user_profiles(self, usernames: list[str], max_age_seconds: float) -> list[dict[str, Any]]:
+        """
+        Get cached profiles that are still fresh.
+
+        Args:
+            usernames: Handles to look up (any case).
+            max_age_seconds: Ignore rows fetched longer ago than this.
+
+        Returns:
+            Profile dicts for the handles found.
+        """
+        if not self.pool:
+            raise RuntimeError("Database not connected")
+
+        rows = await self._fetch("user_profiles_fresh", [u.lower() for u in usernames], float(max_age_seconds))
+        return [{"id": row["user_id"], **{k: row[k] for k in PROFILE_FIELDS}} for row in rows]
+
+    async def save_user_profiles(self, profiles: list[dict[str, Any]]) -> None:
+        """
+        Upsert profiles in one statement.
+
+        Args:
+            profiles: Profile dicts as returned by TwitterClient.
+        """
+        if not self.pool or not profiles:
+            return
+
+        await self._execute(
+            "save_user_profiles",
+            [p.get("id") for p in profiles],
+            *([p[k] for p in profiles] for k in PROFILE_FIELDS)
+        )
+
+    # ==================== Conversation tweets ====================
+
+    async def get_conversation_tweets(self, conversation_ids: list[str]) -> list[dict[str, Any]]:
+        """
+        Get every stored tweet of the given conversations.
+
+        Args:
+            conversation_ids: Conversation (root tweet) IDs.
+
+        Returns:
+            Tweet dicts with TWEET_FIELDS keys.
+        """
+        if not self.pool:
+            raise RuntimeError("Database not connected")
+
+        rows = await self._fetch("conversation_tweets", conversation_ids)
+        return [dict(row) for row in rows]
+
+    async def save_conversation_tweets(self, tweets: list[dict[str, Any]]) -> None:
+        """
+        Insert tweets in one statement, skipping ones already stored.
+
+        Args:
+            tweets: Tweet dicts with TWEET_FIELDS keys.
+        """
+        if not self.pool or not tweets:
+            return
+
+        await self._execute(
+            "save_conversation_tweets",
+            *([t[k] for t in tweets] for k in TWEET_FIELDS)
+        )
+
+    # ==================== Agent checkpoints ====================
+
+    async def get_checkpoint(self, agent: str, max_age_seconds: float) -> dict[str, Any] | None:
+        """
+        Get the checkpoint of an agent if it is still fresh.
+
+        Args:
+            agent: Agent name.
+            max_age_seconds: Ignore checkpoints saved longer ago than this.
+
+        Returns:
+            Dict with cycle_id, iteration, state (compressed bytes) and
+            updated_at, or None.
+        """
+        if not self.pool:
+            raise RuntimeError("Database not connected")
+
+        row = await self._fetchrow("get_checkpoint", agent, float(max_age_seconds))
+        return dict(row) if row else None
+
+    async def save_checkpoint(self, agent: str, cycle_id: str, iteration: int, state: bytes) -> None:
+        """
+        Upsert the checkpoint of an agent.
+
+        Args:
+            agent: Agent name.
+            cycle_id: Trace id of the cycle the state belongs to.
+            iteration: Tool loop iterations done.
+            state: Compressed cycle state.
+        """
+        if not self.pool:
+            raise RuntimeError("Database not connected")
+
+        await self._execute("save_checkpoint", agent, cycle_id, iteration, state)
+
+    async def delete_checkpoint(self, agent: str) -> None:
+        """
+        Delete the checkpoint of an agent.
+
+        Args:
+            agent: Agent name.
+        """
+        if not self.pool:
+            raise RuntimeError("Database not connected")
+
+        await self._execute("delete_checkpoint", agent)
+
+    # ==================== Action intents ====================
+
+    async def claim_intent(self, intent: dict[str, Any]) -> bool:
+        """
+        Claim an action before it is sent to Twitter.
+
+        Args:
+            intent: Dict with INTENT_FIELDS keys.
+
+        Returns:
+            True if claimed (new, or a failed intent retried), False if the
+            intent is pending or already posted.
+        """
+        if not self.pool:
+            raise RuntimeError("Database not connected")
+
+        claimed = await self._fetchval("claim_intent", *(intent[k] for k in INTENT_FIELDS))
+        return claimed is not None
+
+    async def get_intent(self, intent_key: str) -> dict[str, Any] | None:
+        """
+        Get an intent by key.
+
+        Args:
+            intent_key: Intent hash.
+
+        Returns:
+            Intent dict or None.
+        """
+        if not self.pool:
+            raise RuntimeError("Database not connected")
+
+        row = await self._fetchrow("get_intent", intent_key)
+        return dict(row) if row else None
+
+    async def update_intent(
+        self,
+        intent_key: str,
+        status: str,
+        tweet_id: str | None = None,
+        include_picture: bool | None = None
+    ) -> None:
+        """
+        Move an intent to a new status.
+
+        Args:
+            intent_key: Intent hash.
+            status: New status.
+            tweet_id: Created tweet, if known (kept when None).
+            include_picture: Whether an image was attached (kept when None).
+        """
+        if not self.pool:
+            raise RuntimeError("Database not connected")
+
+        await self._execute("update_intent", intent_key, status, tweet_id, include_picture)
+
+    async def get_open_intents(self) -> list[dict[str, Any]]:
+        """
+        Get intents that have not settled (pending or posted).
+
+        Returns:
+            Intent dicts, oldest first.
+        """
+        if not self.pool:
+            raise RuntimeError("Database not connected")
+
+        rows = await self._fetch("open_intents")
+        return [dict(row) for row in rows]
+
+    # ==================== Unified Agent Methods ====================
+
+    async def get_recent_actions_formatted(self, limit: int = 20) -> str:
+        """
+        Get recent actions (posts + replies) formatted for LLM context.
+
+        Args:
+            limit: Maximum number of actions to retrieve.
+
+        Returns:
+            Formatted string with numbered actions.
+        """
+        if not self.pool:
+            raise RuntimeError("Database not connected")
+
+        rows = await self._fetch("recent_actions", limit)
+        return format_recent_actions(rows)
+
+    async def save_action(
+        self,
+        action_type: str,
+        text: str,
+        tweet_id: str | None = None,
+        include_picture: bool = False,
+        reply_to_tweet_id: str | None = None,
+        reply_to_author: str | None = None
+    ) -> int:
+        """
+        Save an action (post or reply) to database.
+
+        Args:
+            action_type: 'post' or 'reply'
+            text: The text content
+            tweet_id: Our tweet ID
+            include_picture: Whether action includes an image
+            reply_to_tweet_id: Original tweet ID (for replies)
+            reply_to_author: Original author handle (for replies)
+
+        Returns:
+            Database ID of the created action.
+        """
+        if not self.pool:
+            raise RuntimeError("Database not connected")
+
+        row = await self._fetchrow(
+            "save_action",
+            action_type, text, tweet_id, include_picture,
+            reply_to_tweet_id, reply_to_author
+        )
+        logger.info(f"Saved action {row['id']}: {action_type} (pic={include_picture})")
+        return row["id"]
+
+    async def get_user_actions_history(self, author_handle: str, limit: int = 10) -> str:
+        """
+        Get recent reply history with a specific user from actions table.
+
+        Args:
+            author_handle: Twitter handle of the user.
+            limit: Maximum number of interactions to retrieve.
+
+        Returns:
+            Formatted string with conversation history.
+        """
+        if not self.pool:
+            raise RuntimeError("Database not connected")
+
+        rows = await self._fetch("user_actions_history", author_handle, limit)
+        return format_user_actions_history(rows)
+
+    async def count_actions_today(self, action_type: str | None = None) -> int:
+        """
+        Get number of actions created today.
+
+        Args:
+            action_type: Optional filter by type ('post' or 'reply')
+
+        Returns:
+            Count of actions today.
+        """
+        if not self.pool:
+            return 0
+
+        if action_type:
+            return await self._fetchval("count_actions_today_by_type", action_type)
+        return await self._fetchval("count_actions_today")
@@ -0,0 +1,664 @@
+"""
+SQLite storage backend using aiosqlite.
+
+Same tables and semantics as the PostgreSQL backend, in a single local
+file (or :memory:). Meant for local runs, CI and benchmarks that need
+persistence without a Postgres server.
+
+Requires the optional aiosqlite package.
+"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Any
+
+from services.storage.base import (
+    INTENT_FIELDS,
+    PROFILE_FIELDS,
+    TWEET_FIELDS,
+    StorageBackend,
+    format_recent_actions,
+    format_recent_mention_replies,
+    format_recent_posts,
+    format_user_actions_history,
+    format_user_mention_history,
+    today_start,
+    utcnow
+)
+
+try:
+    import aiosqlite
+except ImportError:  # pragma: no cover - optional dependency
+    aiosqlite = None
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS posts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    text TEXT NOT NULL,
+    tweet_id TEXT,
+    include_picture INTEGER DEFAULT 0,
+    created_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS mentions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    tweet_id TEXT,
+    author_handle TEXT,
+    author_handle_lower TEXT,
+    author_text TEXT,
+    our_reply TEXT,
+    action TEXT,
+    tools_used TEXT,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_mentions_tweet_id ON mentions(tweet_id);
+CREATE INDEX IF NOT EXISTS idx_mentions_handle_replied
+    ON mentions(author_handle_lower, created_at DESC) WHERE our_reply IS NOT NULL;
+
+CREATE TABLE IF NOT EXISTS bot_state (
+    key TEXT PRIMARY KEY,
+    value TEXT,
+    updated_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS actions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    action_type TEXT NOT NULL,
+    text TEXT NOT NULL,
+    tweet_id TEXT,
+    include_picture INTEGER DEFAULT 0,
+    reply_to_tweet_id TEXT,
+    reply_to_author TEXT,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_actions_created_at ON actions(created_at DESC);
+
+CREATE TABLE IF NOT EXISTS user_profiles (
+    username_lower TEXT PRIMARY KEY,
+    user_id TEXT,
+    username TEXT NOT NULL,
+    bio TEXT,
+    followers INTEGER DEFAULT 0,
+    following INTEGER DEFAULT 0,
+    tweets INTEGER DEFAULT 0,
+    location TEXT,
+    fetched_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS conversation_tweets (
+    tweet_id TEXT PRIMARY KEY,
+    conversation_id TEXT NOT NULL,
+    author TEXT NOT NULL,
+    text TEXT NOT NULL,
+    in_reply_to_tweet_id TEXT,
+    fetched_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_conversation_tweets_conversation ON conversation_tweets(conversation_id);
+
+CREATE TABLE IF NOT EXISTS agent_checkpoints (
+    agent TEXT PRIMARY KEY,
+    cycle_id TEXT NOT NULL,
+    iteration INTEGER NOT NULL DEFAULT 0,
+    state BLOB NOT NULL,
+    updated_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS action_intents (
+    intent_key TEXT PRIMARY KEY,
+    cycle_id TEXT,
+    action_type TEXT NOT NULL,
+    text TEXT NOT NULL,
+    reply_to_tweet_id TEXT,
+    reply_to_author TEXT,
+    include_picture INTEGER DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'pending',
+    tweet_id TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+"""
+
+
+def _ts(value: datetime) -> str:
+    """Serialize a timestamp so text ordering matches time ordering."""
+    return value.isoformat(sep=" ", timespec="microseconds")
+
+
+class SQLiteBackend(StorageBackend):
+    """Storage backend backed by a SQLite database file."""
+
+    name = "sqlite"
+
+    def __init__(self, url: str):
+        """
+        Initialize SQLite backend.
+
+        Args:
+            url: sqlite:///path/to/file.db or sqlite://:memory:
+        """
+        self.url = url
+        # sqlite:///relative.db, sqlite:////abs/path.db, sqlite://:memory:
+        if url.startswith("sqlite:///"):
+            self.path = url[len("sqlite:///"):]
+        else:
+            self.path = url[len("sqlite://"):]
+        self.conn: "aiosqlite.Connection | None" = None
+
+    async def connect(self) -> None:
+        """Open the database file and create tables if needed."""
+        if aiosqlite is None:
+            raise RuntimeError("sqlite:// DATABASE_URL requires the aiosqlite package (pip install aiosqlite)")
+
+        logger.info(f"Opening SQLite database {self.path}...")
+        self.conn = await aiosqlite.connect(self.path)
+        self.conn.row_factory = aiosqlite.Row
+        await self.conn.execute("PRAGMA journal_mode=WAL")
+        await self.conn.executescript(SCHEMA)
+        await self.conn.commit()
+        logger.info("SQLite database ready")
+
+    async def close(self) -> None:
+        """Close the database file."""
+        if self.conn:
+            await self.conn.close()
+            self.conn = None
+            logger.info("Database connection closed")
+
+    async def ping(self) -> bool:
+        if not self.conn:
+            return False
+        try:
+            await self._fetchval("SELECT 1")
+            return True
+        except Exception as e:
+            logger.error(f"Database ping failed: {e}")
+            return False
+
+    # ==================== Query Helpers ====================
+
+    def _require_conn(self) -> "aiosqlite.Connection":
+        if not self.conn:
+            raise RuntimeError("Database not connected")
+        return self.conn
+
+    async def _fetch(self, sql: str, *args) -> list[Any]:
+        async with self._require_conn().execute(sql, args) as cursor:
+            return await cursor.fetchall()
+
+    async def _fetchrow(self, sql: str, *args) -> Any:
+        async with self._require_conn().execute(sql, args) as cursor:
+            return await cursor.fetchone()
+
+    async def _fetchval(self, sql: str, *args) -> Any:
+        row = await self._fetchrow(sql, *args)
+        return row[0] if row else None
+
+    async def _insert(self, sql: str, *args) -> int:
+        conn = self._require_conn()
+        cursor = await conn.execute(sql, args)
+        await conn.commit()
+        return cursor.lastrowid
+
+    async def _execute(self, sql: str, *args) -> None:
+        conn = self._require_conn()
+        await conn.execute(sql, args)
+        await conn.commit()
+
+    # ==================== Posts ====================
+
+    async def get_recent_posts_formatted(self, limit: int = 50) -> str:
+        rows = await self._fetch(
+            "SELECT text, include_picture FROM posts ORDER BY created_at DESC, id DESC LIMIT ?",
+            limit
+        )
+        total = await self.count_posts()
+        return format_recent_posts(list(reversed(rows)), total)
+
+    async def get_recent_posts(self, limit: int = 10) -> list[dict[str, Any]]:
+        rows = await self._fetch(
+            """
+            SELECT id, text, tweet_id, include_picture, created_at
+            FROM posts ORDER BY created_at DESC, id DESC LIMIT ?
+            """,
+            limit
+        )
+        return [
+            {
+                **dict(row),
+                "include_picture": bool(row["include_picture"]),
+                "created_at": datetime.fromisoformat(row["created_at"])
+            }
+            for row in rows
+        ]
+
+    async def save_post(self, text: str, tweet_id: str, include_picture: bool) -> int:
+        post_id = await self._insert(
+            "INSERT INTO posts (text, tweet_id, include_picture, created_at) VALUES (?, ?, ?, ?)",
+            text, tweet_id, int(include_picture), _ts(utcnow())
+        )
+        logger.info(f"Saved post {post_id} with tweet_id {tweet_id}, include_picture={include_picture}")
+        return post_id
+
+    # ==================== Mentions ====================
+
+    async def save_mention(
+        self,
+        tweet_id: str,
+        author_handle: str,
+        author_text: str,
+        our_reply: str | None,
+        action: str,
+        tools_used: str | None = None
+    ) -> int | None:
+        # One statement, so the existence check and insert can't interleave
+        conn = self._require_conn()
+        async with conn.execute(
+            """
+            INSERT INTO mentions (
+                tweet_id, author_handle, author_handle_lower,
+                author_text, our_reply, action, tools_used, created_at
+            )
+            SELECT ?, ?, LOWER(?), ?, ?, ?, ?, ?
+            WHERE NOT EXISTS (SELECT 1 FROM mentions WHERE tweet_id = ?)
+            RETURNING id
+            """,
+            (tweet_id, author_handle, author_handle, author_text,
+             our_reply, action, tools_used, _ts(utcnow()), tweet_id)
+        ) as cursor:
+            row = await cursor.fetchone()
+        await conn.commit()
+        if row is None:
+            logger.info(f"Mention {tweet_id} already saved, skipping")
+            return None
+        mention_id = row["id"]
+        logger.info(f"Saved mention {mention_id} with action '{action}', tools: {tools_used}")
+        return mention_id
+
+    async def get_user_mention_history(self, author_handle: str, limit: int = 5) -> str:
+        rows = await self._fetch(
+            """
+            SELECT author_text, our_reply, created_at
+            FROM mentions
+            WHERE author_handle_lower = LOWER(?) AND our_reply IS NOT NULL
+            ORDER BY created_at DESC, id DESC
+            LIMIT ?
+            """,
+            author_handle, limit
+        )
+        return format_user_mention_history(author_handle, rows)
+
+    async def get_last_reply_times(self, author_handles: list[str]) -> dict[str, datetime]:
+        if not author_handles:
+            return {}
+        placeholders = ",".join("?" * len(author_handles))
+        rows = await self._fetch(
+            f"""
+            SELECT author_handle_lower, MAX(created_at) AS last_reply_at
+            FROM mentions
+            WHERE author_handle_lower IN ({placeholders}) AND our_reply IS NOT NULL
+            GROUP BY author_handle_lower
+            """,
+            *[h.lower() for h in author_handles]
+        )
+        return {row["author_handle_lower"]: datetime.fromisoformat(row["last_reply_at"]) for row in rows}
+
+    async def get_recent_mentions_formatted(self, limit: int = 15) -> str:
+        rows = await self._fetch(
+            """
+            SELECT author_handle, author_text, our_reply, action
+            FROM mentions
+            WHERE our_reply IS NOT NULL
+            ORDER BY created_at DESC, id DESC
+            LIMIT ?
+            """,
+            limit
+        )
+        return format_recent_mention_replies(rows)
+
+    async def get_state(self, key: str) -> str | None:
+        return await self._fetchval("SELECT value FROM bot_state WHERE key = ?", key)
+
+    async def set_state(self, key: str, value: str) -> None:
+        await self._execute(
+            """
+            INSERT INTO bot_state (key, value, updated_at) VALUES (?, ?, ?)
+            ON CONFLICT (key) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at
+            """,
+            key, value, _ts(utcnow())
+        )
+        logger.info(f"Set state {key} = {value}")
+
+    async def mention_exists(self, tweet_id: str, include_pending: bool = False) -> bool:
+        if include_pending:
+            row = await self._fetchrow("SELECT 1 FROM mentions WHERE tweet_id = ?", tweet_id)
+        else:
+            row = await self._fetchrow(
+                "SELECT 1 FROM mentions WHERE tweet_id = ? AND action != 'pending'",
+                tweet_id
+            )
+        return row is not None
+
+    async def get_pending_mention(self, tweet_id: str) -> dict | None:
+        row = await self._fetchrow(
+            "SELECT author_handle, author_text FROM mentions WHERE tweet_id = ?",
+            tweet_id
+        )
+        if row:
+            return {"author": row["author_handle"], "text": row["author_text"]}
+        return None
+
+    async def update_mention(
+        self,
+        tweet_id: str,
+        our_reply: str,
+        action: str = "agent_replied",
+        tools_used: str | None = None
+    ) -> None:
+        await self._execute(
+            "UPDATE mentions SET our_reply = ?, action = ?, tools_used = ? WHERE tweet_id = ?",
+            our_reply, action, tools_used, tweet_id
+        )
+        logger.info(f"Updated mention {tweet_id} with action '{action}', tools: {tools_used}")
+
+    # ==================== Metrics ====================
+
+    async def count_posts(self) -> int:
+        if not self.conn:
+            return 0
+        return await self._fetchval("SELECT COUNT(*) FROM posts")
+
+    async def count_posts_today(self) -> int:
+        if not self.conn:
+            return 0
+        return await self._fetchval("SELECT COUNT(*) FROM posts WHERE created_at >= ?", _ts(today_start()))
+
+    async def count_mentions(self) -> int:
+        if not self.conn:
+            return 0
+        return await self._fetchval("SELECT COUNT(*) FROM mentions")
+
+    async def count_mentions_today(self) -> int:
+        if not self.conn:
+            return 0
+        return await self._fetchval("SELECT COUNT(*) FROM mentions WHERE created_at >= ?", _ts(today_start()))
+
+    async def get_last_post_time(self) -> str | None:
+        if not self.conn:
+            return None
+        value = await self._fetchval("SELECT MAX(created_at) FROM posts")
+        return datetime.fromisoformat(value).isoformat() if value else None
+
+    async def get_last_mention_time(self) -> str | None:
+        if not self.conn:
+            return None
+        value = await self._fetchval("SELECT MAX(created_at) FROM mentions")
+        return datetime.fromisoformat(value).isoformat() if value else None
+
+    async def get_metrics_snapshot(self) -> dict[str, Any]:
+        if not self.conn:
+            return {}
+        today = _ts(today_start())
+        row = await self._fetchrow(
+            """
+            SELECT
+                (SELECT COUNT(*) FROM posts) AS posts_total,
+                (SELECT COUNT(*) FROM posts WHERE created_at >= ?) AS posts_today,
+                (SELECT COUNT(*) FROM mentions) AS mentions_total,
+                (SELECT COUNT(*) FROM mentions WHERE created_at >= ?) AS mentions_today,
+                (SELECT COUNT(*) FROM actions WHERE created_at >= ?) AS actions_today,
+                (SELECT MAX(created_at) FROM posts) AS last_post_at,
+                (SELECT MAX(created_at) FROM mentions) AS last_mention_at
+            """,
+            today, today, today
+        )
+        snapshot = dict(row)
+        for key in ("last_post_at", "last_mention_at"):
+            value = snapshot[key]
+            snapshot[key] = datetime.fromisoformat(value).isoformat() if value else None
+        return snapshot
+
+    # ==================== User profiles ====================
+
+    async def get_user_profiles(self, usernames: list[str], max_age_seconds: float) -> list[dict[str, Any]]:
+        if not usernames:
+            return []
+        placeholders = ",".join("?" * len(usernames))
+        rows = await self._fetch(
+            f"""
+            SELECT user_id, username, bio, followers, following, tweets, location
+            FROM user_profiles
+            WHERE username_lower IN ({placeholders}) AND fetched_at >= ?
+            """,
+            *[u.lower() for u in usernames], _ts(utcnow() - timedelta(seconds=max_age_seconds))
+        )
+        return [{"id": row["user_id"], **{k: row[k] for k in PROFILE_FIELDS}} for row in rows]
+
+    async def save_user_profiles(self, profiles: list[dict[str, Any]]) -> None:
+        if not profiles:
+            return
+        conn = self._require_conn()
+        now = _ts(utcnow())
+        await conn.executemany(
+            """
+            INSERT INTO user_profiles (
+                username_lower, user_id, username, bio,
+                followers, following, tweets, location, fetched_at
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (username_lower) DO UPDATE SET
+                user_id = excluded.user_id,
+                username = excluded.username,
+                bio = excluded.bio,
+                followers = excluded.followers,
+                following = excluded.following,
+                tweets = excluded.tweets,
+                location = excluded.location,
+                fetched_at = excluded.fetched_at
+            """,
+            [(p["username"].lower(), p.get("id"), *(p[k] for k in PROFILE_FIELDS), now) for p in profiles]
+        )
+        await conn.commit()
+
+    # ==================== Conversation tweets ====================
+
+    async def get_conversation_tweets(self, conversation_ids: list[str]) -> list[dict[str, Any]]:
+        if not conversation_ids:
+            return []
+        placeholders = ",".join("?" * len(conversation_ids))
+        rows = await self._fetch(
+            f"""
+            SELECT tweet_id, conversation_id, author, text, in_reply_to_tweet_id
+            FROM conversation_tweets
+            WHERE conversation_id IN ({placeholders})
+            """,
+            *conversation_ids
+        )
+        return [dict(row) for row in rows]
+
+    async def save_conversation_tweets(self, tweets: list[dict[str, Any]]) -> None:
+        if not tweets:
+            return
+        conn = self._require_conn()
+        now = _ts(utcnow())
+        await conn.executemany(
+            """
+            INSERT INTO conversation_tweets (
+                tweet_id, conversation_id, author, text, in_reply_to_tweet_id, fetched_at
+            )
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT (tweet_id) DO NOTHING
+            """,
+            [(*(t[k] for k in TWEET_FIELDS), now) for t in tweets]
+        )
+        await conn.commit()
+
+    # ==================== Agent checkpoints ====================
+
+    async def get_checkpoint(self, agent: str, max_age_seconds: float) -> dict[str, Any] | None:
+        row = await self._fetchrow(
+            """
+            SELECT cycle_id, iteration, state, updated_at
+            FROM agent_checkpoints
+            WHERE agent = ? AND updated_at >= ?
+            """,
+            agent, _ts(utcnow() - timedelta(seconds=max_age_seconds))
+        )
+        if not row:
+            return None
+        return {**dict(row), "updated_at": datetime.fromisoformat(row["updated_at"])}
+
+    async def save_checkpoint(self, agent: str, cycle_id: str, iteration: int, state: bytes) -> None:
+        await self._execute(
+            """
+            INSERT INTO agent_checkpoints (agent, cycle_id, iteration, state, updated_at)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (agent) DO UPDATE SET
+                cycle_id = excluded.cycle_id,
+                iteration = excluded.iteration,
+                state = excluded.state,
+                updated_at = excluded.updated_at
+            """,
+            agent, cycle_id, iteration, state, _ts(utcnow())
+        )
+
+    async def delete_checkpoint(self, agent: str) -> None:
+        await self._execute("DELETE FROM agent_checkpoints WHERE agent = ?", agent)
+
+    # ==================== Action intents ====================
+
+    # Same columns as the postgres intent statements
+    _INTENT_COLUMNS = """
+        intent_key, cycle_id, action_type, text, reply_to_tweet_id, reply_to_author,
+        include_picture, status, tweet_id, created_at, updated_at
+    """
+
+    def _intent(self, row: Any) -> dict[str, Any]:
+        intent = dict(row)
+        intent["include_picture"] = bool(intent["include_picture"])
+        intent["created_at"] = datetime.fromisoformat(intent["created_at"])
+        intent["updated_at"] = datetime.fromisoformat(intent["updated_at"])
+        return intent
+
+    async def claim_intent(self, intent: dict[str, Any]) -> bool:
+        conn = self._require_conn()
+        now = _ts(utcnow())
+        async with conn.execute(
+            """
+            INSERT INTO action_intents (
+                intent_key, cycle_id, action_type, text, reply_to_tweet_id, reply_to_author,
+                created_at, updated_at
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (intent_key) DO UPDATE SET
+                status = 'pending',
+                tweet_id = NULL,
+                updated_at = excluded.updated_at
+            WHERE action_intents.status = 'failed'
+            RETURNING intent_key
+            """,
+            (*(intent[k] for k in INTENT_FIELDS), now, now)
+        ) as cursor:
+            claimed = await cursor.fetchone()
+        await conn.commit()
+        return claimed is not None
+
+    async def get_intent(self, intent_key: str) -> dict[str, Any] | None:
+        row = await self._fetchrow(
+            f"SELECT {self._INTENT_COLUMNS} FROM action_intents WHERE intent_key = ?",
+            intent_key
+        )
+        return self._intent(row) if row else None
+
+    async def update_intent(
+        self,
+        intent_key: str,
+        status: str,
+        tweet_id: str | None = None,
+        include_picture: bool | None = None
+    ) -> None:
+        await self._execute(
+            """
+            UPDATE action_intents
+            SET status = ?,
+                tweet_id = COALESCE(?, tweet_id),
+                include_picture = COALESCE(?, include_picture),
+                updated_at = ?
+            WHERE intent_key = ?
+            """,
+            status, tweet_id, include_picture, _ts(utcnow()), intent_key
+        )
+
+    async def get_open_intents(self) -> list[dict[str, Any]]:
+        rows = await self._fetch(
+            f"""
+            SELECT {self._INTENT_COLUMNS} FROM action_intents
+            WHERE status IN ('pending', 'posted')
+            ORDER BY created_at ASC
+            """
+        )
+        return [self._intent(row) for row in rows]
+
+    # ==================== Actions ====================
+
+    async def get_recent_actions_formatted(self, limit: int = 20) -> str:
+        rows = await self._fetch(
+            """
+            SELECT action_type, text, include_picture, reply_to_author, created_at
+            FROM actions
+            ORDER BY created_at DESC, id DESC
+            LIMIT ?
+            """,
+            limit
+        )
+        return format_recent_actions(rows)
+
+    async def save_action(
+        self,
+        action_type: str,
+        text: str,
+        tweet_id: str | None = None,
+        include_picture: bool = False,
+        reply_to_tweet_id: str | None = None,
+        reply_to_author: str | None = None
+    ) -> int:
+        action_id = await self._insert(
+            """
+            INSERT INTO actions (
+                action_type, text, tweet_id, include_picture,
+                reply_to_tweet_id, reply_to_author, created_at
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            action_type, text, tweet_id, int(include_picture),
+            reply_to_tweet_id, reply_to_author, _ts(utcnow())
+        )
+        logger.info(f"Saved action {action_id}: {action_type} (pic={include_picture})")
+        return action_id
+
+    async def get_user_actions_history(self, author_handle: str, limit: int = 10) -> str:
+        rows = await self._fetch(
+            """
+            SELECT text, reply_to_author, created_at
+            FROM actions
+            WHERE LOWER(reply_to_author) = LOWER(?) AND action_type = 'reply'
+            ORDER BY created_at DESC, id DESC
+            LIMIT ?
+            """,
+            author_handle, limit
+        )
+        return format_user_actions_history(rows)
+
+    async def count_actions_today(self, action_type: str | None = None) -> int:
+        if not self.conn:
+            return 0
+        if action_type:
+            return await self._fetchval(
+                "SELECT COUNT(*) FROM actions WHERE created_at >= ? AND action_type = ?",
+                _ts(today_start()), action_type
+            )
+        return await self._fetchval(
+            "SELECT COUNT(*) FROM actions WHERE created_at >= ?",
+            _ts(today_start())
+        )
@@ -0,0 +1,416 @@
+"""
+Structured output parsing, validation and repair.
+
+Models regularly wrap JSON in code fences, add prose after it, emit
+trailing commas, stringify booleans or drop a required field. Instead of
+failing the cycle (or paying for another LLM call), replies go through:
+
+1. extract_json   - strip fences, decode the first JSON value, tolerate
+                    trailing text, trailing commas and output truncated
+                    between values (never inside a string)
+2. compile_schema - validator + repairer compiled once per schema for the
+                    subset used by config/schemas.py (type, properties,
+                    required, additionalProperties, items, enum)
+3. repair         - coerce scalar types, match enums case-insensitively,
+                    drop unknown keys, wrap lone items into arrays and fill
+                    missing required containers/numbers with neutral defaults
+
+Only when this still fails does LLMClient re-ask the model, quoting the
+exact validation errors.
+
+For streamed replies, IncrementalJSONParser emits each top-level field of
+the object as soon as its value is complete, before the stream ends.
+"""
+
+import functools
+import json
+import logging
+import re
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+_FENCE_RE = re.compile(r"```(?:json|JSON)?\s*(.*?)```", re.DOTALL)
+_TRAILING_COMMA_RE = re.compile(r",\s*([}\]])")
+_SMART_QUOTES = str.maketrans({"“": '"', "”": '"', "‘": "'", "’": "'"})
+_decoder = json.JSONDecoder(strict=False)
+
+
+class StructuredOutputError(ValueError):
+    """Model output could not be turned into schema-valid JSON."""
+
+    def __init__(self, message: str, content: str, errors: list[str]):
+        super().__init__(message)
+        self.content = content
+        self.errors = errors
+
+
+# ==================== Extraction ====================
+
+def _close_truncated(text: str) -> str | None:
+    """
+    Close brackets left open by a max_tokens cut-off.
+
+    Returns None when the cut-off is inside a string: closing it would turn
+    a half-written reply into a valid-looking value.
+    """
+    stack = []
+    in_string = False
+    escaped = False
+    for ch in text:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in "{[":
+            stack.append("}" if ch == "{" else "]")
+        elif ch in "}]" and stack:
+            stack.pop()
+
+    if in_string:
+        return None
+    closed = re.sub(r"[,:]\s*$", "", text.rstrip())
+    return closed + "".join(reversed(stack))
+
+
+def extract_json(content: str) -> tuple[Any, list[str]]:
+    """
+    Pull the first JSON object/array out of a model reply.
+
+    Args:
+        content: Raw message content.
+
+    Returns:
+        (value, repairs) where repairs lists the textual fixes applied.
+
+    Raises:
+        ValueError: No JSON value could be recovered.
+    """
+    repairs = []
+    text = content.strip()
+
+    fenced = _FENCE_RE.search(text)
+    if fenced:
+        text = fenced.group(1).strip()
+        repairs.append("stripped_code_fence")
+
+    try:
+        return json.loads(text), repairs
+    except ValueError:
+        pass
+
+    starts = [i for i in (text.find("{"), text.find("[")) if i >= 0]
+    if not starts:
+        raise ValueError("no JSON object in model output")
+    text = text[min(starts):]
+
+    candidates = [
+        (text, None),
+        (_TRAILING_COMMA_RE.sub(r"\1", text.translate(_SMART_QUOTES)), "fixed_syntax"),
+        (_close_truncated(_TRAILING_COMMA_RE.sub(r"\1", text.translate(_SMART_QUOTES))), "closed_truncated")
+    ]
+    for candidate, fix in candidates:
+        if candidate is None:
+            continue
+        try:
+            value, end = _decoder.raw_decode(candidate)
+        except ValueError:
+            continue
+        if fix:
+            repairs.append(fix)
+        if candidate[end:].strip():
+            repairs.append("dropped_trailing_text")
+        return value, repairs
+
+    raise ValueError("unparseable JSON in model output")
+
+
+class IncrementalJSONParser:
+    """
+    Emit top-level fields of a streamed JSON object as soon as they complete.
+
+    Strings, objects and arrays are emitted when they close; numbers and
+    literals when the following ',' or '}' arrives. Text before the first
+    '{' (code fences, prose) is ignored. Values that fail to decode are
+    skipped; the full reply is still parsed with parse_structured at the end.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.fields: dict[str, Any] = {}
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._done = False
+        self._key: str | None = None
+        self._token_start: int | None = None
+        self._value_start: int | None = None
+
+    def _emit(self, end: int, out: list[tuple[str, Any]]) -> None:
+        raw = self.buffer[self._value_start:end].strip()
+        key, self._key, self._value_start = self._key, None, None
+        try:
+            value = _decoder.decode(raw)
+        except ValueError:
+            return
+        self.fields[key] = value
+        out.append((key, value))
+
+    def feed(self, chunk: str) -> list[tuple[str, Any]]:
+        """
+        Add streamed text.
+
+        Args:
+            chunk: Next piece of the model reply.
+
+        Returns:
+            (name, value) pairs completed by this chunk, in order.
+        """
+        out: list[tuple[str, Any]] = []
+        self.buffer += chunk
+
+        while self._pos < len(self.buffer) and not self._done:
+            i = self._pos
+            ch = self.buffer[i]
+            self._pos += 1
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == "\\":
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        if self._key is None:
+                            try:
+                                self._key = _decoder.decode(self.buffer[self._token_start:i + 1])
+                            except ValueError:
+                                self._key = ""
+                        elif self._value_start is not None:
+                            self._emit(i + 1, out)
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                self._token_start = i
+            elif self._depth == 0:
+                if ch == "{":
+                    self._depth = 1
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 1 and self._value_start is not None:
+                    self._emit(i + 1, out)
+                elif self._depth == 0:
+                    if self._value_start is not None:
+                        self._emit(i, out)
+                    self._done = True
+            elif self._depth == 1:
+                if ch == ":" and self._key is not None:
+                    self._value_start = i + 1
+                elif ch == "," and self._value_start is not None:
+                    self._emit(i, out)
+
+        return out
+
+
+# ==================== Validation + repair ====================
+
+# Missing strings/enums carry content (reply text, tool choice) and booleans carry
+# control flow (needs_tools, include_picture), so none of them are ever invented
+_DEFAULTS = {"integer": 0, "number": 0, "array": [], "object": {}}
+_PY_TYPES = {
+    "string": (str,),
+    "boolean": (bool,),
+    "integer": (int,),
+    "number": (int, float),
+    "array": (list,),
+    "object": (dict,),
+    "null": (type(None),)
+}
+
+_MISSING = object()
+
+# node(value, path, errors, repairs) -> repaired value
+_Node = Callable[[Any, str, list[str], list[str]], Any]
+
+
+def _is_type(value: Any, kind: str) -> bool:
+    if kind in ("integer", "number") and isinstance(value, bool):
+        return False
+    return isinstance(value, _PY_TYPES.get(kind, (object,)))
+
+
+def _coerce(value: Any, kind: str) -> Any:
+    """Best-effort scalar coercion; returns the value unchanged when impossible."""
+    if kind == "boolean" and isinstance(value, str) and value.strip().lower() in ("true", "false", "yes", "no", "1", "0"):
+        return value.strip().lower() in ("true", "yes", "1")
+    if kind == "integer" and isinstance(value, (str, float)) and not isinstance(value, bool):
+        try:
+            number = float(value)
+            if number.is_integer():
+                return int(number)
+        except ValueError:
+            pass
+    if kind == "number" and isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            pass
+    if kind == "string" and isinstance(value, (int, float, bool)):
+        return json.dumps(value)
+    if kind == "array" and not isinstance(value, list) and value is not None:
+        return [value]
+    return value
+
+
+def _default(schema: dict[str, Any]) -> Any:
+    """Neutral value for a missing required field, or _MISSING if none is safe."""
+    if "enum" in schema:
+        return _MISSING
+    kind = schema.get("type", "string")
+    kind = kind if isinstance(kind, str) else kind[0]
+    if kind == "object":
+        value = {}
+        for name in schema.get("required", []):
+            value[name] = _default(schema.get("properties", {}).get(name, {}))
+            if value[name] is _MISSING:
+                return _MISSING
+        return value
+    return _DEFAULTS.get(kind, _MISSING)
+
+
+def _compile(schema: dict[str, Any]) -> _Node:
+    kinds = schema.get("type", [])
+    kinds = [kinds] if isinstance(kinds, str) else list(kinds)
+    enum = schema.get("enum")
+    enum_lookup = {str(e).lower(): e for e in enum} if enum else None
+
+    properties = {name: _compile(sub) for name, sub in schema.get("properties", {}).items()}
+    property_schemas = schema.get("properties", {})
+    required = schema.get("required", [])
+    closed = schema.get("additionalProperties") is False
+    items = _compile(schema["items"]) if "items" in schema else None
+
+    def node(value: Any, path: str, errors: list[str], repairs: list[str]) -> Any:
+        if kinds and not any(_is_type(value, k) for k in kinds):
+            coerced = _coerce(value, kinds[0])
+            if any(_is_type(coerced, k) for k in kinds):
+                repairs.append(f"coerced {path} to {kinds[0]}")
+                value = coerced
+            else:
+                errors.append(f"{path}: expected {' or '.join(kinds)}, got {type(value).__name__}")
+                return value
+
+        if enum is not None and value not in enum:
+            match = enum_lookup.get(str(value).strip().lower())
+            if match is not None:
+                repairs.append(f"matched enum {path}")
+                value = match
+            else:
+                errors.append(f"{path}: {value!r} is not one of {enum}")
+
+        if isinstance(value, dict) and (properties or closed or required):
+            fixed = {}
+            for key, item in value.items():
+                if key in properties:
+                    fixed[key] = properties[key](item, f"{path}.{key}", errors, repairs)
+                elif closed:
+                    repairs.append(f"dropped {path}.{key}")
+                else:
+                    fixed[key] = item
+            for key in required:
+                if key in fixed:
+                    continue
+                default = _default(property_schemas.get(key, {}))
+                if default is _MISSING:
+                    errors.append(f"{path}: missing required field '{key}'")
+                else:
+                    fixed[key] = default
+                    repairs.append(f"defaulted {path}.{key}")
+            value = fixed
+
+        if isinstance(value, list) and items is not None:
+            value = [items(item, f"{path}[{i}]", errors, repairs) for i, item in enumerate(value)]
+
+        return value
+
+    return node
+
+
+class CompiledSchema:
+    """Validator + repairer for one JSON schema, built once and reused."""
+
+    def __init__(self, schema: dict[str, Any]):
+        self.schema = schema
+        self._root = _compile(schema)
+
+    def repair(self, value: Any) -> tuple[Any, list[str], list[str]]:
+        """
+        Validate and repair a decoded value.
+
+        Returns:
+            (value, errors, repairs); errors is empty when value is valid.
+        """
+        errors: list[str] = []
+        repairs: list[str] = []
+        value = self._root(value, "$", errors, repairs)
+        return value, errors, repairs
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_cached(schema_json: str) -> CompiledSchema:
+    return CompiledSchema(json.loads(schema_json))
+
+
+def compile_schema(response_format: dict[str, Any]) -> CompiledSchema:
+    """
+    Compiled validator for a response_format (cached by schema content).
+
+    Args:
+        response_format: {"type": "json_schema", "json_schema": {"schema": ...}}
+            as in config/schemas.py, or a bare JSON schema.
+    """
+    schema = response_format.get("json_schema", {}).get("schema", response_format)
+    return _compile_cached(json.dumps(schema, sort_keys=True))
+
+
+def parse_structured(content: str, response_format: dict[str, Any]) -> tuple[Any, list[str], list[str]]:
+    """
+    Extract, validate and repair a structured reply.
+
+    Args:
+        content: Raw message content.
+        response_format: Schema the reply must satisfy.
+
+    Returns:
+        (value, errors, repairs). errors is non-empty when the reply could
+        not be repaired locally; value is None if no JSON was found.
+    """
+    try:
+        value, repairs = extract_json(content)
+    except ValueError as e:
+        return None, [str(e)], []
+
+    value, errors, schema_repairs = compile_schema(response_format).repair(value)
+    return value, errors, repairs + schema_repairs
+
+
+def correction_prompt(errors: list[str], response_format: dict[str, Any]) -> str:
+    """User message asking the model to fix exactly the listed problems."""
+    schema = response_format.get("json_schema", {}).get("schema", response_format)
+    problems = "\n".join(f"- {e}" for e in errors[:10])
+    return (
+        "Your previous reply could not be used:\n"
+        f"{problems}\n\n"
+        "Reply again with ONLY a JSON object (no code fences, no extra text) matching this schema:\n"
+        f"{json.dumps(schema)}"
+    )
@@ -0,0 +1,198 @@
+"""
+Conversation thread context for mention replies.
+
+A mention is often a reply deep inside a thread, and its text alone
+("agreed, what about you?") says little. get_mentions requests
+conversation_id and the replied-to parents, and build_thread_contexts
+assembles the ancestor chain of every mention in a batch at once:
+1. in-process LRU (seeded from the referenced_tweets expansion of
+   get_mentions and from our own replies)
+2. the conversation_tweets table, loaded per conversation so whole
+   trees come back in one query
+3. one batched get_tweets request per 100 missing ancestors, per level
+
+Mentions and fetched ancestors are stored back, so later mentions in the
+same conversation cost no extra reads.
+"""
+
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Any
+
+from config.settings import settings
+from services.tracing import span
+
+logger = logging.getLogger(__name__)
+
+
+class TweetCache:
+    """In-memory LRU of thread tweets keyed by tweet id (tweets don't change, so no TTL)."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: OrderedDict[str, dict[str, Any]] = OrderedDict()
+
+    def get(self, tweet_id: str) -> dict[str, Any] | None:
+        tweet = self._entries.get(tweet_id)
+        if tweet is not None:
+            self._entries.move_to_end(tweet_id)
+        return tweet
+
+    def put(self, tweet: dict[str, Any]) -> None:
+        self._entries[tweet["tweet_id"]] = tweet
+        self._entries.move_to_end(tweet["tweet_id"])
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+
+def mention_tweet(mention: dict[str, Any]) -> dict[str, Any]:
+    """Thread tweet dict from a TwitterClient.get_mentions item."""
+    return {
+        "tweet_id": mention["id_str"],
+        "conversation_id": mention.get("conversation_id") or mention["id_str"],
+        "author": mention["user"]["screen_name"],
+        "text": mention["text"],
+        "in_reply_to_tweet_id": mention.get("in_reply_to_tweet_id")
+    }
+
+
+def _format_thread(tweet: dict[str, Any], known: dict[str, dict[str, Any]], me: str | None, max_depth: int) -> str:
+    """Ancestors of a tweet, oldest first, one "@author: text" line each."""
+    chain = []
+    parent_id = tweet["in_reply_to_tweet_id"]
+    while parent_id and parent_id in known and len(chain) < max_depth:
+        parent = known[parent_id]
+        chain.append(parent)
+        parent_id = parent["in_reply_to_tweet_id"]
+
+    if not chain:
+        return ""
+
+    lines = ["..."] if parent_id else []
+    for parent in reversed(chain):
+        you = " (you)" if me and parent["author"].lower() == me.lower() else ""
+        lines.append(f"@{parent['author']}{you}: {parent['text']}")
+    return "\n".join(lines)
+
+
+def format_thread_line(thread: str) -> str:
+    """Indented "in reply to" block for a mention list entry, or ""."""
+    if not thread:
+        return ""
+    return "\n  in reply to:\n" + "\n".join(f"    {line}" for line in thread.splitlines())
+
+
+async def build_thread_contexts(twitter, db, mentions: list[dict[str, Any]]) -> dict[str, str]:
+    """
+    Assemble reply threads for a batch of mentions.
+
+    Args:
+        twitter: TwitterClient instance (owns the in-memory tweet cache).
+        db: Database instance, or None to skip the persistent tier.
+        mentions: Mentions as returned by TwitterClient.get_mentions.
+
+    Returns:
+        Dict of mention tweet_id -> thread above it, oldest first ("" when
+        the mention starts a conversation or its parents are unavailable).
+    """
+    max_depth = settings.thread_context_max_depth
+    cache = twitter.tweet_cache
+    tweets = [mention_tweet(m) for m in mentions]
+    known = {t["tweet_id"]: t for t in tweets}
+    for tweet in tweets:
+        cache.put(tweet)
+
+    replies = [t for t in tweets if t["in_reply_to_tweet_id"]]
+    stored: set[str] = set()
+    fetched: list[dict[str, Any]] = []
+
+    with span("mentions.threads", mentions=len(tweets)) as s:
+        # Whole cached conversation trees in one query
+        if replies and db:
+            try:
+                conversation_ids = list(dict.fromkeys(t["conversation_id"] for t in replies))
+                for tweet in await db.get_conversation_tweets(conversation_ids):
+                    stored.add(tweet["tweet_id"])
+                    known.setdefault(tweet["tweet_id"], tweet)
+                    cache.put(known[tweet["tweet_id"]])
+            except Exception as e:
+                logger.warning(f"[THREADS] DB lookup failed: {e}")
+
+        # Walk up one level at a time, fetching every missing parent of the level together
+        frontier = [t["in_reply_to_tweet_id"] for t in replies]
+        for _ in range(max_depth):
+            missing = []
+            for tweet_id in dict.fromkeys(frontier):
+                if tweet_id in known:
+                    continue
+                tweet = cache.get(tweet_id)
+                if tweet:
+                    known[tweet_id] = tweet
+                else:
+                    missing.append(tweet_id)
+
+            if missing:
+                for tweet in (await asyncio.to_thread(twitter.get_tweets, missing)).values():
+                    if tweet:
+                        known[tweet["tweet_id"]] = tweet
+                        cache.put(tweet)
+                        fetched.append(tweet)
+
+            frontier = [
+                known[tweet_id]["in_reply_to_tweet_id"]
+                for tweet_id in frontier
+                if tweet_id in known and known[tweet_id]["in_reply_to_tweet_id"]
+            ]
+            if not frontier:
+                break
+
+        new = [t for t in tweets if t["tweet_id"] not in stored] + fetched
+        if new and db:
+            try:
+                await db.save_conversation_tweets(new)
+            except Exception as e:
+                logger.warning(f"[THREADS] Failed to persist tweets: {e}")
+
+        if s:
+            s.set_attribute("replies", len(replies))
+            s.set_attribute("fetched", len(fetched))
+
+    if replies:
+        logger.info(f"[THREADS] {len(replies)}/{len(tweets)} mentions are replies, fetched {len(fetched)} parents")
+
+    return {
+        t["tweet_id"]: _format_thread(t, known, twitter.username, max_depth)
+        for t in tweets
+    }
+
+
+async def record_reply(twitter, db, reply: dict[str, Any]) -> None:
+    """
+    Add one of our replies to its conversation tree.
+
+    Replies to our replies are the most common threads, so this saves a
+    get_tweets read when someone answers.
+
+    Args:
+        twitter: TwitterClient instance.
+        db: Database instance, or None.
+        reply: Result of TwitterClient.reply.
+    """
+    parent = twitter.tweet_cache.get(reply["reply_to"])
+    if not parent:
+        return
+
+    tweet = {
+        "tweet_id": reply["id"],
+        "conversation_id": parent["conversation_id"],
+        "author": twitter.username or "you",
+        "text": reply["text"],
+        "in_reply_to_tweet_id": parent["tweet_id"]
+    }
+    twitter.tweet_cache.put(tweet)
+    if db:
+        try:
+            await db.save_conversation_tweets([tweet])
+        except Exception as e:
+            logger.warning(f"[THREADS] Failed to persist reply {reply['id']}: {e}")
@@ -1,4 +1,7 @@
+import calendar
 import logging
+import math
+from collections import deque
 from datetime import datetime, timedelta
 from typing import Any
 
@@ -24,8 +27,12 @@ TIER_FEATURES = {
 class TierManager:
     """Manages Twitter API tier detection and usage tracking with in-memory autopost guard."""
 
-    def __init__(self, db=None):
+    def __init__(self, db=None, transport: httpx.AsyncBaseTransport | None = None):
         self.db = db
+        if transport is None and settings.twitter_transport == "fake":
+            from fakes.twitter import get_fake_twitter
+            transport = get_fake_twitter().usage_transport()
+        self.transport = transport
         self.tier: str | None = None
         self.project_id: str | None = None
         self.project_cap: int = 0
@@ -39,6 +46,8 @@ class TierManager:
         self.is_initialized = False
         self.is_paused = False
         self.pause_reason: str | None = None
+        # (check time, project_usage) per tier check, for the read-cap forecast
+        self._usage_samples: deque[tuple[datetime, int]] = deque(maxlen=24)
 
         # --------------------------
         # In-memory post guard
@@ -60,7 +69,7 @@ class TierManager:
             url = "https://api.twitter.com/2/usage/tweets"
             headers = {"Authorization": f"Bearer {settings.twitter_bearer_token}"}
 
-            async with httpx.AsyncClient() as client:
+            async with httpx.AsyncClient(transport=self.transport) as client:
                 response = await client.get(url, headers=headers)
                 if response.status_code == 403:
                     self.tier = "free"
@@ -84,6 +93,10 @@ class TierManager:
             else: self.tier = "unknown"
 
             self.last_tier_check = datetime.now()
+            # Usage dropping means the cap was reset, so older samples no longer apply
+            if self._usage_samples and self.project_usage < self._usage_samples[-1][1]:
+                self._usage_samples.clear()
+            self._usage_samples.append((self.last_tier_check, self.project_usage))
             self._check_usage_warnings()
 
             return {
@@ -111,6 +124,34 @@ class TierManager:
         if self.project_cap <= 0: return 0.0
         return (self.project_usage / self.project_cap) * 100
 
+    def _next_cap_reset(self, now: datetime) -> datetime | None:
+        if not self.cap_reset_day: return None
+        day = int(self.cap_reset_day)
+        year, month = now.year, now.month
+        for _ in range(2):
+            reset = datetime(year, month, min(day, calendar.monthrange(year, month)[1]))
+            if reset > now: return reset
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        return None
+
+    def read_cap_pressure(self) -> float:
+        """
+        Forecast read usage at the next cap reset as a share of the cap.
+
+        Extrapolates the usage growth between the hourly tier checks. Above
+        1.0 the cap runs out before it resets at the current pace; 0.0 when
+        there is not enough history to tell.
+        """
+        if self.is_paused and self.pause_reason == "monthly_cap_reached": return math.inf
+        if self.project_cap <= 0 or len(self._usage_samples) < 2: return 0.0
+        (first_at, first_usage), (last_at, last_usage) = self._usage_samples[0], self._usage_samples[-1]
+        hours = (last_at - first_at).total_seconds() / 3600
+        reset = self._next_cap_reset(last_at)
+        if hours <= 0 or reset is None: return 0.0
+        per_hour = (last_usage - first_usage) / hours
+        projected = last_usage + per_hour * (reset - last_at).total_seconds() / 3600
+        return projected / self.project_cap
+
     def _check_usage_warnings(self) -> None:
         percent = self.get_usage_percent()
         if percent >= 100:
@@ -0,0 +1,238 @@
+"""
+In-process tracing for agent cycles.
+
+Spans follow the OpenTelemetry data model (32-hex trace_id, 16-hex
+span_id, parent_span_id, unix-nanosecond start/end, attributes, status)
+so they can be shipped to an OTLP collector later without changing call
+sites. Finished cycle traces are kept in a ring buffer and rendered as a
+timeline by /debug/cycles/{trace_id}.
+
+Usage (plain `with`, works in sync and async code):
+
+    with cycle_span("agent.cycle"):
+        with span("llm.chat", model=model) as s:
+            ...
+            s.set_attribute("http.status_code", 200)
+
+Spans opened outside a cycle are not recorded.
+"""
+
+import functools
+import inspect
+import logging
+import os
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class Span:
+    """One timed operation inside a trace."""
+
+    __slots__ = (
+        "name", "trace_id", "span_id", "parent_span_id",
+        "start_time_unix_nano", "end_time_unix_nano", "attributes", "status", "_trace"
+    )
+
+    def __init__(self, name: str, trace: "Trace", parent: "Span | None", attributes: dict[str, Any]):
+        self.name = name
+        self.trace_id = trace.trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_span_id = parent.span_id if parent else None
+        self.start_time_unix_nano = time.time_ns()
+        self.end_time_unix_nano: int | None = None
+        self.attributes = attributes
+        self.status = "UNSET"
+        self._trace = trace
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end_time_unix_nano or time.time_ns()
+        return (end - self.start_time_unix_nano) / 1e6
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_span_id,
+            "start_time_unix_nano": self.start_time_unix_nano,
+            "end_time_unix_nano": self.end_time_unix_nano,
+            "duration_ms": round(self.duration_ms, 3),
+            "status": self.status,
+            "attributes": self.attributes
+        }
+
+
+class Trace:
+    """All spans of one cycle."""
+
+    def __init__(self, name: str):
+        self.trace_id = os.urandom(16).hex()
+        self.name = name
+        self.spans: list[Span] = []
+        self.root: Span | None = None
+
+    def summary(self) -> dict[str, Any]:
+        root = self.root
+        return {
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "start_time_unix_nano": root.start_time_unix_nano if root else None,
+            "duration_ms": round(root.duration_ms, 3) if root else None,
+            "status": root.status if root else "UNSET",
+            "span_count": len(self.spans),
+            "attributes": root.attributes if root else {}
+        }
+
+    def timeline(self) -> dict[str, Any]:
+        """Spans ordered by start with offsets from the cycle start and nesting depth."""
+        start = self.root.start_time_unix_nano if self.root else 0
+        depth = {}
+        spans = []
+        for s in sorted(self.spans, key=lambda s: s.start_time_unix_nano):
+            depth[s.span_id] = depth.get(s.parent_span_id, -1) + 1
+            entry = s.to_dict()
+            entry["offset_ms"] = round((s.start_time_unix_nano - start) / 1e6, 3)
+            entry["depth"] = depth[s.span_id]
+            spans.append(entry)
+
+        # Time per span name, so the slowest stage is obvious at a glance
+        totals: dict[str, dict[str, float]] = {}
+        for s in self.spans:
+            if s is self.root:
+                continue
+            total = totals.setdefault(s.name, {"count": 0, "total_ms": 0.0})
+            total["count"] += 1
+            total["total_ms"] = round(total["total_ms"] + s.duration_ms, 3)
+
+        return {**self.summary(), "breakdown": totals, "spans": spans}
+
+
+class CycleTraceExporter:
+    """Span exporter keeping the last N finished cycle traces in memory."""
+
+    def __init__(self, maxlen: int):
+        self.traces: deque[Trace] = deque(maxlen=maxlen)
+        self.listeners: list[Callable[[Span], None]] = []
+
+    def on_end(self, span: Span) -> None:
+        for listener in self.listeners:
+            try:
+                listener(span)
+            except Exception as e:
+                logger.error(f"[TRACING] Span listener failed: {e}")
+
+        if span is span._trace.root:
+            self.traces.append(span._trace)
+
+    def list(self) -> list[dict[str, Any]]:
+        return [t.summary() for t in reversed(self.traces)]
+
+    def get(self, trace_id: str) -> Trace | None:
+        for trace in self.traces:
+            if trace.trace_id == trace_id:
+                return trace
+        return None
+
+
+exporter = CycleTraceExporter(settings.trace_buffer_size)
+
+_current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+def add_span_listener(listener: Callable[[Span], None]) -> None:
+    """Call listener(span) for every finished span (metrics, log export)."""
+    exporter.listeners.append(listener)
+
+
+def current_span() -> Span | None:
+    return _current_span.get()
+
+
+@contextmanager
+def _activate(span: Span) -> Iterator[Span]:
+    token = _current_span.set(span)
+    try:
+        yield span
+        if span.status == "UNSET":
+            span.status = "OK"
+    except BaseException as e:
+        span.status = "ERROR"
+        span.attributes["error"] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        span.end_time_unix_nano = time.time_ns()
+        _current_span.reset(token)
+        span._trace.spans.append(span)
+        exporter.on_end(span)
+
+
+@contextmanager
+def cycle_span(name: str, **attributes: Any) -> Iterator[Span]:
+    """
+    Start a new trace for one cycle (agent run, mention batch, autopost).
+
+    Args:
+        name: Cycle name, e.g. "agent.cycle".
+        **attributes: Span attributes.
+    """
+    trace = Trace(name)
+    span = Span(name, trace, None, attributes)
+    trace.root = span
+    with _activate(span):
+        yield span
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Span | None]:
+    """
+    Record a child span of the current span; no-op outside a cycle.
+
+    Args:
+        name: Span name, e.g. "llm.chat", "tool.web_search", "db.save_post".
+        **attributes: Span attributes.
+    """
+    parent = _current_span.get()
+    if parent is None:
+        yield None
+        return
+
+    with _activate(Span(name, parent._trace, parent, attributes)) as child:
+        yield child
+
+
+def traced(name: str, cycle: bool = False) -> Callable:
+    """
+    Decorator wrapping a sync or async function in a span.
+
+    Args:
+        name: Span name.
+        cycle: Start a new trace instead of a child span.
+    """
+    opener = cycle_span if cycle else span
+
+    def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with opener(name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with opener(name):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
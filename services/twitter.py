@@ -2,6 +2,10 @@
 Twitter client using tweepy for Twitter API v2.
 
 Handles posting tweets, replies, media uploads, and fetching mentions.
+User profiles are cached (see services/profile_cache.py) and looked up in
+batches of up to 100 per request. Mentions carry their conversation and
+parent tweet, and thread tweets are cached and looked up the same way
+(see services/thread_context.py).
 """
 
 import logging
@@ -10,17 +14,43 @@ from typing import Any
 import tweepy
 
 from config.settings import settings
+from services.profile_cache import ProfileCache
+from services.thread_context import TweetCache
+from services.tracing import traced
 
 logger = logging.getLogger(__name__)
 
+PROFILE_USER_FIELDS = ["description", "public_metrics", "created_at", "location"]
+# Max usernames per GET /2/users/by request
+USERS_LOOKUP_BATCH = 100
+# Fields needed to place a tweet in its conversation
+THREAD_TWEET_FIELDS = ["created_at", "text", "author_id", "conversation_id", "referenced_tweets"]
+# Max ids per GET /2/tweets request
+TWEETS_LOOKUP_BATCH = 100
+
 
 class TwitterClient:
     """Twitter API v2 client using tweepy."""
 
-    def __init__(self):
-        """Initialize Twitter client with credentials from settings."""
+    def __init__(self, client=None, api_v1=None):
+        """
+        Initialize Twitter client.
+
+        Args:
+            client: Optional tweepy.Client-compatible transport.
+            api_v1: Optional tweepy.API-compatible transport for media uploads.
+
+        Without arguments the transport comes from settings.twitter_transport:
+        "tweepy" (live API) or "fake" (shared in-process fakes.twitter.FakeTwitter).
+        """
+        if client is None and settings.twitter_transport == "fake":
+            from fakes.twitter import get_fake_twitter
+
+            client = api_v1 = get_fake_twitter()
+            logger.info("Using fake Twitter transport")
+
         # API v2 client for tweets
-        self.client = tweepy.Client(
+        self.client = client or tweepy.Client(
             bearer_token=settings.twitter_bearer_token,
             consumer_key=settings.twitter_api_key,
             consumer_secret=settings.twitter_api_secret,
@@ -30,14 +60,48 @@ class TwitterClient:
         )
 
         # API v1.1 auth for media uploads (v2 doesn't support media upload yet)
-        auth = tweepy.OAuth1UserHandler(
-            settings.twitter_api_key,
-            settings.twitter_api_secret,
-            settings.twitter_access_token,
-            settings.twitter_access_secret
-        )
-        self.api_v1 = tweepy.API(auth)
-
+        if api_v1 is None:
+            auth = tweepy.OAuth1UserHandler(
+                settings.twitter_api_key,
+                settings.twitter_api_secret,
+                settings.twitter_access_token,
+                settings.twitter_access_secret
+            )
+            api_v1 = tweepy.API(auth)
+        self.api_v1 = api_v1
+
+        self.profile_cache = ProfileCache(settings.profile_cache_size, settings.profile_cache_ttl_seconds)
+        self.tweet_cache = TweetCache(settings.thread_cache_size)
+        # Our handle, known after the first get_me
+        self.username: str | None = None
+
+    @staticmethod
+    def _profile(user) -> dict[str, Any]:
+        """Profile dict from a tweepy User with PROFILE_USER_FIELDS."""
+        metrics = user.public_metrics or {}
+        return {
+            "id": str(user.id),
+            "username": user.username,
+            "bio": user.description or "",
+            "followers": metrics.get("followers_count", 0),
+            "following": metrics.get("following_count", 0),
+            "tweets": metrics.get("tweet_count", 0),
+            "location": user.location or ""
+        }
+
+    @staticmethod
+    def _thread_tweet(tweet, users: dict[int, str]) -> dict[str, Any]:
+        """Thread tweet dict from a tweepy Tweet with THREAD_TWEET_FIELDS."""
+        parent = next((r.id for r in tweet.referenced_tweets or [] if r.type == "replied_to"), None)
+        return {
+            "tweet_id": str(tweet.id),
+            "conversation_id": str(tweet.conversation_id or tweet.id),
+            "author": users.get(tweet.author_id, "unknown"),
+            "text": tweet.text,
+            "in_reply_to_tweet_id": str(parent) if parent else None
+        }
+
+    @traced("twitter.post")
     async def post(
         self,
         text: str,
@@ -65,6 +129,7 @@ class TwitterClient:
             logger.error(f"Error posting tweet: {e}")
             raise
 
+    @traced("twitter.reply")
     async def reply(
         self,
         text: str,
@@ -95,6 +160,7 @@ class TwitterClient:
             logger.error(f"Error replying to tweet: {e}")
             raise
 
+    @traced("twitter.upload_media")
     async def upload_media(self, image_bytes: bytes) -> str:
         """
         Upload media to Twitter.
@@ -123,6 +189,7 @@ class TwitterClient:
             logger.error(f"Error uploading media: {e}")
             raise
 
+    @traced("twitter.get_me")
     def get_me(self) -> dict[str, Any]:
         """
         Get authenticated user info.
@@ -132,11 +199,13 @@ class TwitterClient:
         """
         try:
             response = self.client.get_me()
+            self.username = response.data.username
             return {"id": response.data.id, "username": response.data.username}
         except Exception as e:
             logger.error(f"Error getting user info: {e}")
             raise
 
+    @traced("twitter.get_mentions")
     def get_mentions(self, since_id: str | None = None) -> list[dict[str, Any]]:
         """
         Get recent mentions of authenticated user.
@@ -145,7 +214,8 @@ class TwitterClient:
             since_id: Only get mentions newer than this tweet ID.
 
         Returns:
-            List of mention tweets with author info.
+            List of mention tweets with author info, conversation_id and
+            in_reply_to_tweet_id (None unless the mention is a reply).
         """
         try:
             # Get authenticated user ID
@@ -157,9 +227,11 @@ class TwitterClient:
                 id=user_id,
                 since_id=since_id,
                 max_results=10,
-                expansions=["author_id"],
-                tweet_fields=["created_at", "text", "author_id"],
-                user_fields=["username"]
+                # Parents come back in includes.tweets, saving a lookup per reply
+                expansions=["author_id", "referenced_tweets.id", "referenced_tweets.id.author_id"],
+                tweet_fields=THREAD_TWEET_FIELDS,
+                # Full profile fields, so author lookups are served from the cache
+                user_fields=["username", *PROFILE_USER_FIELDS]
             )
 
             if not response.data:
@@ -171,16 +243,24 @@ class TwitterClient:
             if response.includes and "users" in response.includes:
                 for user in response.includes["users"]:
                     users[user.id] = user.username
+                    self.profile_cache.put(user.username, self._profile(user))
+
+            if response.includes and "tweets" in response.includes:
+                for tweet in response.includes["tweets"]:
+                    self.tweet_cache.put(self._thread_tweet(tweet, users))
 
             # Format mentions
             mentions = []
             for tweet in response.data:
+                thread_tweet = self._thread_tweet(tweet, users)
                 mentions.append({
                     "id_str": str(tweet.id),
                     "text": tweet.text,
                     "user": {
                         "screen_name": users.get(tweet.author_id, "unknown")
-                    }
+                    },
+                    "conversation_id": thread_tweet["conversation_id"],
+                    "in_reply_to_tweet_id": thread_tweet["in_reply_to_tweet_id"]
                 })
 
             logger.info(f"Found {len(mentions)} new mentions")
@@ -190,6 +270,27 @@ class TwitterClient:
             logger.error(f"Error fetching mentions: {e}")
             raise
 
+    @traced("twitter.get_my_tweets")
+    def get_my_tweets(self, max_results: int = 100) -> list[dict[str, Any]]:
+        """
+        Get our most recent tweets (posts and replies).
+
+        Args:
+            max_results: Number of tweets, up to 100.
+
+        Returns:
+            Thread tweet dicts, newest first.
+        """
+        me = self.get_me()
+        response = self.client.get_users_tweets(
+            id=me["id"],
+            max_results=max_results,
+            tweet_fields=THREAD_TWEET_FIELDS
+        )
+        users = {me["id"]: me["username"]}
+        return [self._thread_tweet(tweet, users) for tweet in response.data or []]
+
+    @traced("twitter.get_user_profile")
     def get_user_profile(self, username: str) -> dict[str, Any] | None:
         """
         Get Twitter user profile by username.
@@ -203,24 +304,86 @@ class TwitterClient:
         try:
             response = self.client.get_user(
                 username=username,
-                user_fields=["description", "public_metrics", "created_at", "location"]
+                user_fields=PROFILE_USER_FIELDS
             )
 
             if not response.data:
                 logger.info(f"User @{username} not found")
                 return None
 
-            user = response.data
-            metrics = user.public_metrics or {}
-            return {
-                "username": user.username,
-                "bio": user.description or "",
-                "followers": metrics.get("followers_count", 0),
-                "following": metrics.get("following_count", 0),
-                "tweets": metrics.get("tweet_count", 0),
-                "location": user.location or ""
-            }
+            return self._profile(response.data)
 
         except Exception as e:
             logger.error(f"Error getting profile @{username}: {e}")
             return None
+
+    @traced("twitter.get_users")
+    def get_user_profiles(self, usernames: list[str]) -> dict[str, dict[str, Any] | None]:
+        """
+        Get many user profiles with one request per 100 usernames.
+
+        Prefer services.profile_cache.resolve_profiles, which checks the
+        cache first.
+
+        Args:
+            usernames: Twitter handles (without @).
+
+        Returns:
+            Dict of lowercase handle -> profile, or None if not found.
+            Handles from a batch that failed (rate limit, timeout, 5xx)
+            are left out, so they aren't mistaken for missing users.
+        """
+        result: dict[str, dict[str, Any] | None] = {}
+
+        for i in range(0, len(usernames), USERS_LOOKUP_BATCH):
+            batch = usernames[i:i + USERS_LOOKUP_BATCH]
+            try:
+                response = self.client.get_users(usernames=batch, user_fields=PROFILE_USER_FIELDS)
+            except Exception as e:
+                logger.error(f"Error getting {len(batch)} profiles: {e}")
+                continue
+
+            result.update({u.lower(): None for u in batch})
+            for user in response.data or []:
+                result[user.username.lower()] = self._profile(user)
+
+        return result
+
+    @traced("twitter.get_tweets")
+    def get_tweets(self, tweet_ids: list[str]) -> dict[str, dict[str, Any] | None]:
+        """
+        Get many tweets with one request per 100 ids.
+
+        Prefer services.thread_context.build_thread_contexts, which checks
+        the caches first.
+
+        Args:
+            tweet_ids: Tweet IDs.
+
+        Returns:
+            Dict of tweet id -> thread tweet, or None if not found (deleted,
+            protected) or the request failed.
+        """
+        result: dict[str, dict[str, Any] | None] = {str(i): None for i in tweet_ids}
+
+        for i in range(0, len(tweet_ids), TWEETS_LOOKUP_BATCH):
+            batch = tweet_ids[i:i + TWEETS_LOOKUP_BATCH]
+            try:
+                response = self.client.get_tweets(
+                    ids=batch,
+                    expansions=["author_id"],
+                    tweet_fields=THREAD_TWEET_FIELDS,
+                    user_fields=["username"]
+                )
+            except Exception as e:
+                logger.error(f"Error getting {len(batch)} tweets: {e}")
+                continue
+
+            users = {}
+            if response.includes and "users" in response.includes:
+                users = {user.id: user.username for user in response.includes["users"]}
+
+            for tweet in response.data or []:
+                result[str(tweet.id)] = self._thread_tweet(tweet, users)
+
+        return result
@@ -3,23 +3,39 @@ Unified Agent Service.
 
 Single agent that handles both posting and replying using Structured Output.
 Replaces separate autopost and mentions services.
+
+A cycle that cannot act (no posts left today and no mention to reply to)
+returns before the first LLM call.
+
+Cycle state is checkpointed after every step (services/checkpoints.py), so
+a cycle interrupted by a restart or a failed LLM call resumes where it
+stopped instead of redoing mention fetches and web searches.
 """
 
+import asyncio
+import contextvars
 import json
 import logging
 import time
+import uuid
 from datetime import datetime, timezone
 from typing import Any
 
+from services.action_intents import reconcile_intents
+from services.checkpoints import clear_checkpoint, load_checkpoint, save_checkpoint
 from services.database import Database
 from services.llm import LLMClient
+from services.prefetch import PrefetchCache, prefetch_context
+from services.tracing import current_span, span, traced
 from services.twitter import TwitterClient
 from tools.registry import (
     get_tools_for_mode,
     get_tools_description_for_mode,
     get_tools_enum_for_mode,
     get_tools_params_schema,
-    get_tool_func
+    get_tool_func,
+    is_read_only_tool,
+    tool_call_key
 )
 from config.personality import SYSTEM_PROMPT
 from config.prompts.unified_agent import AGENT_INSTRUCTIONS
@@ -27,6 +43,9 @@ from config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# Checkpoint row of this agent
+CHECKPOINT_AGENT = "unified"
+
 
 def build_step_decision_schema(tier: str) -> dict:
     """
@@ -40,32 +59,56 @@ def build_step_decision_schema(tier: str) -> dict:
     """
     tools_enum = get_tools_enum_for_mode("unified", tier)
     params_schema = get_tools_params_schema()
+    read_only_enum = [name for name in tools_enum if is_read_only_tool(name)]
+
+    properties = {
+        "tool": {
+            "type": "string",
+            "enum": tools_enum,
+            "description": "Which tool to use"
+        },
+        "params": {
+            "type": "object",
+            "description": "Parameters for the tool",
+            "properties": params_schema,
+            "additionalProperties": False
+        }
+    }
 
-    return {
-        "type": "json_schema",
-        "json_schema": {
-            "name": "step_decision",
-            "strict": True,
-            "schema": {
+    if read_only_enum:
+        properties["additional_reads"] = {
+            "type": "array",
+            "description": "Independent read-only lookups to run in parallel with tool ([] if none)",
+            "items": {
                 "type": "object",
                 "properties": {
-                    "thinking": {
-                        "type": "string",
-                        "description": "Your reasoning about what to do next"
-                    },
-                    "tool": {
-                        "type": "string",
-                        "enum": tools_enum,
-                        "description": "Which tool to use"
-                    },
+                    "tool": {"type": "string", "enum": read_only_enum},
                     "params": {
                         "type": "object",
-                        "description": "Parameters for the tool",
                         "properties": params_schema,
                         "additionalProperties": False
                     }
                 },
-                "required": ["thinking", "tool", "params"],
+                "required": ["tool", "params"],
+                "additionalProperties": False
+            }
+        }
+
+    # tool/params come first so they can be acted on while thinking still streams
+    properties["thinking"] = {
+        "type": "string",
+        "description": "Your reasoning about what to do next"
+    }
+
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "step_decision",
+            "strict": True,
+            "schema": {
+                "type": "object",
+                "properties": properties,
+                "required": list(properties),
                 "additionalProperties": False
             }
         }
@@ -80,16 +123,21 @@ class UnifiedAgent:
     Tools are discovered from registry.
     """
 
-    def __init__(self, db: Database, tier_manager=None):
+    def __init__(self, db: Database, tier_manager=None, twitter: TwitterClient | None = None):
         self.db = db
         self.llm = LLMClient()
-        self.twitter = TwitterClient()
+        self.twitter = twitter or TwitterClient()
         self.tier_manager = tier_manager
 
         # Tracking for this cycle
         self.posts_this_cycle = 0
         self.replies_this_cycle = 0
         self.tools_used_for_current_action: list[str] = []
+        self.early_tool_starts = 0
+        self.parallel_reads = 0
+        self.prefetch = PrefetchCache()
+        # Checkpointed cycle id, also keys action intents (see services/action_intents.py)
+        self.cycle_id: str | None = None
 
     def _get_tier(self) -> str:
         """Get current tier string."""
@@ -98,6 +146,35 @@ class UnifiedAgent:
             return "free" if not can_use_mentions else "basic+"
         return "basic+"
 
+    async def _remaining_actions(self) -> tuple[int, int]:
+        """Posts and replies still allowed today (replies are 0 when the tier has no mentions)."""
+        daily_post_limit, daily_reply_limit = self.tier_manager.get_daily_limits()
+        posts_remaining = daily_post_limit - await self.db.count_actions_today("post")
+
+        can_use_mentions, _ = self.tier_manager.can_use_mentions()
+        replies_remaining = 0
+        if can_use_mentions:
+            replies_remaining = daily_reply_limit - await self.db.count_actions_today("reply")
+
+        return max(0, posts_remaining), max(0, replies_remaining)
+
+    def _skipped(self, start_time: float, reason: str) -> dict[str, Any]:
+        """Result of a cycle that returned without calling the LLM."""
+        logger.info(f"[AGENT] === Skipped: {reason} ===")
+        cycle = current_span()
+        if cycle:
+            cycle.attributes.update(skipped=reason, iterations=0)
+
+        return {
+            "success": True,
+            "skipped": True,
+            "reason": reason,
+            "posts": 0,
+            "replies": 0,
+            "iterations": 0,
+            "duration_seconds": round(time.time() - start_time, 1)
+        }
+
     async def _build_context(self) -> str:
         """Build context string for the agent."""
         # Get recent actions
@@ -152,12 +229,18 @@ class UnifiedAgent:
         if tool_name not in ["create_post", "create_reply", "finish_cycle"]:
             self.tools_used_for_current_action.append(tool_name)
 
+        cached = self.prefetch.pop(tool_name, params)
+        if cached is not None:
+            logger.info(f"[AGENT] {tool_name} answered from prefetch")
+            return cached
+
         try:
             # Build kwargs with context
             kwargs = {
                 "twitter": self.twitter,
                 "db": self.db,
                 "tier_manager": self.tier_manager,
+                "cycle_id": self.cycle_id,
                 **params
             }
 
@@ -165,7 +248,8 @@ class UnifiedAgent:
             if tool_name in ["create_post", "create_reply"]:
                 kwargs["tools_used"] = self.tools_used_for_current_action.copy()
 
-            result = await tool_func(**kwargs)
+            with span(f"tool.{tool_name}"):
+                result = await tool_func(**kwargs)
 
             # Track posts/replies and reset tools_used
             if tool_name == "create_post" and "successfully" in result.lower():
@@ -181,33 +265,172 @@ class UnifiedAgent:
             logger.error(f"[AGENT] Tool {tool_name} failed: {e}")
             return f"Error executing {tool_name}: {e}"
 
-    async def run(self) -> dict[str, Any]:
+    async def _decide(self, messages: list[dict], schema: dict) -> tuple[dict[str, Any], asyncio.Task | None]:
         """
-        Run the unified agent cycle.
+        Get the next step decision from the LLM.
+
+        With streaming enabled, a read-only tool is started as soon as its
+        tool and params have streamed in, while the model is still writing
+        its thinking. The early run is kept only if the final decision
+        matches it.
 
         Returns:
-            Summary of what happened.
+            (decision, early) where early is a task already running the
+            decided tool, or None.
         """
-        start_time = time.time()
-        logger.info("[AGENT] === Starting unified agent cycle ===")
-
-        self.posts_this_cycle = 0
-        self.replies_this_cycle = 0
-        self.tools_used_for_current_action = []
+        if not settings.llm_streaming:
+            return await self.llm.chat(messages, schema), None
+
+        allowed = schema["json_schema"]["schema"]["properties"]["tool"]["enum"]
+        # Early tool spans belong to the cycle, not to the LLM stream span
+        context = contextvars.copy_context()
+        tools_used = self.tools_used_for_current_action.copy()
+        early: dict[str, Any] = {}
+
+        def on_field(name: str, value: Any) -> None:
+            early[name] = value
+            tool_name = early.get("tool")
+            if name != "params" or "task" in early or not isinstance(value, dict):
+                return
+            if tool_name in allowed and is_read_only_tool(tool_name):
+                logger.info(f"[AGENT] Starting {tool_name} before the decision finished streaming")
+                early["task"] = context.run(asyncio.create_task, self._execute_tool(tool_name, value))
 
         try:
-            # Get tier and build schema
-            tier = self._get_tier()
-            schema = build_step_decision_schema(tier)
-            tools_desc = get_tools_description_for_mode("unified", tier)
+            result = await self.llm.chat_stream(messages, schema, on_field)
+        except BaseException:
+            if "task" in early:
+                early["task"].cancel()
+            raise
+
+        task = early.get("task")
+        if task and (result.get("tool") != early["tool"] or result.get("params") != early["params"]):
+            logger.warning(f"[AGENT] Final decision differs from streamed {early['tool']}, discarding early run")
+            task.cancel()
+            self.tools_used_for_current_action = tools_used
+            task = None
+
+        if task:
+            self.early_tool_starts += 1
+        return result, task
+
+    def _parallel_reads(self, result: dict[str, Any], allowed: list[str]) -> list[tuple[str, dict]]:
+        """
+        Validated, de-duplicated additional_reads of a decision.
 
-            logger.info(f"[AGENT] Tier: {tier.upper()}")
+        Drops non read-only tools, repeats of the main call and anything
+        beyond AGENT_MAX_PARALLEL_READS.
+        """
+        seen = {tool_call_key(result.get("tool"), result.get("params") or {})}
+        reads = []
+
+        for read in result.get("additional_reads") or []:
+            tool_name = read.get("tool")
+            params = read.get("params") or {}
+            key = tool_call_key(tool_name, params)
+            if tool_name not in allowed or not is_read_only_tool(tool_name) or key in seen:
+                continue
+            seen.add(key)
+            reads.append((tool_name, params))
+
+        if len(reads) > settings.agent_max_parallel_reads:
+            logger.warning(f"[AGENT] Dropping {len(reads) - settings.agent_max_parallel_reads} additional reads over the limit")
+            reads = reads[:settings.agent_max_parallel_reads]
+        return reads
+
+    async def _run_step(self, tool_name: str, params: dict, early: asyncio.Task | None, reads: list[tuple[str, dict]]) -> list[tuple[str, str]]:
+        """
+        Execute one decision: the chosen tool plus any parallel reads.
+
+        Read-only batches run concurrently. Side-effecting tools always run
+        alone, and any reads batched with them start only after they finish.
+
+        Returns:
+            (tool_name, result) pairs, main tool first.
+        """
+        main = early or self._execute_tool(tool_name, params)
+
+        if tool_name == "finish_cycle" or not reads:
+            return [(tool_name, await main)]
+
+        self.parallel_reads += len(reads)
+        logger.info(f"[AGENT] Running {tool_name} with {len(reads)} parallel reads: {[t for t, _ in reads]}")
+        read_calls = [self._execute_tool(t, p) for t, p in reads]
+
+        if is_read_only_tool(tool_name):
+            results = await asyncio.gather(main, *read_calls)
+        else:
+            results = [await main, *await asyncio.gather(*read_calls)]
+
+        return list(zip([tool_name] + [t for t, _ in reads], results))
 
-            # Build context
+    def _checkpoint_state(
+        self,
+        messages: list[dict],
+        iteration: int,
+        resumes: int,
+        pending: dict[str, Any] | None = None
+    ) -> dict[str, Any]:
+        """
+        Cycle state to checkpoint.
+
+        Args:
+            messages: Conversation so far.
+            iteration: Tool loop iterations done.
+            resumes: Times this cycle has been resumed.
+            pending: Side-effecting tool call that has started but not
+                finished ({"tool", "params"}), or None.
+        """
+        return {
+            "messages": messages,
+            "iteration": iteration,
+            "resumes": resumes,
+            "posts": self.posts_this_cycle,
+            "replies": self.replies_this_cycle,
+            "tools_used": self.tools_used_for_current_action,
+            "pending": pending
+        }
+
+    async def _resume_messages(self, checkpoint: dict[str, Any]) -> list[dict]:
+        """
+        Restore counters from a checkpoint and continue its conversation.
+
+        The saved system prompt is kept (it holds the prefetched context);
+        recent actions, rate limits and time are refreshed in a new user
+        message, which also flags a side-effecting call that may or may
+        not have gone through.
+        """
+        self.posts_this_cycle = checkpoint["posts"]
+        self.replies_this_cycle = checkpoint["replies"]
+        self.tools_used_for_current_action = checkpoint["tools_used"]
+
+        note = "Your cycle was interrupted and is resuming from where it stopped."
+        pending = checkpoint.get("pending")
+        if pending:
+            note += (
+                f" It stopped while running {pending['tool']} with {json.dumps(pending['params'])}, "
+                "which may or may not have gone through - check your recent actions before repeating it."
+            )
+
+        context = await self._build_context()
+        messages = checkpoint["messages"]
+        messages.append({"role": "user", "content": f"{note}\n\n{context}\n\nDecide what to do next."})
+        return messages
+
+    async def _initial_messages(self, tools_desc: str, allowed: list[str]) -> list[dict]:
+        """Conversation for a new cycle, prefetching mentions and author context concurrently with the context."""
+        if settings.agent_prefetch:
+            context, (prefetched, self.prefetch) = await asyncio.gather(
+                self._build_context(),
+                prefetch_context(self.twitter, self.db, self.tier_manager, allowed, settings.agent_prefetch_authors)
+            )
+            if prefetched:
+                context = f"{context}\n\n{prefetched}"
+        else:
             context = await self._build_context()
 
-            # Build system prompt
-            system_prompt = f"""{SYSTEM_PROMPT}
+        # Build system prompt
+        system_prompt = f"""{SYSTEM_PROMPT}
 
 ---
 
@@ -221,46 +444,126 @@ class UnifiedAgent:
 
 {context}"""
 
-            # Initialize conversation
-            messages = [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": "It's time for your next cycle. Decide what to do and use a tool."}
-            ]
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": "It's time for your next cycle. Decide what to do and use a tool."}
+        ]
+
+    @traced("agent.cycle", cycle=True)
+    async def run(self) -> dict[str, Any]:
+        """
+        Run the unified agent cycle.
+
+        Returns:
+            Summary of what happened.
+        """
+        start_time = time.time()
+        logger.info("[AGENT] === Starting unified agent cycle ===")
+
+        self.posts_this_cycle = 0
+        self.replies_this_cycle = 0
+        self.tools_used_for_current_action = []
+        self.early_tool_starts = 0
+        self.parallel_reads = 0
+        self.prefetch = PrefetchCache()
+
+        try:
+            # Get tier and build schema
+            tier = self._get_tier()
+            schema = build_step_decision_schema(tier)
+            tools_desc = get_tools_description_for_mode("unified", tier)
+
+            logger.info(f"[AGENT] Tier: {tier.upper()}")
+            allowed = schema["json_schema"]["schema"]["properties"]["tool"]["enum"]
+
+            # Settle intents a previous cycle left open before counting today's actions
+            await reconcile_intents(self.twitter, self.db)
+
+            # Nothing the LLM could do: skip it, and drop any interrupted cycle
+            # rather than resume it only to hit the limits
+            posts_remaining, replies_remaining = await self._remaining_actions()
+            if not posts_remaining and not replies_remaining:
+                await clear_checkpoint(self.db, CHECKPOINT_AGENT)
+                return self._skipped(start_time, "daily limits reached")
+
+            cycle = current_span()
+            checkpoint = await load_checkpoint(self.db, CHECKPOINT_AGENT)
+            if checkpoint:
+                self.cycle_id = checkpoint["cycle_id"]
+                resumes = checkpoint["resumes"]
+                iteration = checkpoint["iteration"]
+                messages = await self._resume_messages(checkpoint)
+                logger.info(f"[AGENT] Resuming cycle {self.cycle_id} at iteration {iteration} (resume {resumes})")
+                if cycle:
+                    cycle.attributes["resumed_from"] = self.cycle_id
+            else:
+                self.cycle_id = cycle.trace_id if cycle else uuid.uuid4().hex
+                resumes = 0
+                iteration = 0
+
+                # Replies only: skip when the prefetch found no mentions to reply to
+                messages = await self._initial_messages(tools_desc, allowed)
+                if not posts_remaining and self.prefetch.mentions == 0:
+                    return self._skipped(start_time, "no new mentions and no posts left today")
+
+                await save_checkpoint(self.db, CHECKPOINT_AGENT, self.cycle_id, self._checkpoint_state(messages, iteration, resumes))
 
             # Tool use loop
             max_iterations = 30
-            iteration = 0
 
             while iteration < max_iterations:
                 iteration += 1
 
-                # Call LLM with structured output
-                result = await self.llm.chat(messages, schema)
+                # Call LLM with structured output (read-only tools may already be running)
+                result, early = await self._decide(messages, schema)
 
                 thinking = result.get("thinking", "")
                 tool_name = result.get("tool", "")
                 params = result.get("params", {})
+                reads = self._parallel_reads(result, allowed)
 
-                logger.info(f"[AGENT] [{iteration}/{max_iterations}] Tool: {tool_name}")
+                logger.info(f"[AGENT] [{iteration}/{max_iterations}] Tool: {tool_name}" + (f" (+{len(reads)} reads)" if reads else ""))
 
                 # Add assistant response to messages
                 messages.append({"role": "assistant", "content": json.dumps(result)})
 
-                # Execute tool
-                tool_result = await self._execute_tool(tool_name, params)
+                # Side effects can't be replayed blindly, so record the call before it runs
+                if tool_name != "finish_cycle" and not is_read_only_tool(tool_name):
+                    await save_checkpoint(
+                        self.db, CHECKPOINT_AGENT, self.cycle_id,
+                        self._checkpoint_state(messages, iteration, resumes, {"tool": tool_name, "params": params})
+                    )
+
+                # Execute tool (and any parallel reads)
+                step_results = await self._run_step(tool_name, params, early, reads)
+                tool_result = step_results[0][1]
 
                 # Check if cycle finished
                 if tool_name == "finish_cycle" or "CYCLE_FINISHED" in tool_result:
                     break
 
-                # Add tool result to messages
-                messages.append({"role": "user", "content": f"Tool result ({tool_name}):\n{tool_result}\n\nDecide what to do next."})
+                # Add all tool results to messages at once
+                results_text = "\n\n".join(f"Tool result ({name}):\n{output}" for name, output in step_results)
+                messages.append({"role": "user", "content": f"{results_text}\n\nDecide what to do next."})
+                await save_checkpoint(self.db, CHECKPOINT_AGENT, self.cycle_id, self._checkpoint_state(messages, iteration, resumes))
+
+            await clear_checkpoint(self.db, CHECKPOINT_AGENT)
 
             # Summary
             duration = round(time.time() - start_time, 1)
             logger.info(f"[AGENT] === Completed in {duration}s ===")
             logger.info(f"[AGENT] Summary: posts={self.posts_this_cycle}, replies={self.replies_this_cycle}, iterations={iteration}")
 
+            if cycle:
+                cycle.attributes.update(
+                    posts=self.posts_this_cycle,
+                    replies=self.replies_this_cycle,
+                    iterations=iteration,
+                    early_tool_starts=self.early_tool_starts,
+                    parallel_reads=self.parallel_reads,
+                    prefetch_hits=self.prefetch.hits
+                )
+
             return {
                 "success": True,
                 "posts": self.posts_this_cycle,
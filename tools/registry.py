@@ -7,11 +7,13 @@ Discovers tools from subdirectories:
 - unified/  - Unified Agent only
 
 Each tool file should export:
-- TOOL_CONFIG: dict with name, description, params, optional tier
+- TOOL_CONFIG: dict with name, description, params, optional tier and
+  optional read_only (no side effects; safe to start speculatively)
 - An async function with the same name as TOOL_CONFIG["name"]
 """
 
 import importlib
+import json
 import logging
 import pkgutil
 from pathlib import Path
@@ -136,6 +138,31 @@ def get_tool_func(name: str) -> Callable | None:
     return None
 
 
+def get_tool_params(name: str) -> dict:
+    """Declared params of a tool ({} if unknown)."""
+    if name in ALL_TOOLS:
+        return ALL_TOOLS[name]["config"].get("params", {})
+    return {}
+
+
+def tool_call_key(name: str, params: dict) -> tuple[str, str]:
+    """
+    Hashable identity of a tool call.
+
+    Only declared params count, since strict decision schemas carry every
+    tool's params on every call.
+    """
+    declared = get_tool_params(name)
+    return name, json.dumps({k: v for k, v in params.items() if k in declared}, sort_keys=True)
+
+
+def is_read_only_tool(name: str) -> bool:
+    """Whether a tool is marked read_only (safe to run before the decision is final)."""
+    if name in ALL_TOOLS:
+        return ALL_TOOLS[name]["config"].get("read_only", False)
+    return False
+
+
 def get_tools_description_for_mode(mode: str, tier: str = "basic+") -> str:
     """
     Generate human-readable tools description for prompts.
@@ -12,6 +12,7 @@ logger = logging.getLogger(__name__)
 TOOL_CONFIG = {
     "name": "get_conversation_history",
     "description": "Get your past conversation history with a user from database",
+    "read_only": True,
     "params": {
         "username": {
             "type": "string",
@@ -1,17 +1,20 @@
 """
 Get Twitter user profile information.
 
-Fetches public profile data from Twitter API.
+Fetches public profile data through the profile cache (Twitter API on a miss).
 """
 
 import logging
 
+from services.profile_cache import resolve_profiles
+
 logger = logging.getLogger(__name__)
 
 # Tool configuration for auto-discovery
 TOOL_CONFIG = {
     "name": "get_twitter_profile",
     "description": "Get a Twitter user's profile info (bio, followers, tweets count)",
+    "read_only": True,
     "params": {
         "username": {
             "type": "string",
@@ -22,13 +25,14 @@ TOOL_CONFIG = {
 }
 
 
-async def get_twitter_profile(username: str, twitter=None, **kwargs) -> str:
+async def get_twitter_profile(username: str, twitter=None, db=None, **kwargs) -> str:
     """
     Get Twitter user profile by username.
 
     Args:
         username: Twitter handle (without @).
         twitter: TwitterClient instance.
+        db: Database instance (persistent profile cache).
         **kwargs: Additional context.
 
     Returns:
@@ -42,8 +46,12 @@ async def get_twitter_profile(username: str, twitter=None, **kwargs) -> str:
 
     logger.info(f"[GET_PROFILE] Fetching profile for @{username}")
 
-    profile = twitter.get_user_profile(username)
+    # Cached (memory, then DB), falling back to a batched Twitter lookup
+    profiles = await resolve_profiles(twitter, db, [username])
+    if username.lower() not in profiles:
+        return f"Error: Could not look up @{username} right now, try again later"
 
+    profile = profiles[username.lower()]
     if not profile:
         return f"Error: User @{username} not found"
 
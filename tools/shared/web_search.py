@@ -8,10 +8,7 @@ Uses OpenRouter's plugins API with native search engine.
 import logging
 from typing import Any
 
-import httpx
-
-from config.models import LLM_MODEL
-from utils.api import OPENROUTER_URL, get_openrouter_headers
+from services.llm import LLMClient, LLMError
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +16,7 @@ logger = logging.getLogger(__name__)
 TOOL_CONFIG = {
     "name": "web_search",
     "description": "Search the web for current information, news, facts, or any data that might not be in training data",
+    "read_only": True,
     "params": {
         "query": {
             "type": "string",
@@ -43,7 +41,6 @@ async def web_search(query: str, **kwargs) -> str:
     logger.info(f"[WEB_SEARCH] Starting search: {query}")
 
     payload = {
-        "model": LLM_MODEL,
         "messages": [
             {"role": "user", "content": query}
         ],
@@ -56,18 +53,10 @@ async def web_search(query: str, **kwargs) -> str:
     }
 
     try:
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(
-                OPENROUTER_URL,
-                headers=get_openrouter_headers(),
-                json=payload
-            )
-            response.raise_for_status()
-            data = response.json()
+        message = await LLMClient().complete(payload)
 
         logger.info(f"[WEB_SEARCH] Response received")
 
-        message = data["choices"][0]["message"]
         content = message.get("content", "")
 
         # Extract source citations from annotations
@@ -81,12 +70,9 @@ async def web_search(query: str, **kwargs) -> str:
 
         return f"Search results:\n{content}\n\nSources: {len(sources)}"
 
-    except httpx.TimeoutException:
-        logger.error(f"[WEB_SEARCH] Timeout after 60s")
-        return "Error: Search timed out"
-    except httpx.HTTPStatusError as e:
-        logger.error(f"[WEB_SEARCH] API error: {e.response.status_code}")
-        return f"Error: Search failed (HTTP {e.response.status_code})"
+    except LLMError as e:
+        logger.error(f"[WEB_SEARCH] API error: {e}")
+        return f"Error: Search failed ({e})"
     except Exception as e:
         logger.error(f"[WEB_SEARCH] Unexpected error: {e}")
         return f"Error: Search failed - {e}"
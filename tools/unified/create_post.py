@@ -6,6 +6,14 @@ Posts to Twitter with optional image generation.
 
 import logging
 
+from services.action_intents import (
+    DuplicateAction,
+    claim_intent,
+    describe_duplicate,
+    mark_failed,
+    mark_posted,
+    mark_recorded
+)
 from tools.legacy.image_generation import generate_image
 from config.settings import settings
 
@@ -39,7 +47,7 @@ async def create_post(text: str, include_image: bool = False, twitter=None, db=N
         include_image: Whether to generate and attach an image.
         twitter: TwitterClient instance.
         db: Database instance.
-        **kwargs: Additional context.
+        **kwargs: Additional context (cycle_id keys the idempotency intent).
 
     Returns:
         Result string with tweet ID and remaining posts.
@@ -72,6 +80,12 @@ async def create_post(text: str, include_image: bool = False, twitter=None, db=N
     if len(text) > 280:
         text = text[:277] + "..."
 
+    # Claim the action first, so a retry of it in this cycle doesn't post twice
+    try:
+        intent_key = await claim_intent(db, kwargs.get("cycle_id"), "post", text)
+    except DuplicateAction as e:
+        return describe_duplicate(e.intent)
+
     # Generate image if requested
     media_ids = None
     image_generated = False
@@ -92,15 +106,18 @@ async def create_post(text: str, include_image: bool = False, twitter=None, db=N
         tweet_id = tweet_data["id"]
     except Exception as e:
         logger.error(f"[CREATE_POST] Post failed: {e}")
+        await mark_failed(db, intent_key, "post", e)
         return f"Error posting: {e}"
 
     # Save to database
+    await mark_posted(db, intent_key, tweet_id, image_generated)
     await db.save_action(
         action_type="post",
         text=text,
         tweet_id=tweet_id,
         include_picture=image_generated
     )
+    await mark_recorded(db, intent_key)
 
     remaining = daily_limit - posts_today - 1
 
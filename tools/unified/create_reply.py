@@ -7,6 +7,15 @@ Only available on Basic+ tier.
 
 import logging
 
+from services.action_intents import (
+    DuplicateAction,
+    claim_intent,
+    describe_duplicate,
+    mark_failed,
+    mark_posted,
+    mark_recorded
+)
+from services.thread_context import record_reply
 from tools.legacy.image_generation import generate_image
 from config.settings import settings
 
@@ -65,7 +74,7 @@ async def create_reply(
         twitter: TwitterClient instance.
         db: Database instance.
         tier_manager: TierManager instance.
-        **kwargs: Additional context.
+        **kwargs: Additional context (cycle_id keys the idempotency intent).
 
     Returns:
         Result string with success status and remaining replies.
@@ -105,6 +114,12 @@ async def create_reply(
     if len(text) > 280:
         text = text[:277] + "..."
 
+    # Claim the action first, so a retry of it in this cycle doesn't reply twice
+    try:
+        intent_key = await claim_intent(db, kwargs.get("cycle_id"), "reply", text, reply_to_tweet_id, reply_to_author)
+    except DuplicateAction as e:
+        return describe_duplicate(e.intent)
+
     # Generate image if requested
     media_ids = None
     image_generated = False
@@ -121,11 +136,15 @@ async def create_reply(
 
     # Post reply
     try:
-        await twitter.reply(text, reply_to_tweet_id, media_ids=media_ids)
+        reply = await twitter.reply(text, reply_to_tweet_id, media_ids=media_ids)
     except Exception as e:
         logger.error(f"[CREATE_REPLY] Reply failed: {e}")
+        await mark_failed(db, intent_key, "reply", e)
         return f"Error replying: {e}"
 
+    await mark_posted(db, intent_key, reply["id"], image_generated)
+    await record_reply(twitter, db, reply)
+
     # Save to actions table
     await db.save_action(
         action_type="reply",
@@ -138,24 +157,23 @@ async def create_reply(
     # Update pending mention with our reply (or create if not exists)
     tools_used_str = ",".join(tools_used) if tools_used else None
 
-    if await db.mention_exists(reply_to_tweet_id, include_pending=True):
-        # Update existing pending mention
+    saved = await db.save_mention(
+        tweet_id=reply_to_tweet_id,
+        author_handle=reply_to_author,
+        author_text="",
+        our_reply=text,
+        action="agent_replied",
+        tools_used=tools_used_str
+    )
+    if saved is None:
+        # Usually the pending row saved by get_mentions
         await db.update_mention(
             tweet_id=reply_to_tweet_id,
             our_reply=text,
             action="agent_replied",
             tools_used=tools_used_str
         )
-    else:
-        # Fallback: create new mention record
-        await db.save_mention(
-            tweet_id=reply_to_tweet_id,
-            author_handle=reply_to_author,
-            author_text="",
-            our_reply=text,
-            action="agent_replied",
-            tools_used=tools_used_str
-        )
+    await mark_recorded(db, intent_key)
 
     remaining = daily_limit - replies_today - 1
 
@@ -1,12 +1,19 @@
 """
 Get unread mentions from Twitter.
 
-Fetches mentions and filters out already processed ones.
+Fetches mentions, filters out already processed ones and spam (see
+services/mention_filter.py) and shows the thread each reply belongs to.
 Only available on Basic+ tier.
 """
 
+import asyncio
 import logging
 
+from services.adaptive_schedule import mention_arrivals
+from services.mention_filter import prefilter_mentions
+from services.metrics import MENTION_QUEUE_DEPTH
+from services.thread_context import build_thread_contexts, format_thread_line
+
 logger = logging.getLogger(__name__)
 
 # Tool configuration for auto-discovery
@@ -21,12 +28,80 @@ TOOL_CONFIG = {
 MENTIONS_WHITELIST = []
 
 
+async def fetch_unprocessed_mentions(twitter, db) -> list[dict]:
+    """
+    Fetch mentions that haven't been replied to or skipped yet.
+
+    Pre-filters them without the LLM: rejects are saved as 'filtered', the
+    top candidates as 'pending' (so author_text is preserved for history),
+    and reply threads are assembled for all candidates in one pass.
+
+    Args:
+        twitter: TwitterClient instance.
+        db: Database instance.
+
+    Returns:
+        List of {"tweet_id", "author", "text", "thread"} dicts, best first
+        ("thread" is the conversation above the mention, or "").
+    """
+    mentions = await asyncio.to_thread(twitter.get_mentions, since_id=None) or []
+    mention_arrivals.observe([m["id_str"] for m in mentions])
+
+    # Filter by whitelist if set
+    if MENTIONS_WHITELIST:
+        mentions = [
+            m for m in mentions
+            if m["user"]["screen_name"].lower() in [w.lower() for w in MENTIONS_WHITELIST]
+        ]
+
+    # Filter out already processed
+    new_mentions = [m for m in mentions if not await db.mention_exists(m["id_str"])]
+    candidates, rejected = await prefilter_mentions(twitter, db, new_mentions)
+
+    saves = [(m, "pending") for m in candidates] + [(m, "filtered") for m, _ in rejected]
+    for mention, action in saves:
+        saved = await db.save_mention(
+            tweet_id=mention["id_str"],
+            author_handle=mention["user"]["screen_name"],
+            author_text=mention["text"],
+            our_reply=None,
+            action=action
+        )
+        # Already saved as pending by an earlier fetch: record the rejection
+        if saved is None and action == "filtered":
+            await db.update_mention(mention["id_str"], None, action="filtered")
+
+    threads = await build_thread_contexts(twitter, db, candidates)
+    unprocessed = [
+        {
+            "tweet_id": m["id_str"],
+            "author": m["user"]["screen_name"],
+            "text": m["text"],
+            "thread": threads.get(m["id_str"], "")
+        }
+        for m in candidates
+    ]
+
+    MENTION_QUEUE_DEPTH.set(len(new_mentions))
+    return unprocessed
+
+
+def format_mentions(mentions: list[dict]) -> str:
+    """Format unprocessed mentions for the agent."""
+    if not mentions:
+        return "No new unprocessed mentions."
+
+    lines = [
+        f"- tweet_id: {m['tweet_id']}\n  from: @{m['author']}{format_thread_line(m.get('thread', ''))}\n  text: {m['text']}"
+        for m in mentions
+    ]
+    return f"Found {len(mentions)} unprocessed mentions:\n\n" + "\n\n".join(lines)
+
+
 async def get_mentions(twitter=None, db=None, tier_manager=None, **kwargs) -> str:
     """
     Get unread mentions from Twitter.
 
-    Saves mentions to DB as 'pending' so author_text is preserved for history.
-
     Args:
         twitter: TwitterClient instance.
         db: Database instance.
@@ -51,43 +126,11 @@ async def get_mentions(twitter=None, db=None, tier_manager=None, **kwargs) -> st
         return "Error: Database not available"
 
     try:
-        mentions = twitter.get_mentions(since_id=None)
+        unprocessed = await fetch_unprocessed_mentions(twitter, db)
     except Exception as e:
         logger.error(f"[GET_MENTIONS] Failed: {e}")
         return f"Error fetching mentions: {e}"
 
-    if not mentions:
-        return "No new mentions found."
-
-    # Filter by whitelist if set
-    if MENTIONS_WHITELIST:
-        mentions = [
-            m for m in mentions
-            if m["user"]["screen_name"].lower() in [w.lower() for w in MENTIONS_WHITELIST]
-        ]
-        if not mentions:
-            return "No new mentions from whitelisted users."
-
-    # Filter out already processed
-    unprocessed = []
-    for mention in mentions:
-        tweet_id = mention["id_str"]
-        if not await db.mention_exists(tweet_id):
-            author = mention["user"]["screen_name"]
-            text = mention["text"]
-            unprocessed.append(f"- tweet_id: {tweet_id}\n  from: @{author}\n  text: {text}")
-
-            # Save to DB as pending (so we have author_text for history)
-            await db.save_mention(
-                tweet_id=tweet_id,
-                author_handle=author,
-                author_text=text,
-                our_reply=None,
-                action="pending"
-            )
-
-    if not unprocessed:
-        return "No new unprocessed mentions."
-
-    logger.info(f"[GET_MENTIONS] Found {len(unprocessed)} unprocessed mentions")
-    return f"Found {len(unprocessed)} unprocessed mentions:\n\n" + "\n\n".join(unprocessed)
+    if unprocessed:
+        logger.info(f"[GET_MENTIONS] Found {len(unprocessed)} unprocessed mentions")
+    return format_mentions(unprocessed)
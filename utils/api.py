@@ -7,8 +7,9 @@ Used by all services and tools that interact with OpenRouter.
 
 from config.settings import settings
 
-# OpenRouter API endpoint
-OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
+# OpenRouter API endpoint (base URL configurable for local stand-ins)
+OPENROUTER_BASE_URL = settings.openrouter_base_url.rstrip("/")
+OPENROUTER_URL = f"{OPENROUTER_BASE_URL}/chat/completions"
 
 
 def get_openrouter_headers() -> dict: